@@ -7,16 +7,73 @@ Class handling audio
 '''
 
 import board
+import time
+import array
 import audiocore
 import audioio
 
 class AUDIO():
-    def __init__(self, DAC):
+    def __init__(self, DAC, chunk_size = 2048):
         self._dac = audioio.AudioOut(DAC)
+        self.chunk_size = chunk_size
+        self._buffers = None
+        self.t_started = 0 # monotonic_ns when the DAC started the last audio
+
+    '''
+    Ping-pong buffers for play_stream, allocated when streaming is first used
+    and kept from then on (no allocation per transmission), release_buffers()
+    frees them again.
+    '''
+    @property
+    def buffers(self):
+        if self._buffers is None:
+            self._buffers = (array.array('B', bytes(self.chunk_size)), array.array('B', bytes(self.chunk_size)))
+        return self._buffers
+
+    def release_buffers(self):
+        self._buffers = None
 
     def play(self, data, sample_rate = 24000):
         self._dac_waveform = audiocore.RawSample(data, sample_rate = sample_rate)
         self._dac.play(self._dac_waveform, loop = False)
+        self.t_started = time.monotonic_ns()
+        while self._dac.playing:
+            pass
+
+    '''
+    EXPERIMENTAL, not gapless: plays chunks rendered into self.buffers in turn
+    (see AFSK.stream_afsk_bit_pattern), the next chunk is rendered while the
+    current one plays. Every chunk is a RawSample of its own, started after
+    the previous one has finished: audioio stops and starts again every
+    chunk_size samples (about 114 ms at 18 kHz). At 1200 bit/s one bit lasts
+    833 us, so a gap inside a frame can corrupt it and its FCS fails.
+    A looping RawSample over two halves refilled in turn would be gapless, but
+    audioio does not tell which half is playing, so that is not done here.
+    Only DRA818x(streaming = True) uses it; use play() or play_each() for
+    traffic that has to get through.
+    '''
+    def play_stream(self, chunks, sample_rate = 24000):
+        t_started = 0
+        for chunk in chunks:
+            while self._dac.playing:
+                pass
+            self._dac_waveform = audiocore.RawSample(chunk, sample_rate = sample_rate)
+            self._dac.play(self._dac_waveform, loop = False)
+            if t_started == 0:
+                t_started = time.monotonic_ns()
+                self.t_started = t_started
         while self._dac.playing:
             pass
-            
\ No newline at end of file
+
+    '''
+    Plays complete audio buffers one after the other, each one as play() does:
+    the next one is only requested (e.g. rendered) when the previous one has
+    finished, so the DAC pauses in between. t_started is the start of the first.
+    '''
+    def play_each(self, audios, sample_rate = 24000):
+        t_started = 0
+        for audio in audios:
+            self.play(audio, sample_rate)
+            if t_started == 0:
+                t_started = self.t_started
+        self.t_started = t_started
@@ -8,73 +8,67 @@ from datadb import DATA_DB
 
 '''
 Definitions of movement and heading for beaconing
+
+MODE_DISTANCE       => beacon after min_distance, a spread of the recent
+                       headings, nonmove_rate, never within hold_time
+MODE_SMARTBEACONING => SmartBeaconing (HamHUD / TinyTrak): the interval
+                       follows the speed, from slow_rate below slow_speed
+                       down to fast_rate above fast_speed, a turn beacons
+                       when the heading differs from the one of the last
+                       beacon by more than min_turn_angle + turn_slope / speed
+                       (corner pegging) but not within min_turn_time
 '''
 
 class SMARTBEACON:
 
-	def __init__(self, size = 10, mode = DATA_DB.buffer_shift):
+	MODE_DISTANCE = 0
+	MODE_SMARTBEACONING = 1
+
+	EARTH_RADIUS = 6371000 # meters
+	METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180 # along a meridian
+	FLAT_MAX_LATITUDE = 70 # degrees, haversine only beyond
+	FLAT_MARGIN = 0.02 # haversine within +-2% of the distance limit
+
+	def __init__(self, size = 10):
 		self.enabled = False
+		self.mode = self.MODE_DISTANCE
+		self.debugging = False
+
+		# MODE_DISTANCE
 		self.nonmove_rate = 600 # seconds
 		self.hold_time = 15 # seconds
 		self.min_distance = 1.5 # km
 		self.min_heading_speed = 2 # km/h
 		self.heading_deviation_threshold = 2 # percent
-		self.debugging = False
+
+		# MODE_SMARTBEACONING, TinyTrak defaults in metric units
+		self.fast_speed = 100 # km/h
+		self.fast_rate = 180 # seconds
+		self.slow_speed = 8 # km/h
+		self.slow_rate = 1800 # seconds
+		self.min_turn_angle = 28 # degrees
+		self.turn_slope = 410 # degrees * km/h
+		self.min_turn_time = 30 # seconds
 
 		self._last_beacon_position = None
 		self._last_beacon_heading = None
 		self._last_beacon_time = None
-		self._heading_log = DATA_DB(size, mode)
+		self._meters_per_degree_lon = None # see _set_last_beacon
+		self._previous_beacon = None # see beacon_not_sent
+		# heading history as unit vectors, see _add_heading
+		self._heading_sin = DATA_DB(size, DATA_DB.buffer_shift, 'f')
+		self._heading_cos = DATA_DB(size, DATA_DB.buffer_shift, 'f')
 
 	def update(self, gps):
 		send_beacon = False
 		if self.enabled == True:
 			if gps.is_valid:
 				current_position = gps.latitude, gps.longitude
-				self._heading_log.add(gps.heading)
-
-				# Check heading deviation / yamartino
-				heading_deviation = 0
-				if self._last_beacon_position != None:
-					if  len(self._heading_log) == self._heading_log.size:
-						s=0
-						c=0
-						n=0.0
-						for i in range (0, self._heading_log.size - 1):
-							s=s+math.sin(math.radians(self._heading_log.get(i)))
-							c=c+math.cos(math.radians(self._heading_log.get(i)))
-							n+=1
-						s=s/n
-						c=c/n
-						eps=(1-(s**2+c**2))**0.5
-						sigma=math.asin(eps)*(1+(2.0/3.0**0.5-1)*eps**3)
-						heading_deviation = math.degrees(sigma)
-						# print("heading_deviation", heading_deviation)
-						if heading_deviation > self.heading_deviation_threshold:
-							if gps.speed_kmh > self.min_heading_speed:
-								send_beacon = True
+				previous_beacon = (self._last_beacon_position, self._last_beacon_heading, self._last_beacon_time, self._meters_per_degree_lon)
+				if self.mode == self.MODE_SMARTBEACONING:
+					send_beacon = self._smartbeaconing(gps)
 				else:
-					self._last_beacon_position = current_position
-					self._last_beacon_heading = gps.heading
-					self._last_beacon_time = time.monotonic()
-					send_beacon = True
-
-				# Check if distance is reached
-				distance = self._calc_distance(self._last_beacon_position, current_position)
-				if distance > self.min_distance:
-					send_beacon = True
-
-				# Check if non moving timer is reached
-				nonmove_timer = self.nonmove_rate - (time.monotonic() - self._last_beacon_time)
-				if nonmove_timer < 0:
-					send_beacon = True
-
-				hold_timer = self.hold_time - (time.monotonic() - self._last_beacon_time)
-				if hold_timer > 0:
-					send_beacon = False
-
-				if self.debugging == True:
-					print("BEACON: + > Hold:{0:.0f} Dev:{1:.3f} Dist:{2:.3f} NoMove:{3:.0f}".format(hold_timer, heading_deviation, distance, nonmove_timer))
+					send_beacon = self._distance_heading(gps, current_position)
 			else:
 				if self.debugging == True:
 					print("BEACON: no GPS")
@@ -83,15 +77,163 @@ class SMARTBEACON:
 				print("BEACON: off")
 
 		if send_beacon == True:
-			self._last_beacon_position = current_position
-			self._last_beacon_heading = gps.heading
-			self._last_beacon_time = time.monotonic()
+			self._previous_beacon = previous_beacon
+			self._set_last_beacon(current_position, gps.heading)
 			print("BEACON NOW!")
 
 		return send_beacon
 
+	'''
+	The beacon update() asked for did not go out (duty cycle budget, frame
+	too long): back to the last beacon before it, so the next fix decides
+	again instead of waiting a whole rate interval.
+	'''
+	def beacon_not_sent(self):
+		if self._previous_beacon != None:
+			self._last_beacon_position, self._last_beacon_heading, self._last_beacon_time, self._meters_per_degree_lon = self._previous_beacon
+			self._previous_beacon = None
+
+	# seconds between beacons at speed (km/h) in MODE_SMARTBEACONING
+	def rate(self, speed):
+		if speed <= self.slow_speed:
+			return self.slow_rate
+		if speed >= self.fast_speed:
+			return self.fast_rate
+		return self.fast_rate * self.fast_speed / speed
+
+	# heading change (degrees) for a corner beacon at speed (km/h)
+	def turn_threshold(self, speed):
+		return self.min_turn_angle + self.turn_slope / max(speed, 1)
+
 	# -----------------------------------------------
 
+	def _distance_heading(self, gps, current_position):
+		send_beacon = False
+		self._add_heading(gps.heading)
+
+		# Check heading deviation / yamartino
+		heading_deviation = 0
+		if self._last_beacon_position != None:
+			if len(self._heading_sin) == self._heading_sin.size:
+				heading_deviation = self._heading_deviation()
+				# print("heading_deviation", heading_deviation)
+				if heading_deviation > self.heading_deviation_threshold:
+					if gps.speed_kmh > self.min_heading_speed:
+						send_beacon = True
+		else:
+			self._set_last_beacon(current_position, gps.heading)
+			send_beacon = True
+
+		# Check if distance is reached
+		if self._beyond_distance(current_position, self.min_distance) == True:
+			send_beacon = True
+
+		# Check if non moving timer is reached
+		nonmove_timer = self.nonmove_rate - (time.monotonic() - self._last_beacon_time)
+		if nonmove_timer < 0:
+			send_beacon = True
+
+		hold_timer = self.hold_time - (time.monotonic() - self._last_beacon_time)
+		if hold_timer > 0:
+			send_beacon = False
+
+		if self.debugging == True:
+			distance = self._calc_distance(self._last_beacon_position, current_position)
+			print("BEACON: + > Hold:{0:.0f} Dev:{1:.3f} Dist:{2:.3f} NoMove:{3:.0f}".format(hold_timer, heading_deviation, distance, nonmove_timer))
+		return send_beacon
+
+	'''
+	SmartBeaconing decision for one fix, a few comparisons whatever happened
+	before: time since the last beacon against the rate for the current speed,
+	and the heading change since the last beacon against the turn threshold.
+	The heading is only trusted at slow_speed or more.
+	'''
+	def _smartbeaconing(self, gps):
+		if self._last_beacon_time == None:
+			if self.debugging == True:
+				print("BEACON: * > first fix")
+			return True
+		speed = gps.speed_kmh
+		elapsed = time.monotonic() - self._last_beacon_time
+		rate = self.rate(speed)
+		send_beacon = elapsed >= rate
+
+		turn = 0
+		threshold = 0
+		if speed >= self.slow_speed:
+			turn = abs(gps.heading - self._last_beacon_heading) % 360
+			if turn > 180:
+				turn = 360 - turn
+			threshold = self.turn_threshold(speed)
+			if turn > threshold and elapsed >= self.min_turn_time:
+				send_beacon = True
+
+		if self.debugging == True:
+			print("BEACON: * > Speed:{0:.0f} Rate:{1:.0f} Elapsed:{2:.0f} Turn:{3:.0f}/{4:.0f}".format(speed, rate, elapsed, turn, threshold))
+		return send_beacon
+
+	'''
+	The heading history is kept as unit vectors (sin, cos) in two DATA_DB
+	logs, their running sums replace adding up the whole window: one sin and
+	one cos per heading, whatever the window size.
+	'''
+	def _add_heading(self, heading):
+		r = math.radians(heading)
+		self._heading_sin.add(math.sin(r))
+		self._heading_cos.add(math.cos(r))
+
+	'''
+	The last beacon position is the reference of the distance checks: cos(lat)
+	and the meters per degree of longitude there are computed once per beacon,
+	not per fix (None at high latitudes, where only haversine is used).
+	'''
+	def _set_last_beacon(self, position, heading):
+		self._last_beacon_position = position
+		self._last_beacon_heading = heading
+		self._last_beacon_time = time.monotonic()
+		if abs(position[0]) <= self.FLAT_MAX_LATITUDE:
+			self._meters_per_degree_lon = self.METERS_PER_DEGREE * math.cos(math.radians(position[0]))
+		else:
+			self._meters_per_degree_lon = None
+
+	'''
+	True if position is beyond limit (km) from the last beacon position.
+	Equirectangular projection around the last beacon: no trig and no square
+	root per fix, the squared distance is compared with the squared limit.
+	Only close to the limit (FLAT_MARGIN) and at high latitudes the haversine
+	distance decides.
+	'''
+	def _beyond_distance(self, position, limit):
+		d2 = self._flat_distance2(position)
+		if d2 != None:
+			l2 = 1000000 * limit * limit
+			if d2 < (1 - self.FLAT_MARGIN) ** 2 * l2 or d2 > (1 + self.FLAT_MARGIN) ** 2 * l2:
+				return d2 > l2
+		return self._calc_distance(self._last_beacon_position, position) > limit
+
+	# squared equirectangular distance in m^2 from the last beacon, None at high latitudes
+	def _flat_distance2(self, position):
+		if self._meters_per_degree_lon == None:
+			return None
+		lat, lon = position
+		lat0, lon0 = self._last_beacon_position
+		dlon = lon - lon0
+		if dlon > 180:
+			dlon -= 360
+		elif dlon < -180:
+			dlon += 360
+		dx = dlon * self._meters_per_degree_lon
+		dy = (lat - lat0) * self.METERS_PER_DEGREE
+		return dx * dx + dy * dy
+
+	# Yamartino estimate of the standard deviation of the headings in degrees
+	def _heading_deviation(self):
+		s = self._heading_sin.mean
+		c = self._heading_cos.mean
+		eps = max(1 - (s * s + c * c), 0) ** 0.5
+		sigma = math.asin(eps) * (1 + (2.0 / 3.0 ** 0.5 - 1) * eps ** 3)
+		return math.degrees(sigma)
+
 	def _calc_distance(self, coord1,coord2):
 	    lat1, lon1 = coord1
 	    lat2, lon2 = coord2
@@ -112,26 +254,3 @@ class SMARTBEACON:
 	    km = R * c / 1000
 	    # nauticalmiles = R * c / 1852
 	    return km
-
-	def _get_coord_from_log(self, log, p):
-		lat = log.get(p).get("lat")
-		lon = log.get(p).get("lon")
-		# print("CoordFromLog:", lat, lon)
-		return float(lat), float(lon)
-
-	def _calc_heading(self, coord1,coord2):
-	    lat1, lon1 = coord1
-	    lat2, lon2 = coord2
-
-	    R = 6371000 # radius of Earth in meters
-	    phi_1 = math.radians(lat1)
-	    phi_2 = math.radians(lat2)
-
-	    delta_phi = math.radians(lat2 - lat1)
-	    delta_lambda = math.radians(lon2 - lon1)
-
-	    y = math.sin(delta_lambda) * math.cos(phi_2)
-	    x = math.cos(phi_1) * math.sin(phi_2) - math.sin(phi_1) * math.cos(phi_2) * math.cos(delta_lambda)
-	    heading = (360 + math.degrees(math.atan2(y,x))) % 360
-	    return heading
-	
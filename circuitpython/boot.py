@@ -0,0 +1,8 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+import usb_cdc
+
+# second USB serial port for the KISS TNC mode, the console keeps the REPL
+usb_cdc.enable(console = True, data = True)
@@ -5,12 +5,21 @@
 import gc
 print("MAIN: Mem start", gc.mem_free())
 
+# Heap and time of each import and saved by the constant tables
+MEMORY_REPORT = False
+if MEMORY_REPORT == True:
+	import memreport
+	memreport.import_report(('afsk_tables', 'aprs', 'afsk', 'adafruit_sdcard', 'gps', 'trx',
+		'telemetry', 'aprs_decoder', 'kiss', 'dutycycle', 'beacon', 'm_io'))
+	memreport.table_report()
+
 import board
 import time
 import neopixel
 import events
 import m_io
 from beacon import SMARTBEACON
+from telemetry import TELEMETRY
 
 # Shutoff Neopixel
 pixels = neopixel.NeoPixel(board.NEOPIXEL, 1)
@@ -23,6 +32,8 @@ ev10sec = events.Events(10)
 # GPS Module
 GPS = m_io.init_gps()
 GPS.debugging = False
+GPS.aprs_format = GPS.APRS_COMPRESSED # or GPS.APRS_UNCOMPRESSED
+MIC_E = False # Mic-E position (shortest beacon), replaces aprs_format
 
 # Sensors
 ENV = m_io.init_environment()
@@ -47,33 +58,132 @@ else:
 BEACON = SMARTBEACON()
 BEACON.debugging = True
 BEACON.enabled = True
+BEACON.mode = BEACON.MODE_SMARTBEACONING # or BEACON.MODE_DISTANCE
+# MODE_SMARTBEACONING
+BEACON.fast_speed = 100 # km/h
+BEACON.fast_rate = 180 # seconds
+BEACON.slow_speed = 8 # km/h
+BEACON.slow_rate = 1800 # seconds
+BEACON.min_turn_angle = 28 # degrees
+BEACON.turn_slope = 410 # degrees * km/h
+BEACON.min_turn_time = 30 # seconds
+# MODE_DISTANCE
 BEACON.nonmove_rate = 1200 # seconds
 BEACON.hold_time = 15 # seconds
 BEACON.min_distance = 1.5 # km
 BEACON.min_heading_speed = 2 # km/h
 BEACON.heading_deviation_threshold = 2 # percent
 
-# TRX
-TRX = m_io.init_trx()
+# KISS TNC on the second USB serial port: frames from the host are sent along
+KISS_MODE = False
+
+# TRX, AX.25 frames from a KISS host can have up to 330 bytes: larger AFSK
+# output buffer (about 52 KB instead of 19 KB)
+if KISS_MODE:
+	TRX = m_io.init_trx(max_frame_length = 330)
+else:
+	TRX = m_io.init_trx()
 TRX.debugging = True
 TRX.init()
 TRX.APRS.source = "HB9FZG-4"
 TRX.APRS.digipeaters = 'WIDE1-1,WIDE2-1'
+TRX.DUTY.window = 600 # seconds
+TRX.DUTY.max_duty_cycle = 0.05 # share of the window on air
+TRX.DUTY.debugging = True
+TOCALL = TRX.APRS.destination # for the frames sent along with a Mic-E position
+STATUS = ">APRS-Buddy" # status report and telemetry metadata, sent after every STATUS_INTERVAL th beacon in a transmission of their own
+STATUS_INTERVAL = 10 # 0 = off
+beacons = 0
+information_set = False # APRS.information holds the position for the next beacon
 
 # Voltmeter
 VMTR = m_io.init_voltmeter()
 VMTR.debugging = True
 
+# KISS TNC
+if KISS_MODE:
+	TNC = m_io.init_kiss()
+	if TNC == None:
+		KISS_MODE = False
+	else:
+		TNC.debugging = True
+
+# Telemetry, sampled every 10s
+TLM = TELEMETRY(window = 6)
+TLM.debugging = True
+TLM.format = TLM.FORMAT_BASE91 # in the position comment, or TLM.FORMAT_T as own frame
+
+def update_aprs_information():
+	global information_set
+	information_set = True
+	comment = ""
+	if TLM.format == TLM.FORMAT_BASE91 and len(TLM) > 0:
+		comment = TLM.report
+	if MIC_E:
+		TRX.APRS.set_mic_e_position(GPS, comment)
+	else:
+		TRX.APRS.information = GPS.aprs_position + comment
+
+# copies of the frames for informations, sent to TOCALL (not a Mic-E destination)
+def aprs_frames(informations):
+	global information_set
+	information_set = False # APRS.information holds the last of them now
+	TRX.APRS.destination = TOCALL
+	frames = []
+	for information in informations:
+		TRX.APRS.information = information
+		frames.append(bytes(TRX.APRS.create_ax25_frame()))
+	return frames
+
+def send_beacon(t_decision):
+	global beacons
+	if TLM.format == TLM.FORMAT_T and len(TLM) > 0:
+		# position and telemetry in one transmission
+		frames = [bytes(TRX.APRS.create_ax25_frame())] + aprs_frames([TLM.report])
+		sent = TRX.send_APRS_frames(frames, t_decision = t_decision)
+	else:
+		sent = TRX.send_APRS(t_decision)
+	if sent == False:
+		BEACON.beacon_not_sent()
+		print("MAIN: beacon not sent ({:.1f}s airtime left in the duty cycle budget)".format(TRX.DUTY.available()))
+		return
+	if STATUS_INTERVAL > 0 and beacons % STATUS_INTERVAL == 0:
+		# status and metadata in a transmission of their own, the beacon stays short;
+		# longer than the AFSK output buffer, TRX sends them frame by frame
+		if TRX.send_APRS_frames(aprs_frames([STATUS] + TLM.metadata(TRX.APRS.source))) == False:
+			print("MAIN: status not sent ({:.1f}s airtime left in the duty cycle budget)".format(TRX.DUTY.available()))
+	beacons += 1
+
 while True:
 	GPS.update()
 
 	if ev1sec.is_due:
 		if BEACON.update(GPS) == True:
-			TRX.APRS.information = GPS.aprs_position + " Batt:{:.1f}V".format(VMTR.voltage)
-			TRX.send_APRS()
+			# sends the information set from the previous fix (at most a second
+			# old), its audio has been rendered in idle time by prepare_APRS
+			t_decision = time.monotonic_ns()
+			if information_set == False:
+				update_aprs_information()
+			send_beacon(t_decision)
+		elif GPS.is_valid:
+			# next beacon from the latest fix, rendered in idle time by prepare_APRS
+			update_aprs_information()
 
 	if ev10sec.is_due:
 		ENV.info()
 		ACC.info()
 		VMTR.info()
+		TLM.sample(ENV, ACC, VMTR)
+		TLM.info()
+		if KISS_MODE:
+			TNC.info()
 		GPS.info()
+		TRX.info()
+
+	if KISS_MODE:
+		TNC.update()
+		if TNC.transmit_due():
+			if TRX.send_AX25_frames(TNC.pop_all(), TNC.txdelay_seconds, TNC.txtail_seconds) == False:
+				print("MAIN: KISS frames dropped ({:.1f}s airtime left in the duty cycle budget)".format(TRX.DUTY.available()))
+
+	TRX.prepare_APRS()
@@ -2,12 +2,17 @@
 #
 # SPDX-License-Identifier: MIT
 
+import math
 import adafruit_gps_mod
 
 class GPS:
 
+    APRS_UNCOMPRESSED = 0   # @DDHHMMzDDMM.mmN/DDDMM.mmE>CSE/SPD/A=nnnnnn (43 bytes)
+    APRS_COMPRESSED = 1     # @DDHHMMz/YYYYXXXX>csT, base91 (21 bytes)
+
     def __init__(self, uart):
         self.debugging = False
+        self.aprs_format = self.APRS_UNCOMPRESSED
         self._gps = adafruit_gps_mod.GPS(uart, debug = False)
         # Initialize the GPS module by changing what data it sends and at what rate.
         # These are NMEA extensions for PMTK_314_SET_NMEA_OUTPUT and
@@ -209,23 +214,23 @@ class GPS:
         return data_str
 
     # ---- APRS ----
+    # DDMM.hhN, minutes rounded to hundredths
     def _latitude_aprs(self):
-        Deg = '{:02d}'.format(int(self._gps.latitude))
-        Min = '{0:.2f}'.format((self._gps.latitude % 1) * 60)
-        if self._gps.latitude > 0:
+        value = int(round(abs(self._gps.latitude) * 6000))
+        if self._gps.latitude >= 0:
             NS = "N"
         else:
             NS = "S"
-        return Deg + Min + NS
+        return '{:02}{:02}.{:02}{}'.format(value // 6000, value // 100 % 60, value % 100, NS)
 
+    # DDDMM.hhE, minutes rounded to hundredths
     def _longitude_aprs(self):
-        Deg = '{:03d}'.format(int(self._gps.longitude))
-        Min = '{0:.2f}'.format((self._gps.longitude % 1) * 60)
-        if self._gps.longitude > 0:
+        value = int(round(abs(self._gps.longitude) * 6000))
+        if self._gps.longitude >= 0:
             EW = "E"
         else:
             EW = "W"
-        return Deg + Min + EW
+        return '{:03}{:02}.{:02}{}'.format(value // 6000, value // 100 % 60, value % 100, EW)
 
     def _dhm_aprs(self):
         data_str = '{:02}{:02}{:02}z'.format(
@@ -253,8 +258,42 @@ class GPS:
             data_str = '{:06}'.format(int(round(self._gps.altitude_m / 0.3048))) # altitude in feet
         return data_str
 
+    def _base91_aprs(self, value, digits):
+        data = bytearray(digits)
+        for i in range(digits - 1, -1, -1):
+            data[i] = 33 + value % 91
+            value //= 91
+        return data.decode()
+
+    '''
+    Compressed position (APRS 1.01 chapter 9): symbol table, base91 latitude
+    and longitude, symbol code, cs bytes and compression type byte.
+    Moving: course (c = course / 4) and speed (s = log1.08(knots + 1)) from RMC.
+    Standing: altitude (cs = log1.002(feet)) from GGA.
+    Compression type: current fix, NMEA source, origin 'other tracker'.
+    '''
+    def _compressed_aprs(self):
+        lat = self._base91_aprs(int(380926 * (90 - self._gps.latitude)), 4)
+        lon = self._base91_aprs(int(190463 * (180 + self._gps.longitude)), 4)
+        speed = self._gps.speed_knots
+        course = self._gps.track_angle_deg
+        altitude = self._gps.altitude_m
+        if speed is not None and course is not None and speed > 0:
+            c = int(round(course)) % 360 // 4
+            s = min(int(round(math.log(speed + 1) / math.log(1.08))), 90)
+            csT = self._base91_aprs(c, 1) + self._base91_aprs(s, 1) + self._base91_aprs(0b111110, 1)
+        elif altitude is not None:
+            feet = max(altitude / 0.3048, 1)
+            cs = min(int(round(math.log(feet) / math.log(1.002))), 91 * 91 - 1)
+            csT = self._base91_aprs(cs, 2) + self._base91_aprs(0b110110, 1)
+        else:
+            csT = '   ' # c = space: no course/speed/altitude
+        return '/{}{}>{}'.format(lat, lon, csT)
+
     @property
     def aprs_position(self):
+        if self.aprs_format == self.APRS_COMPRESSED:
+            return '@{}{}'.format(self._dhm_aprs(), self._compressed_aprs())
         return '@{}{}/{}>{}/{}/A={}'.format(self._dhm_aprs(), self._latitude_aprs(), self._longitude_aprs(), self._heading_aprs(), self._speed_aprs(), self._altitude_aprs())
 
     # ---- LOG ----
@@ -481,28 +481,26 @@ class SDCard:
                 msg = "Invalid Card"
             return False
 
-def _calculate_crc_table():
-    """Precompute the table used in calculate_crc."""
-    # Code converted from https://github.com/hazelnusse/crc7/blob/master/crc7.cc by devoh747
-    # With permission from Dale Lukas Peterson <hazelnusse@gmail.com>
-    # 8/6/2019
-
-    crc_table = bytearray(256)
-    crc_poly = const(0x89)  # the value of our CRC-7 polynomial
-
-    # generate a table value for all 256 possible byte values
-    for i in range(256):
-        if (i & 0x80):
-            crc_table[i] = i ^ crc_poly
-        else:
-            crc_table[i] = i
-        for _ in range(1, 8):
-            crc_table[i] = crc_table[i] << 1
-            if (crc_table[i] & 0x80):
-                crc_table[i] = crc_table[i] ^ crc_poly
-    return crc_table
-
-CRC_TABLE = _calculate_crc_table()
+# CRC-7 (polynomial 0x89) table for calculate_crc, a bytes constant instead of computing it at
+# import time (generated by helper/make_tables.py from the former _calculate_crc_table).
+# calculate_crc indexes the bytes in place, so it stays in flash when the module is frozen.
+CRC_TABLE = (
+    b'\x00\x09\x12\x1b\x24\x2d\x36\x3f\x48\x41\x5a\x53\x6c\x65\x7e\x77'
+    b'\x19\x10\x0b\x02\x3d\x34\x2f\x26\x51\x58\x43\x4a\x75\x7c\x67\x6e'
+    b'\x32\x3b\x20\x29\x16\x1f\x04\x0d\x7a\x73\x68\x61\x5e\x57\x4c\x45'
+    b'\x2b\x22\x39\x30\x0f\x06\x1d\x14\x63\x6a\x71\x78\x47\x4e\x55\x5c'
+    b'\x64\x6d\x76\x7f\x40\x49\x52\x5b\x2c\x25\x3e\x37\x08\x01\x1a\x13'
+    b'\x7d\x74\x6f\x66\x59\x50\x4b\x42\x35\x3c\x27\x2e\x11\x18\x03\x0a'
+    b'\x56\x5f\x44\x4d\x72\x7b\x60\x69\x1e\x17\x0c\x05\x3a\x33\x28\x21'
+    b'\x4f\x46\x5d\x54\x6b\x62\x79\x70\x07\x0e\x15\x1c\x23\x2a\x31\x38'
+    b'\x41\x48\x53\x5a\x65\x6c\x77\x7e\x09\x00\x1b\x12\x2d\x24\x3f\x36'
+    b'\x58\x51\x4a\x43\x7c\x75\x6e\x67\x10\x19\x02\x0b\x34\x3d\x26\x2f'
+    b'\x73\x7a\x61\x68\x57\x5e\x45\x4c\x3b\x32\x29\x20\x1f\x16\x0d\x04'
+    b'\x6a\x63\x78\x71\x4e\x47\x5c\x55\x22\x2b\x30\x39\x06\x0f\x14\x1d'
+    b'\x25\x2c\x37\x3e\x01\x08\x13\x1a\x6d\x64\x7f\x76\x49\x40\x5b\x52'
+    b'\x3c\x35\x2e\x27\x18\x11\x0a\x03\x74\x7d\x66\x6f\x50\x59\x42\x4b'
+    b'\x17\x1e\x05\x0c\x33\x3a\x21\x28\x5f\x56\x4d\x44\x7b\x72\x69\x60'
+    b'\x0e\x07\x1c\x15\x2a\x23\x38\x31\x46\x4f\x54\x5d\x62\x6b\x70\x79')
 
 def calculate_crc(message):
     """
@@ -12,11 +12,51 @@ Datapoints => shift values (1200 / 2200 Hz)
 20 => 18 / 33 degress
 15 => 24 / 44 degrees
 12 => 30 / 55 degrees * less than 2 datapoints per quarter-wave
+
+Synthesis modes
+
+SYNTHESIS_SAMPLE => reference loop, one table lookup per DAC sample
+SYNTHESIS_BLOCK  => one precomputed block of DAC bytes per (tone, start phase),
+                    copied as a whole per bit (same output, much faster)
+SYNTHESIS_DDS    => integer phase accumulator (dds_phase_bits wide, 24 by default)
+                    indexing a 2^dds_table_bits sine table by shifting, tones
+                    within sample_rate / 2^(dds_phase_bits + 1), i.e. 0.002 Hz
+                    at 36 kHz (small ints on the board, no long arithmetic),
+                    2 x 256 bytes of tables
+SYNTHESIS_VECTOR => array operations on vector_bits bits at a time with ulab.numpy
+                    on the board or NumPy on the host, within +-1 of SYNTHESIS_SAMPLE.
+                    Falls back to SYNTHESIS_BLOCK (or DDS) if neither is available
+
+Instead of datapoints_per_bit any sample_rate can be given (e.g. 8000 or 9600 Hz).
+If it is not a multiple of the bit rate, a fractional bit clock decides how many
+samples each bit gets (e.g. 6 or 7 at 8000 Hz) and only SYNTHESIS_DDS can be used.
+
+The frame is first encoded into a packed tone bitstream (NRZI and bit stuffing
+a whole byte at a time via a state transition table), the synthesis then only
+turns tones into audio. The bitstream alone gives the exact airtime.
+
+Wherever a frame is expected, a list or tuple of frames can be given too: they
+are sent as one transmission (burst) with one head and tail preamble and only
+_preamble_separator_length flags between the frames.
 '''
 
 import math
 import array
 import gc
+from afsk_tables import SINUS_TABLE, NRZI_TABLE
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
 
 class AFSK():
 
@@ -30,87 +70,597 @@ class AFSK():
     _DAC_amplitude = 125
     _DAC_idle_level = 127
 
-    def __init__(self, bps_rate = 1200, frequency_space = 2200, frequency_mark = 1200, datapoints_per_bit = 15):
-        self._datapoints_per_bit = datapoints_per_bit
-        self._sample_rate = bps_rate * datapoints_per_bit
+    SYNTHESIS_SAMPLE = 0
+    SYNTHESIS_BLOCK = 1
+    SYNTHESIS_DDS = 2
+    SYNTHESIS_VECTOR = 3
+
+    HEAD_CACHE_SIZE = 2 # rendered heads kept, see _head_samples
+
+    '''
+    NRZI + bit stuffing state transitions for a whole byte, indexed by
+    byte * 6 + run, where run is the number of equal tones sent since the last
+    tone change (0..5). Each entry holds
+      bits 0..9:    tone changes relative to the tone before the byte, LSB first
+      bits 10..11:  number of stuffed bits (0..2)
+      bits 12..14:  run after the byte
+    A zero bit changes the tone, a one bit keeps it; after five ones a zero is stuffed.
+    A 3 KB heap copy of the NRZI_TABLE literal (afsk_tables), made once at
+    import and shared by all instances.
+    '''
+    _nrzi_table = array.array('H', NRZI_TABLE)
+
+    def __init__(self, bps_rate = 1200, frequency_space = 2200, frequency_mark = 1200, datapoints_per_bit = 15, synthesis = None, max_frame_length = 100, dds_phase_bits = 24, dds_table_bits = 8, sample_rate = None, reserve_buffer = True):
+        self._frequency_space = frequency_space
+        self._frequency_mark = frequency_mark
+        self._dds_phase_bits = dds_phase_bits
+        self._dds_table_bits = dds_table_bits
+        if sample_rate is None:
+            sample_rate = bps_rate * datapoints_per_bit
+        self._bps_rate = bps_rate
+        self._sample_rate = sample_rate
+        # samples per bit = datapoints_per_bit + bit_clock_remainder / bps_rate
+        self._datapoints_per_bit = sample_rate // bps_rate
+        self._bit_clock_remainder = sample_rate % bps_rate
+        datapoints_per_bit = self._datapoints_per_bit
+        self._bit_length = datapoints_per_bit
         self._phase = 0
         self._preamble_head_length = 30
         self._preamble_tail_length = 10
+        self._preamble_separator_length = 2 # between the frames of a burst
 
         self._space_degree_incr = int(360 * frequency_space / bps_rate / datapoints_per_bit)
         self._mark_degree_incr = int(360 * frequency_mark / bps_rate / datapoints_per_bit)
         self._debugging = False
 
-        # print("AFSK: before table", gc.mem_free())
-        self._sinus_table = []
-        for degree in range(0,360):
-            sinus_value = (math.sin(math.pi * 2 * degree / 360))
-            sinus_table_dac_value = int(sinus_value * self._DAC_amplitude)
-            self._sinus_table.append(sinus_table_dac_value)
-            # print(degree, sinus_table_dac_value, int(sinus_table_dac_value * self._DAC_preemphasis_space) + self._DAC_idle_level, int(sinus_table_dac_value * self._DAC_preemphasis_mark) + self._DAC_idle_level)
+        self._sinus_table = None
+        self._bit_samples = bytearray(datapoints_per_bit)
+        self._bit_samples_long = bytearray(datapoints_per_bit + 1) # fractional bit clock
+        self._bits = bytearray(0)
+        self._idle_samples = bytes([self._DAC_idle_level] * 30)
+        self.vector_bits = 64 # bits per array operation in SYNTHESIS_VECTOR
+        if synthesis is None:
+            if self._bit_clock_remainder == 0:
+                synthesis = self.SYNTHESIS_BLOCK
+            else:
+                synthesis = self.SYNTHESIS_DDS
+        self.synthesis = synthesis
         self._init_sequence()
+        self._renders = 0 # renders started, see render_afsk_bit_pattern
+        self._buffer = None
+        self._buffer_view = None
+        self.max_buffer_samples = self.max_samples(max_frame_length) # output buffer size, see reserve_buffer
+        if reserve_buffer == True:
+            self.reserve_buffer()
         # print("AFSK: after table", gc.mem_free())
 
     @property
     def samplerate(self):
         return self._sample_rate
 
+    '''
+    Worst-case number of DAC samples for a frame of the given length:
+    idle priming, head and tail flags and the data bits including at most
+    one stuffed bit per five data bits.
+    '''
+    def max_samples(self, frame_length):
+        bits = 8 * (self._preamble_head_length + frame_length + self._preamble_tail_length)
+        bits += 8 * frame_length // 5
+        return 2 * len(self._idle_samples) + (bits * self._sample_rate + self._bps_rate - 1) // self._bps_rate
+
+    '''
+    Flags sent before / after the frames (TXDELAY / TXTAIL), at least one each
+    '''
+    @property
+    def preamble_head_length(self):
+        return self._preamble_head_length
+
+    @preamble_head_length.setter
+    def preamble_head_length(self, flags):
+        self._preamble_head_length = max(int(flags), 1)
+
+    @property
+    def preamble_tail_length(self):
+        return self._preamble_tail_length
+
+    @preamble_tail_length.setter
+    def preamble_tail_length(self, flags):
+        self._preamble_tail_length = max(int(flags), 1)
+
+    # number of flags lasting at least the given seconds
+    def preamble_flags(self, seconds):
+        return -(-int(seconds * self._bps_rate) // 8)
+
+    @property
+    def synthesis(self):
+        return self._synthesis
+
+    @synthesis.setter
+    def synthesis(self, mode):
+        self._tone_blocks = None
+        self._dds_tables = None
+        self._clear_preamble_cache()
+        if mode == self.SYNTHESIS_VECTOR and (np is None or self._bit_clock_remainder != 0):
+            # no ulab / numpy (or uneven bit lengths): fall back to pure Python
+            if self._bit_clock_remainder == 0:
+                mode = self.SYNTHESIS_BLOCK
+            else:
+                mode = self.SYNTHESIS_DDS
+        if mode != self.SYNTHESIS_DDS and self._bit_clock_remainder != 0:
+            raise ValueError # needs a whole number of samples per bit
+        if mode == self.SYNTHESIS_SAMPLE:
+            self._init_sinus_table()
+            self._tone_samples = self._tone_samples_reference
+        elif mode == self.SYNTHESIS_BLOCK:
+            self._init_sinus_table()
+            self._init_tone_blocks()
+            self._sinus_table = None # only needed to build the blocks
+            self._tone_samples = self._tone_samples_block
+        elif mode == self.SYNTHESIS_DDS:
+            self._sinus_table = None
+            self._init_dds()
+            self._tone_samples = self._tone_samples_dds
+        elif mode == self.SYNTHESIS_VECTOR:
+            self._sinus_table = None
+            self._vector_ramp = np.array(range(1, self._datapoints_per_bit + 1)).reshape((1, self._datapoints_per_bit))
+            self._tone_samples = None # renders whole groups of bits in _bits_samples_vector
+        else:
+            raise ValueError
+        gc.collect()
+        self._synthesis = mode
+
+    '''
+    Frequencies actually produced (mark, space) in Hz
+    '''
+    @property
+    def tone_frequencies(self):
+        if self._synthesis == self.SYNTHESIS_DDS:
+            unit = self._sample_rate / (1 << self._dds_phase_bits)
+            return self._dds_mark_incr * unit, self._dds_space_incr * unit
+        unit = self._sample_rate / 360
+        return self._mark_degree_incr * unit, self._space_degree_incr * unit
+
+    def _init_sinus_table(self):
+        if self._sinus_table is None:
+            if self._DAC_amplitude == 125:
+                self._sinus_table = array.array('b', SINUS_TABLE) # int(sin * 125), 360 byte copy of the literal
+                return
+            # print("AFSK: before table", gc.mem_free())
+            self._sinus_table = []
+            for degree in range(0,360):
+                sinus_value = (math.sin(math.pi * 2 * degree / 360))
+                sinus_table_dac_value = int(sinus_value * self._DAC_amplitude)
+                self._sinus_table.append(sinus_table_dac_value)
+            # print("AFSK: after table", gc.mem_free())
+
+    '''
+    DDS: one DAC table per tone (preemphasis and idle level applied) with
+    2^dds_table_bits entries, indexed by the top bits of the phase accumulator.
+    '''
+    def _init_dds(self):
+        size = 1 << self._dds_table_bits
+        mark = bytearray(size)
+        space = bytearray(size)
+        for i in range(size):
+            sinus_value = int(math.sin(math.pi * 2 * i / size) * self._DAC_amplitude)
+            mark[i] = int(sinus_value * self._DAC_preemphasis_mark) + self._DAC_idle_level
+            space[i] = int(sinus_value * self._DAC_preemphasis_space) + self._DAC_idle_level
+        self._dds_tables = (bytes(mark), bytes(space))
+        self._dds_mask = (1 << self._dds_phase_bits) - 1
+        self._dds_shift = self._dds_phase_bits - self._dds_table_bits
+        self._dds_mark_incr = int(self._frequency_mark * (1 << self._dds_phase_bits) / self._sample_rate + 0.5)
+        self._dds_space_incr = int(self._frequency_space * (1 << self._dds_phase_bits) / self._sample_rate + 0.5)
+
+    '''
+    Precompute the DAC bytes of one bit for every tone and every start phase
+    the phase increments can reach (multiples of their common divisor), plus
+    the phase the block ends with. 15 datapoints per bit: 2 x 90 blocks = 2700 bytes.
+    '''
+    def _init_tone_blocks(self):
+        dpb = self._datapoints_per_bit
+        step = _gcd(_gcd(self._space_degree_incr, self._mark_degree_incr), 360)
+        phases = 360 // step
+        blocks = bytearray(2 * phases * dpb)
+        end_phase = array.array('H', [0] * (2 * phases))
+        for tone in (self._mark, self._space):
+            if tone == self._space:
+                incr = self._space_degree_incr
+                preemphasis = self._DAC_preemphasis_space
+            else:
+                incr = self._mark_degree_incr
+                preemphasis = self._DAC_preemphasis_mark
+            for p in range(phases):
+                i = tone * phases + p
+                phase = p * step
+                for dp in range(dpb):
+                    phase = (phase + incr) % 360
+                    blocks[i * dpb + dp] = int(self._sinus_table[phase] * preemphasis) + self._DAC_idle_level
+                end_phase[i] = phase
+        self._block_step = step
+        self._block_phases = phases
+        self._tone_blocks = memoryview(bytes(blocks))
+        self._tone_block_end_phase = end_phase
+
     def _init_sequence(self):
         self._tone = self._start_frequency
-        self._bit_stuff_cntr = 0
         self._phase = 0
-        self._sequence =  array.array('B',[])
+        self._bit_clock = 0
 
-    def _add_tone_to_sequence(self):
+    def _tone_samples_block(self):
+        i = self._tone * self._block_phases + self._phase // self._block_step
+        o = i * self._datapoints_per_bit
+        self._phase = self._tone_block_end_phase[i]
+        return self._tone_blocks[o:o + self._datapoints_per_bit]
+
+    def _tone_samples_dds(self):
+        if self._bit_length == self._datapoints_per_bit:
+            samples = self._bit_samples
+        else:
+            samples = self._bit_samples_long
+        table = self._dds_tables[self._tone]
         if self._tone == self._space:
+            incr = self._dds_space_incr
+        else:
+            incr = self._dds_mark_incr
+        mask = self._dds_mask
+        shift = self._dds_shift
+        phase = self._phase
+        for dp in range(0, self._bit_length):
+            phase = (phase + incr) & mask
+            samples[dp] = table[phase >> shift]
+        self._phase = phase
+        return samples
+
+    def _tone_samples_reference(self):
+        if self._tone == self._space:
+            samples = self._bit_samples
             for dp in range(0, self._datapoints_per_bit):
                 self._phase = (self._phase + self._space_degree_incr) % 360
                 DAC_value = int(self._sinus_table[self._phase] * self._DAC_preemphasis_space) + self._DAC_idle_level
-                self._sequence.append(DAC_value)
+                samples[dp] = DAC_value
         else:
+            samples = self._bit_samples
             for dp in range(0, self._datapoints_per_bit):
                 self._phase = (self._phase + self._mark_degree_incr) % 360
                 DAC_value = int(self._sinus_table[self._phase] * self._DAC_preemphasis_mark) + self._DAC_idle_level
-                self._sequence.append(DAC_value)
+                samples[dp] = DAC_value
+        return samples
 
-        self._bit_stuff_cntr += 1
 
-    def _swap_tone(self):
-        if self._tone == self._space:
-            self._tone = self._mark
+    # a single frame (bytes-like or list of ints) or the frames of a burst as a tuple/list
+    def _frames(self, data):
+        if isinstance(data, (list, tuple)) and len(data) > 0 and not isinstance(data[0], int):
+            return data
+        return (data,)
+
+    # bytes of all frames plus the separator flags between them
+    def _data_length(self, data):
+        frames = self._frames(data)
+        length = self._preamble_separator_length * (len(frames) - 1)
+        for frame in frames:
+            length += len(frame)
+        return length
+
+    '''
+    Appends flags (not stuffed) and then the frame (NRZI, bit stuffing) to the
+    bitstream bits, one bit per symbol, LSB first: 1 = space, 0 = mark.
+    pos, acc and nacc are the write state (byte position, pending bits and
+    their count), tone the tone before the first symbol. Returns the new
+    write state and the tone after the last symbol. The run counter restarts
+    with every frame, flags are never stuffed.
+    '''
+    def _encode(self, bits, pos, acc, nacc, tone, flags, frame):
+        for x in range(flags):
+            acc |= (0x7f ^ (0xff * tone)) << nacc   # 0x7e: change, 6 x keep, change
+            bits[pos] = acc & 0xff
+            acc >>= 8
+            pos += 1
+        table = self._nrzi_table
+        run = 0
+        for x in range(len(frame)):
+            e = table[frame[x] * 6 + run]
+            n = 8 + ((e >> 10) & 3)
+            tones = e & 0x3ff
+            if tone:
+                tones ^= (1 << n) - 1
+            tone = (tones >> (n - 1)) & 1
+            run = e >> 12
+            acc |= tones << nacc
+            nacc += n
+            while nacc >= 8:
+                bits[pos] = acc & 0xff
+                acc >>= 8
+                nacc -= 8
+                pos += 1
+        return pos, acc, nacc, tone
+
+    # bytes for flags plus length bytes of frame with worst-case stuffing
+    def _bitstream_size(self, flags, length):
+        return (8 * (flags + length) + 8 * length // 5) // 8 + 2
+
+    '''
+    Packed tone bitstream of the whole transmission (head flags, frames with
+    stuffed bits, tail flags) in a new buffer, one bit per symbol, LSB first:
+    1 = space, 0 = mark. The frames of a burst are separated by
+    _preamble_separator_length flags. Returns a memoryview of the bitstream
+    and the number of symbols. The renderer does not use it, it encodes one
+    frame at a time into a small reused buffer (_tone_bits).
+    '''
+    def create_tone_bitstream(self, data):
+        bits = bytearray(self._bitstream_size(self._preamble_head_length + self._preamble_tail_length, self._data_length(data)))
+        pos = 0
+        acc = 0
+        nacc = 0
+        tone = self._start_frequency
+        flags = self._preamble_head_length
+        for frame in self._frames(data):
+            pos, acc, nacc, tone = self._encode(bits, pos, acc, nacc, tone, flags, frame)
+            flags = self._preamble_separator_length
+        pos, acc, nacc, tone = self._encode(bits, pos, acc, nacc, tone, self._preamble_tail_length, ())
+        nbits = pos * 8 + nacc
+        if nacc > 0:
+            bits[pos] = acc
+            pos += 1
+        return memoryview(bits)[:pos], nbits
+
+    '''
+    Bitstream of flags followed by one frame (or flags only), starting after
+    tone. Returns the reused bit buffer, the number of symbols and the tone
+    after the last one. The buffer only has to hold the longest single frame,
+    however many frames a burst has.
+    '''
+    def _tone_bits(self, flags, frame, tone):
+        size = self._bitstream_size(flags, len(frame))
+        if len(self._bits) < size:
+            self._bits = bytearray(size)
+        bits = self._bits
+        pos, acc, nacc, tone = self._encode(bits, 0, 0, 0, tone, flags, frame)
+        nbits = pos * 8 + nacc
+        if nacc > 0:
+            bits[pos] = acc
+        return bits, nbits, tone
+
+    '''
+    Number of stuffed bits of a frame or burst, from the same table as the
+    bitstream but without writing it (so it does not disturb a render in progress)
+    '''
+    def _stuffed_bits(self, data):
+        table = self._nrzi_table
+        stuffed = 0
+        for frame in self._frames(data):
+            run = 0
+            for x in range(len(frame)):
+                e = table[frame[x] * 6 + run]
+                stuffed += (e >> 10) & 3
+                run = e >> 12
+        return stuffed
+
+    '''
+    Exact number of DAC samples and on-air seconds of a frame, without rendering audio
+    '''
+    def samples_count(self, data):
+        nbits = 8 * (self._preamble_head_length + self._data_length(data) + self._preamble_tail_length)
+        nbits += self._stuffed_bits(data)
+        return nbits * self._sample_rate // self._bps_rate + 2 * len(self._idle_samples)
+
+    def airtime(self, data):
+        return self.samples_count(data) / self._sample_rate
+
+    '''
+    Bits on air of a frame or burst: head flags, frame bits (including the
+    separator flags of a burst), stuffed bits and tail flags
+    '''
+    def airtime_bits(self, data):
+        return (8 * self._preamble_head_length, 8 * self._data_length(data),
+            self._stuffed_bits(data), 8 * self._preamble_tail_length)
+
+    '''
+    Audio of the bits start..end-1 of the bitstream, one sample buffer per bit,
+    a yielded buffer is only valid until the next one is requested.
+    '''
+    def _bits_samples(self, bits, start, end):
+        if self._synthesis == self.SYNTHESIS_VECTOR:
+            yield from self._bits_samples_vector(bits, start, end)
+        elif self._bit_clock_remainder == 0:
+            for i in range(start, end):
+                self._tone = (bits[i >> 3] >> (i & 7)) & 1
+                yield self._tone_samples()
         else:
-            self._tone = self._space
-        self._bit_stuff_cntr = 0
-
-    def _add_data_byte(self, b):
-        for x in range(0, 8):
-            if b & (1 << x) == 0:
-                self._swap_tone()
-            self._add_tone_to_sequence()
-
-            if self._bit_stuff_cntr > 5:
-                self._swap_tone()
-                self._add_tone_to_sequence()
-
-    def _add_preamble(self, length):
-        for l in range(length):
-            for x in range(0, 8):
-                if self.AX25_FLAG & (1 << x) == 0:
-                    self._swap_tone()
-                self._add_tone_to_sequence()
-            self._bit_stuff_cntr = 0
-
-    def _prime_dac_level(self):
-        for x in range(0,30):
-            self._sequence.append(self._DAC_idle_level)
+            for i in range(start, end):
+                # bit i ends at sample floor((i + 1) * sample_rate / bps_rate)
+                self._bit_clock += self._bit_clock_remainder
+                if self._bit_clock >= self._bps_rate:
+                    self._bit_clock -= self._bps_rate
+                    self._bit_length = self._datapoints_per_bit + 1
+                else:
+                    self._bit_length = self._datapoints_per_bit
+                self._tone = (bits[i >> 3] >> (i & 7)) & 1
+                yield self._tone_samples()
+            self._bit_length = self._datapoints_per_bit
 
-    def create_afsk_bit_pattern(self, data):
+    '''
+    Same phase model as the reference loop, but the phase of every sample of
+    vector_bits bits is computed as one (bits x datapoints) array:
+    start phase of the bit + n * increment, n = 1..datapoints_per_bit.
+    Only the start phases are tracked per bit in Python.
+    '''
+    def _bits_samples_vector(self, bits, start, end):
+        dpb = self._datapoints_per_bit
+        for group in range(start, end, self.vector_bits):
+            n = min(self.vector_bits, end - group)
+            phases = []
+            increments = []
+            gains = []
+            phase = self._phase
+            for i in range(group, group + n):
+                self._tone = (bits[i >> 3] >> (i & 7)) & 1
+                if self._tone == self._space:
+                    incr = self._space_degree_incr
+                    gains.append(self._DAC_preemphasis_space)
+                else:
+                    incr = self._mark_degree_incr
+                    gains.append(self._DAC_preemphasis_mark)
+                phases.append(phase)
+                increments.append(incr)
+                phase = (phase + dpb * incr) % 360
+            self._phase = phase
+            degrees = np.array(phases).reshape((n, 1)) + np.array(increments).reshape((n, 1)) * self._vector_ramp
+            # truncate towards zero like int() in the table and in the preemphasis step
+            values = np.array(np.sin(degrees * (math.pi / 180)) * self._DAC_amplitude, dtype = np.int16)
+            values = np.array(values * np.array(gains).reshape((n, 1)), dtype = np.int16)
+            yield np.array(values + self._DAC_idle_level, dtype = np.uint8).tobytes()
+
+    '''
+    The head (idle priming + head flags) always starts from the initial state
+    and sounds the same for every frame, so it is rendered once into a buffer
+    of its exact size and replayed from then on, together with the state it
+    ends in. Heads of the last HEAD_CACHE_SIZE lengths are kept (e.g. the
+    beacon head and the TXDELAY of a KISS host), a new length replaces the one
+    used longest ago. The tail is not cached: its start state differs from
+    frame to frame, it is rendered straight into the output like the frame bits.
+    '''
+    def _head_samples(self):
+        flags = self._preamble_head_length
+        cache = None
+        for entry in self._head_cache:
+            if entry[0] == flags:
+                cache = entry
+        if cache is not None:
+            # most recently used last
+            self._head_cache.remove(cache)
+            self._head_cache.append(cache)
+        else:
+            if len(self._head_cache) >= self.HEAD_CACHE_SIZE:
+                self._head_cache.pop(0)
+            bits, nbits, tone = self._tone_bits(flags, (), self._start_frequency)
+            idle = len(self._idle_samples)
+            rendered = bytearray(idle + nbits * self._sample_rate // self._bps_rate)
+            rendered[0:idle] = self._idle_samples
+            pos = idle
+            for samples in self._bits_samples(bits, 0, nbits):
+                n = len(samples)
+                rendered[pos:pos + n] = samples
+                pos += n
+            cache = (flags, memoryview(rendered), self._phase, self._tone, self._bit_clock)
+            self._head_cache.append(cache)
+        self._phase = cache[2]
+        self._tone = cache[3]
+        self._bit_clock = cache[4]
+        return cache[1]
+
+    def _clear_preamble_cache(self):
+        self._head_cache = []
+
+    '''
+    Audio of a whole frame or burst in playing order, as a sequence of sample
+    buffers (cached head, one per bit of the frames and the tail flags, idle). The frames
+    are encoded one at a time, just before their audio is needed.
+    A yielded buffer is only valid until the next one is requested.
+    '''
+    def _frame_samples(self, data):
         self._init_sequence()
-        self._prime_dac_level()
-        self._add_preamble(self._preamble_head_length)
-        for x in range(len(data)):
-            self._add_data_byte(data[x])
-        self._add_preamble(self._preamble_tail_length)
-        self._prime_dac_level()
-        return self._sequence
+        yield self._head_samples()
+        tone = self._start_frequency # head flags end with the tone they start with
+        flags = 0
+        for frame in self._frames(data):
+            bits, nbits, tone = self._tone_bits(flags, frame, tone)
+            yield from self._bits_samples(bits, 0, nbits)
+            flags = self._preamble_separator_length
+        bits, nbits, tone = self._tone_bits(self._preamble_tail_length, (), tone)
+        yield from self._bits_samples(bits, 0, nbits)
+        yield self._idle_samples
+
+    '''
+    The output buffer holds max_buffer_samples (a frame of max_frame_length
+    bytes with the worst-case stuffing) and is allocated once and reused by
+    every frame. It never grows: frames and bursts that do not fit have to be
+    streamed (stream_afsk_bit_pattern). release_buffer() frees it, e.g. when
+    everything is streamed; it is allocated again on the next render.
+    '''
+    def reserve_buffer(self):
+        if self._buffer is None:
+            gc.collect()
+            self._buffer = array.array('B', bytes(self.max_buffer_samples))
+            self._buffer_view = memoryview(self._buffer)
+
+    def release_buffer(self):
+        self._buffer = None
+        self._buffer_view = None
+
+    # True if the audio of the frame or burst fits into the output buffer
+    def fits(self, data):
+        if self.max_samples(self._data_length(data)) <= self.max_buffer_samples:
+            return True
+        return self.samples_count(data) <= self.max_buffer_samples
+
+    '''
+    Returns a memoryview of the used part of the output buffer,
+    it is valid until the next frame is rendered. Raises ValueError if the
+    audio does not fit into the buffer (see fits).
+    '''
+    def create_afsk_bit_pattern(self, data):
+        for audio in self.render_afsk_bit_pattern(data):
+            pass
+        return audio
+
+    '''
+    Incremental variant of create_afsk_bit_pattern for rendering in idle time:
+    yields None after every step sample buffers (about one per bit) and finally
+    the audio. data has to stay unchanged until then. All renders share the
+    encoder state (tone, phase, bit clock, bit buffer): if another render or
+    stream is started meanwhile, the generator raises ValueError when it is
+    resumed instead of going on from the other frame's state.
+    '''
+    def render_afsk_bit_pattern(self, data, step = 0):
+        if self.fits(data) == False:
+            raise ValueError # longer than the output buffer, stream it
+        self.reserve_buffer()
+        self._renders += 1
+        render = self._renders
+        out = self._buffer_view
+        pos = 0
+        k = 0
+        for samples in self._frame_samples(data):
+            n = len(samples)
+            out[pos:pos + n] = samples
+            pos += n
+            k += 1
+            if k == step:
+                k = 0
+                yield None
+                if self._renders != render:
+                    raise ValueError # encoder state used by another render
+        yield out[:pos]
 
+    '''
+    Streaming variant of create_afsk_bit_pattern: the audio is written into the
+    given buffers in turn and a memoryview of each filled buffer is yielded (the
+    last one may be shorter). A buffer is written again only after the next one
+    has been yielded, so it can be played while the following chunk is rendered.
+    RAM usage is the two buffers, independent of the frame length. Like
+    render_afsk_bit_pattern it raises ValueError if another render was started
+    while it was suspended.
+    '''
+    def stream_afsk_bit_pattern(self, data, buffers):
+        self._renders += 1
+        render = self._renders
+        b = 0
+        chunk = memoryview(buffers[b])
+        pos = 0
+        for samples in self._frame_samples(data):
+            n = len(samples)
+            i = 0
+            while i < n:
+                c = min(n - i, len(chunk) - pos)
+                chunk[pos:pos + c] = samples[i:i + c]
+                pos += c
+                i += c
+                if pos == len(chunk):
+                    yield chunk
+                    if self._renders != render:
+                        raise ValueError # encoder state used by another render
+                    b ^= 1
+                    chunk = memoryview(buffers[b])
+                    pos = 0
+        if pos > 0:
+            yield chunk[:pos]
@@ -0,0 +1,234 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Constant lookup tables of AFSK as bytes literals instead of being computed
+at runtime. In a frozen module the literals stay in flash (from a .py or .mpy
+they are loaded into the heap at import). AFSK uses them as arrays, which are
+copies in the heap: 3 KB for NRZI_TABLE, 360 bytes for SINUS_TABLE.
+Generated and checked by helper/make_tables.py.
+
+SINUS_TABLE => int(sin(degree) * 125) for degree 0..359, signed bytes (array 'b')
+NRZI_TABLE  => NRZI + bit stuffing transitions, 256 x 6 entries of 16 bit
+               little-endian (array 'H'), see AFSK._nrzi_table
+'''
+
+SINUS_TABLE = (
+    b'\x00\x02\x04\x06\x08\x0a\x0d\x0f\x11\x13\x15\x17\x19\x1c\x1e\x20'
+    b'\x22\x24\x26\x28\x2a\x2c\x2e\x30\x32\x34\x36\x38\x3a\x3c\x3e\x40'
+    b'\x42\x44\x45\x47\x49\x4b\x4c\x4e\x50\x52\x53\x55\x56\x58\x59\x5b'
+    b'\x5c\x5e\x5f\x61\x62\x63\x65\x66\x67\x68\x6a\x6b\x6c\x6d\x6e\x6f'
+    b'\x70\x71\x72\x73\x73\x74\x75\x76\x76\x77\x78\x78\x79\x79\x7a\x7a'
+    b'\x7b\x7b\x7b\x7c\x7c\x7c\x7c\x7c\x7c\x7c\x7d\x7c\x7c\x7c\x7c\x7c'
+    b'\x7c\x7c\x7b\x7b\x7b\x7a\x7a\x79\x79\x78\x78\x77\x76\x76\x75\x74'
+    b'\x73\x73\x72\x71\x70\x6f\x6e\x6d\x6c\x6b\x6a\x68\x67\x66\x65\x63'
+    b'\x62\x61\x5f\x5e\x5c\x5b\x59\x58\x56\x55\x53\x52\x50\x4e\x4c\x4b'
+    b'\x49\x47\x45\x44\x42\x40\x3e\x3c\x3a\x38\x36\x34\x32\x30\x2e\x2c'
+    b'\x2a\x28\x26\x24\x22\x20\x1e\x1c\x19\x17\x15\x13\x11\x0f\x0d\x0a'
+    b'\x08\x06\x04\x02\x00\xfe\xfc\xfa\xf8\xf6\xf3\xf1\xef\xed\xeb\xe9'
+    b'\xe7\xe4\xe2\xe0\xde\xdc\xda\xd8\xd6\xd4\xd2\xd0\xce\xcc\xca\xc8'
+    b'\xc6\xc4\xc2\xc0\xbe\xbc\xbb\xb9\xb7\xb5\xb4\xb2\xb0\xae\xad\xab'
+    b'\xaa\xa8\xa7\xa5\xa4\xa2\xa1\x9f\x9e\x9d\x9b\x9a\x99\x98\x96\x95'
+    b'\x94\x93\x92\x91\x90\x8f\x8e\x8d\x8d\x8c\x8b\x8a\x8a\x89\x88\x88'
+    b'\x87\x87\x86\x86\x85\x85\x85\x84\x84\x84\x84\x84\x84\x84\x83\x84'
+    b'\x84\x84\x84\x84\x84\x84\x85\x85\x85\x86\x86\x87\x87\x88\x88\x89'
+    b'\x8a\x8a\x8b\x8c\x8d\x8d\x8e\x8f\x90\x91\x92\x93\x94\x95\x96\x98'
+    b'\x99\x9a\x9b\x9d\x9e\x9f\xa1\xa2\xa4\xa5\xa7\xa8\xaa\xab\xad\xae'
+    b'\xb0\xb2\xb4\xb5\xb7\xb9\xbb\xbc\xbe\xc0\xc2\xc4\xc6\xc8\xca\xcc'
+    b'\xce\xd0\xd2\xd4\xd6\xd8\xda\xdc\xde\xe0\xe2\xe4\xe7\xe9\xeb\xed'
+    b'\xef\xf1\xf3\xf6\xf8\xfa\xfc\xfe')
+
+NRZI_TABLE = (
+    b'\x55\x10\x55\x10\x55\x10\x55\x10\x55\x10\x55\x10\xaa\x10\xaa\x10'
+    b'\xaa\x10\xaa\x10\xaa\x10\xaa\x14\xab\x10\xab\x10\xab\x10\xab\x10'
+    b'\xab\x10\xab\x10\x54\x10\x54\x10\x54\x10\x54\x10\x54\x15\x56\x15'
+    b'\xa9\x10\xa9\x10\xa9\x10\xa9\x10\xa9\x10\xa9\x10\x56\x10\x56\x10'
+    b'\x56\x10\x56\x10\x56\x10\x52\x15\x57\x10\x57\x10\x57\x10\x57\x10'
+    b'\x57\x10\x57\x10\xa8\x10\xa8\x10\xa8\x10\xa8\x14\xac\x14\xae\x14'
+    b'\xad\x10\xad\x10\xad\x10\xad\x10\xad\x10\xad\x10\x52\x10\x52\x10'
+    b'\x52\x10\x52\x10\x52\x10\x5a\x15\x53\x10\x53\x10\x53\x10\x53\x10'
+    b'\x53\x10\x53\x10\xac\x10\xac\x10\xac\x10\xac\x10\xa4\x14\xa6\x14'
+    b'\x51\x10\x51\x10\x51\x10\x51\x10\x51\x10\x51\x10\xae\x10\xae\x10'
+    b'\xae\x10\xae\x10\xae\x10\xa2\x14\xaf\x10\xaf\x10\xaf\x10\xaf\x10'
+    b'\xaf\x10\xaf\x10\x50\x10\x50\x10\x50\x15\x58\x15\x5c\x15\x5e\x15'
+    b'\xa5\x10\xa5\x10\xa5\x10\xa5\x10\xa5\x10\xa5\x10\x5a\x10\x5a\x10'
+    b'\x5a\x10\x5a\x10\x5a\x10\x4a\x15\x5b\x10\x5b\x10\x5b\x10\x5b\x10'
+    b'\x5b\x10\x5b\x10\xa4\x10\xa4\x10\xa4\x10\xa4\x10\xb4\x14\xb6\x14'
+    b'\x59\x10\x59\x10\x59\x10\x59\x10\x59\x10\x59\x10\xa6\x10\xa6\x10'
+    b'\xa6\x10\xa6\x10\xa6\x10\xb2\x14\xa7\x10\xa7\x10\xa7\x10\xa7\x10'
+    b'\xa7\x10\xa7\x10\x58\x10\x58\x10\x58\x10\x48\x15\x4c\x15\x4e\x15'
+    b'\x5d\x10\x5d\x10\x5d\x10\x5d\x10\x5d\x10\x5d\x10\xa2\x10\xa2\x10'
+    b'\xa2\x10\xa2\x10\xa2\x10\xba\x14\xa3\x10\xa3\x10\xa3\x10\xa3\x10'
+    b'\xa3\x10\xa3\x10\x5c\x10\x5c\x10\x5c\x10\x5c\x10\x44\x15\x46\x15'
+    b'\xa1\x10\xa1\x10\xa1\x10\xa1\x10\xa1\x10\xa1\x10\x5e\x10\x5e\x10'
+    b'\x5e\x10\x5e\x10\x5e\x10\x42\x15\x5f\x10\x5f\x10\x5f\x10\x5f\x10'
+    b'\x5f\x10\x5f\x10\xa0\x10\xa0\x14\xb0\x14\xb8\x14\xbc\x14\xbe\x14'
+    b'\xb5\x10\xb5\x10\xb5\x10\xb5\x10\xb5\x10\xb5\x10\x4a\x10\x4a\x10'
+    b'\x4a\x10\x4a\x10\x4a\x10\x6a\x15\x4b\x10\x4b\x10\x4b\x10\x4b\x10'
+    b'\x4b\x10\x4b\x10\xb4\x10\xb4\x10\xb4\x10\xb4\x10\x94\x14\x96\x14'
+    b'\x49\x10\x49\x10\x49\x10\x49\x10\x49\x10\x49\x10\xb6\x10\xb6\x10'
+    b'\xb6\x10\xb6\x10\xb6\x10\x92\x14\xb7\x10\xb7\x10\xb7\x10\xb7\x10'
+    b'\xb7\x10\xb7\x10\x48\x10\x48\x10\x48\x10\x68\x15\x6c\x15\x6e\x15'
+    b'\x4d\x10\x4d\x10\x4d\x10\x4d\x10\x4d\x10\x4d\x10\xb2\x10\xb2\x10'
+    b'\xb2\x10\xb2\x10\xb2\x10\x9a\x14\xb3\x10\xb3\x10\xb3\x10\xb3\x10'
+    b'\xb3\x10\xb3\x10\x4c\x10\x4c\x10\x4c\x10\x4c\x10\x64\x15\x66\x15'
+    b'\xb1\x10\xb1\x10\xb1\x10\xb1\x10\xb1\x10\xb1\x10\x4e\x10\x4e\x10'
+    b'\x4e\x10\x4e\x10\x4e\x10\x62\x15\x4f\x10\x4f\x10\x4f\x10\x4f\x10'
+    b'\x4f\x10\x4f\x10\xb0\x10\xb0\x10\x90\x14\x98\x14\x9c\x14\x9e\x14'
+    b'\x45\x10\x45\x10\x45\x10\x45\x10\x45\x10\x45\x10\xba\x10\xba\x10'
+    b'\xba\x10\xba\x10\xba\x10\x8a\x14\xbb\x10\xbb\x10\xbb\x10\xbb\x10'
+    b'\xbb\x10\xbb\x10\x44\x10\x44\x10\x44\x10\x44\x10\x74\x15\x76\x15'
+    b'\xb9\x10\xb9\x10\xb9\x10\xb9\x10\xb9\x10\xb9\x10\x46\x10\x46\x10'
+    b'\x46\x10\x46\x10\x46\x10\x72\x15\x47\x10\x47\x10\x47\x10\x47\x10'
+    b'\x47\x10\x47\x10\xb8\x10\xb8\x10\xb8\x10\x88\x14\x8c\x14\x8e\x14'
+    b'\xbd\x10\xbd\x10\xbd\x10\xbd\x10\xbd\x10\xbd\x10\x42\x10\x42\x10'
+    b'\x42\x10\x42\x10\x42\x10\x7a\x15\x43\x10\x43\x10\x43\x10\x43\x10'
+    b'\x43\x10\x43\x10\xbc\x10\xbc\x10\xbc\x10\xbc\x10\x84\x14\x86\x14'
+    b'\x41\x10\x41\x10\x41\x10\x41\x10\x41\x10\x41\x10\xbe\x10\xbe\x10'
+    b'\xbe\x10\xbe\x10\xbe\x10\x82\x14\xbf\x14\xbf\x14\xbf\x14\xbf\x14'
+    b'\xbf\x14\xbf\x14\x40\x15\x60\x15\x70\x15\x78\x15\x7c\x15\x7e\x19'
+    b'\x95\x10\x95\x10\x95\x10\x95\x10\x95\x10\x95\x10\x6a\x10\x6a\x10'
+    b'\x6a\x10\x6a\x10\x6a\x10\x2a\x15\x6b\x10\x6b\x10\x6b\x10\x6b\x10'
+    b'\x6b\x10\x6b\x10\x94\x10\x94\x10\x94\x10\x94\x10\xd4\x14\xd6\x14'
+    b'\x69\x10\x69\x10\x69\x10\x69\x10\x69\x10\x69\x10\x96\x10\x96\x10'
+    b'\x96\x10\x96\x10\x96\x10\xd2\x14\x97\x10\x97\x10\x97\x10\x97\x10'
+    b'\x97\x10\x97\x10\x68\x10\x68\x10\x68\x10\x28\x15\x2c\x15\x2e\x15'
+    b'\x6d\x10\x6d\x10\x6d\x10\x6d\x10\x6d\x10\x6d\x10\x92\x10\x92\x10'
+    b'\x92\x10\x92\x10\x92\x10\xda\x14\x93\x10\x93\x10\x93\x10\x93\x10'
+    b'\x93\x10\x93\x10\x6c\x10\x6c\x10\x6c\x10\x6c\x10\x24\x15\x26\x15'
+    b'\x91\x10\x91\x10\x91\x10\x91\x10\x91\x10\x91\x10\x6e\x10\x6e\x10'
+    b'\x6e\x10\x6e\x10\x6e\x10\x22\x15\x6f\x10\x6f\x10\x6f\x10\x6f\x10'
+    b'\x6f\x10\x6f\x10\x90\x10\x90\x10\xd0\x14\xd8\x14\xdc\x14\xde\x14'
+    b'\x65\x10\x65\x10\x65\x10\x65\x10\x65\x10\x65\x10\x9a\x10\x9a\x10'
+    b'\x9a\x10\x9a\x10\x9a\x10\xca\x14\x9b\x10\x9b\x10\x9b\x10\x9b\x10'
+    b'\x9b\x10\x9b\x10\x64\x10\x64\x10\x64\x10\x64\x10\x34\x15\x36\x15'
+    b'\x99\x10\x99\x10\x99\x10\x99\x10\x99\x10\x99\x10\x66\x10\x66\x10'
+    b'\x66\x10\x66\x10\x66\x10\x32\x15\x67\x10\x67\x10\x67\x10\x67\x10'
+    b'\x67\x10\x67\x10\x98\x10\x98\x10\x98\x10\xc8\x14\xcc\x14\xce\x14'
+    b'\x9d\x10\x9d\x10\x9d\x10\x9d\x10\x9d\x10\x9d\x10\x62\x10\x62\x10'
+    b'\x62\x10\x62\x10\x62\x10\x3a\x15\x63\x10\x63\x10\x63\x10\x63\x10'
+    b'\x63\x10\x63\x10\x9c\x10\x9c\x10\x9c\x10\x9c\x10\xc4\x14\xc6\x14'
+    b'\x61\x10\x61\x10\x61\x10\x61\x10\x61\x10\x61\x10\x9e\x10\x9e\x10'
+    b'\x9e\x10\x9e\x10\x9e\x10\xc2\x14\x9f\x10\x9f\x10\x9f\x10\x9f\x10'
+    b'\x9f\x10\x9f\x10\x60\x10\x20\x15\x30\x15\x38\x15\x3c\x15\x3e\x15'
+    b'\x75\x10\x75\x10\x75\x10\x75\x10\x75\x10\x75\x10\x8a\x10\x8a\x10'
+    b'\x8a\x10\x8a\x10\x8a\x10\xea\x14\x8b\x10\x8b\x10\x8b\x10\x8b\x10'
+    b'\x8b\x10\x8b\x10\x74\x10\x74\x10\x74\x10\x74\x10\x14\x15\x16\x15'
+    b'\x89\x10\x89\x10\x89\x10\x89\x10\x89\x10\x89\x10\x76\x10\x76\x10'
+    b'\x76\x10\x76\x10\x76\x10\x12\x15\x77\x10\x77\x10\x77\x10\x77\x10'
+    b'\x77\x10\x77\x10\x88\x10\x88\x10\x88\x10\xe8\x14\xec\x14\xee\x14'
+    b'\x8d\x10\x8d\x10\x8d\x10\x8d\x10\x8d\x10\x8d\x10\x72\x10\x72\x10'
+    b'\x72\x10\x72\x10\x72\x10\x1a\x15\x73\x10\x73\x10\x73\x10\x73\x10'
+    b'\x73\x10\x73\x10\x8c\x10\x8c\x10\x8c\x10\x8c\x10\xe4\x14\xe6\x14'
+    b'\x71\x10\x71\x10\x71\x10\x71\x10\x71\x10\x71\x10\x8e\x10\x8e\x10'
+    b'\x8e\x10\x8e\x10\x8e\x10\xe2\x14\x8f\x10\x8f\x10\x8f\x10\x8f\x10'
+    b'\x8f\x10\x8f\x10\x70\x10\x70\x10\x10\x15\x18\x15\x1c\x15\x1e\x15'
+    b'\x85\x10\x85\x10\x85\x10\x85\x10\x85\x10\x85\x10\x7a\x10\x7a\x10'
+    b'\x7a\x10\x7a\x10\x7a\x10\x0a\x15\x7b\x10\x7b\x10\x7b\x10\x7b\x10'
+    b'\x7b\x10\x7b\x10\x84\x10\x84\x10\x84\x10\x84\x10\xf4\x14\xf6\x14'
+    b'\x79\x10\x79\x10\x79\x10\x79\x10\x79\x10\x79\x10\x86\x10\x86\x10'
+    b'\x86\x10\x86\x10\x86\x10\xf2\x14\x87\x10\x87\x10\x87\x10\x87\x10'
+    b'\x87\x10\x87\x10\x78\x10\x78\x10\x78\x10\x08\x15\x0c\x15\x0e\x15'
+    b'\x7d\x10\x7d\x10\x7d\x10\x7d\x10\x7d\x10\x7d\x10\x82\x10\x82\x10'
+    b'\x82\x10\x82\x10\x82\x10\xfa\x14\x83\x10\x83\x10\x83\x10\x83\x10'
+    b'\x83\x10\x83\x10\x7c\x10\x7c\x10\x7c\x10\x7c\x10\x04\x15\x06\x15'
+    b'\x81\x14\x81\x14\x81\x14\x81\x14\x81\x14\x81\x14\x7e\x15\x7e\x15'
+    b'\x7e\x15\x7e\x15\x7e\x15\x02\x19\x3f\x15\x3f\x15\x3f\x15\x3f\x15'
+    b'\x3f\x15\x3f\x15\xc0\x14\xe0\x14\xf0\x14\xf8\x14\xfc\x1a\x7e\x1a'
+    b'\xd5\x20\xd5\x20\xd5\x20\xd5\x20\xd5\x20\xd5\x20\x2a\x20\x2a\x20'
+    b'\x2a\x20\x2a\x20\x2a\x20\xaa\x25\x2b\x20\x2b\x20\x2b\x20\x2b\x20'
+    b'\x2b\x20\x2b\x20\xd4\x20\xd4\x20\xd4\x20\xd4\x20\x54\x24\x56\x24'
+    b'\x29\x20\x29\x20\x29\x20\x29\x20\x29\x20\x29\x20\xd6\x20\xd6\x20'
+    b'\xd6\x20\xd6\x20\xd6\x20\x52\x24\xd7\x20\xd7\x20\xd7\x20\xd7\x20'
+    b'\xd7\x20\xd7\x20\x28\x20\x28\x20\x28\x20\xa8\x25\xac\x25\xae\x25'
+    b'\x2d\x20\x2d\x20\x2d\x20\x2d\x20\x2d\x20\x2d\x20\xd2\x20\xd2\x20'
+    b'\xd2\x20\xd2\x20\xd2\x20\x5a\x24\xd3\x20\xd3\x20\xd3\x20\xd3\x20'
+    b'\xd3\x20\xd3\x20\x2c\x20\x2c\x20\x2c\x20\x2c\x20\xa4\x25\xa6\x25'
+    b'\xd1\x20\xd1\x20\xd1\x20\xd1\x20\xd1\x20\xd1\x20\x2e\x20\x2e\x20'
+    b'\x2e\x20\x2e\x20\x2e\x20\xa2\x25\x2f\x20\x2f\x20\x2f\x20\x2f\x20'
+    b'\x2f\x20\x2f\x20\xd0\x20\xd0\x20\x50\x24\x58\x24\x5c\x24\x5e\x24'
+    b'\x25\x20\x25\x20\x25\x20\x25\x20\x25\x20\x25\x20\xda\x20\xda\x20'
+    b'\xda\x20\xda\x20\xda\x20\x4a\x24\xdb\x20\xdb\x20\xdb\x20\xdb\x20'
+    b'\xdb\x20\xdb\x20\x24\x20\x24\x20\x24\x20\x24\x20\xb4\x25\xb6\x25'
+    b'\xd9\x20\xd9\x20\xd9\x20\xd9\x20\xd9\x20\xd9\x20\x26\x20\x26\x20'
+    b'\x26\x20\x26\x20\x26\x20\xb2\x25\x27\x20\x27\x20\x27\x20\x27\x20'
+    b'\x27\x20\x27\x20\xd8\x20\xd8\x20\xd8\x20\x48\x24\x4c\x24\x4e\x24'
+    b'\xdd\x20\xdd\x20\xdd\x20\xdd\x20\xdd\x20\xdd\x20\x22\x20\x22\x20'
+    b'\x22\x20\x22\x20\x22\x20\xba\x25\x23\x20\x23\x20\x23\x20\x23\x20'
+    b'\x23\x20\x23\x20\xdc\x20\xdc\x20\xdc\x20\xdc\x20\x44\x24\x46\x24'
+    b'\x21\x20\x21\x20\x21\x20\x21\x20\x21\x20\x21\x20\xde\x20\xde\x20'
+    b'\xde\x20\xde\x20\xde\x20\x42\x24\xdf\x20\xdf\x20\xdf\x20\xdf\x20'
+    b'\xdf\x20\xdf\x20\x20\x20\xa0\x25\xb0\x25\xb8\x25\xbc\x25\xbe\x25'
+    b'\x35\x20\x35\x20\x35\x20\x35\x20\x35\x20\x35\x20\xca\x20\xca\x20'
+    b'\xca\x20\xca\x20\xca\x20\x6a\x24\xcb\x20\xcb\x20\xcb\x20\xcb\x20'
+    b'\xcb\x20\xcb\x20\x34\x20\x34\x20\x34\x20\x34\x20\x94\x25\x96\x25'
+    b'\xc9\x20\xc9\x20\xc9\x20\xc9\x20\xc9\x20\xc9\x20\x36\x20\x36\x20'
+    b'\x36\x20\x36\x20\x36\x20\x92\x25\x37\x20\x37\x20\x37\x20\x37\x20'
+    b'\x37\x20\x37\x20\xc8\x20\xc8\x20\xc8\x20\x68\x24\x6c\x24\x6e\x24'
+    b'\xcd\x20\xcd\x20\xcd\x20\xcd\x20\xcd\x20\xcd\x20\x32\x20\x32\x20'
+    b'\x32\x20\x32\x20\x32\x20\x9a\x25\x33\x20\x33\x20\x33\x20\x33\x20'
+    b'\x33\x20\x33\x20\xcc\x20\xcc\x20\xcc\x20\xcc\x20\x64\x24\x66\x24'
+    b'\x31\x20\x31\x20\x31\x20\x31\x20\x31\x20\x31\x20\xce\x20\xce\x20'
+    b'\xce\x20\xce\x20\xce\x20\x62\x24\xcf\x20\xcf\x20\xcf\x20\xcf\x20'
+    b'\xcf\x20\xcf\x20\x30\x20\x30\x20\x90\x25\x98\x25\x9c\x25\x9e\x25'
+    b'\xc5\x20\xc5\x20\xc5\x20\xc5\x20\xc5\x20\xc5\x20\x3a\x20\x3a\x20'
+    b'\x3a\x20\x3a\x20\x3a\x20\x8a\x25\x3b\x20\x3b\x20\x3b\x20\x3b\x20'
+    b'\x3b\x20\x3b\x20\xc4\x20\xc4\x20\xc4\x20\xc4\x20\x74\x24\x76\x24'
+    b'\x39\x20\x39\x20\x39\x20\x39\x20\x39\x20\x39\x20\xc6\x20\xc6\x20'
+    b'\xc6\x20\xc6\x20\xc6\x20\x72\x24\xc7\x20\xc7\x20\xc7\x20\xc7\x20'
+    b'\xc7\x20\xc7\x20\x38\x20\x38\x20\x38\x20\x88\x25\x8c\x25\x8e\x25'
+    b'\x3d\x20\x3d\x20\x3d\x20\x3d\x20\x3d\x20\x3d\x20\xc2\x20\xc2\x20'
+    b'\xc2\x20\xc2\x20\xc2\x20\x7a\x24\xc3\x20\xc3\x20\xc3\x20\xc3\x20'
+    b'\xc3\x20\xc3\x20\x3c\x20\x3c\x20\x3c\x20\x3c\x20\x84\x25\x86\x25'
+    b'\xc1\x20\xc1\x20\xc1\x20\xc1\x20\xc1\x20\xc1\x20\x3e\x20\x3e\x20'
+    b'\x3e\x20\x3e\x20\x3e\x20\x82\x25\xbf\x25\xbf\x25\xbf\x25\xbf\x25'
+    b'\xbf\x25\xbf\x25\x40\x24\x60\x24\x70\x24\x78\x24\x7c\x24\x7e\x2b'
+    b'\x15\x30\x15\x30\x15\x30\x15\x30\x15\x30\x15\x30\xea\x30\xea\x30'
+    b'\xea\x30\xea\x30\xea\x30\x2a\x34\xeb\x30\xeb\x30\xeb\x30\xeb\x30'
+    b'\xeb\x30\xeb\x30\x14\x30\x14\x30\x14\x30\x14\x30\xd4\x35\xd6\x35'
+    b'\xe9\x30\xe9\x30\xe9\x30\xe9\x30\xe9\x30\xe9\x30\x16\x30\x16\x30'
+    b'\x16\x30\x16\x30\x16\x30\xd2\x35\x17\x30\x17\x30\x17\x30\x17\x30'
+    b'\x17\x30\x17\x30\xe8\x30\xe8\x30\xe8\x30\x28\x34\x2c\x34\x2e\x34'
+    b'\xed\x30\xed\x30\xed\x30\xed\x30\xed\x30\xed\x30\x12\x30\x12\x30'
+    b'\x12\x30\x12\x30\x12\x30\xda\x35\x13\x30\x13\x30\x13\x30\x13\x30'
+    b'\x13\x30\x13\x30\xec\x30\xec\x30\xec\x30\xec\x30\x24\x34\x26\x34'
+    b'\x11\x30\x11\x30\x11\x30\x11\x30\x11\x30\x11\x30\xee\x30\xee\x30'
+    b'\xee\x30\xee\x30\xee\x30\x22\x34\xef\x30\xef\x30\xef\x30\xef\x30'
+    b'\xef\x30\xef\x30\x10\x30\x10\x30\xd0\x35\xd8\x35\xdc\x35\xde\x35'
+    b'\xe5\x30\xe5\x30\xe5\x30\xe5\x30\xe5\x30\xe5\x30\x1a\x30\x1a\x30'
+    b'\x1a\x30\x1a\x30\x1a\x30\xca\x35\x1b\x30\x1b\x30\x1b\x30\x1b\x30'
+    b'\x1b\x30\x1b\x30\xe4\x30\xe4\x30\xe4\x30\xe4\x30\x34\x34\x36\x34'
+    b'\x19\x30\x19\x30\x19\x30\x19\x30\x19\x30\x19\x30\xe6\x30\xe6\x30'
+    b'\xe6\x30\xe6\x30\xe6\x30\x32\x34\xe7\x30\xe7\x30\xe7\x30\xe7\x30'
+    b'\xe7\x30\xe7\x30\x18\x30\x18\x30\x18\x30\xc8\x35\xcc\x35\xce\x35'
+    b'\x1d\x30\x1d\x30\x1d\x30\x1d\x30\x1d\x30\x1d\x30\xe2\x30\xe2\x30'
+    b'\xe2\x30\xe2\x30\xe2\x30\x3a\x34\xe3\x30\xe3\x30\xe3\x30\xe3\x30'
+    b'\xe3\x30\xe3\x30\x1c\x30\x1c\x30\x1c\x30\x1c\x30\xc4\x35\xc6\x35'
+    b'\xe1\x30\xe1\x30\xe1\x30\xe1\x30\xe1\x30\xe1\x30\x1e\x30\x1e\x30'
+    b'\x1e\x30\x1e\x30\x1e\x30\xc2\x35\x1f\x30\x1f\x30\x1f\x30\x1f\x30'
+    b'\x1f\x30\x1f\x30\xe0\x30\x20\x34\x30\x34\x38\x34\x3c\x34\x3e\x34'
+    b'\xf5\x40\xf5\x40\xf5\x40\xf5\x40\xf5\x40\xf5\x40\x0a\x40\x0a\x40'
+    b'\x0a\x40\x0a\x40\x0a\x40\xea\x45\x0b\x40\x0b\x40\x0b\x40\x0b\x40'
+    b'\x0b\x40\x0b\x40\xf4\x40\xf4\x40\xf4\x40\xf4\x40\x14\x44\x16\x44'
+    b'\x09\x40\x09\x40\x09\x40\x09\x40\x09\x40\x09\x40\xf6\x40\xf6\x40'
+    b'\xf6\x40\xf6\x40\xf6\x40\x12\x44\xf7\x40\xf7\x40\xf7\x40\xf7\x40'
+    b'\xf7\x40\xf7\x40\x08\x40\x08\x40\x08\x40\xe8\x45\xec\x45\xee\x45'
+    b'\x0d\x40\x0d\x40\x0d\x40\x0d\x40\x0d\x40\x0d\x40\xf2\x40\xf2\x40'
+    b'\xf2\x40\xf2\x40\xf2\x40\x1a\x44\xf3\x40\xf3\x40\xf3\x40\xf3\x40'
+    b'\xf3\x40\xf3\x40\x0c\x40\x0c\x40\x0c\x40\x0c\x40\xe4\x45\xe6\x45'
+    b'\xf1\x40\xf1\x40\xf1\x40\xf1\x40\xf1\x40\xf1\x40\x0e\x40\x0e\x40'
+    b'\x0e\x40\x0e\x40\x0e\x40\xe2\x45\x0f\x40\x0f\x40\x0f\x40\x0f\x40'
+    b'\x0f\x40\x0f\x40\xf0\x40\xf0\x40\x10\x44\x18\x44\x1c\x44\x1e\x44'
+    b'\x05\x50\x05\x50\x05\x50\x05\x50\x05\x50\x05\x50\xfa\x50\xfa\x50'
+    b'\xfa\x50\xfa\x50\xfa\x50\x0a\x54\xfb\x50\xfb\x50\xfb\x50\xfb\x50'
+    b'\xfb\x50\xfb\x50\x04\x50\x04\x50\x04\x50\x04\x50\xf4\x55\xf6\x55'
+    b'\xf9\x50\xf9\x50\xf9\x50\xf9\x50\xf9\x50\xf9\x50\x06\x50\x06\x50'
+    b'\x06\x50\x06\x50\x06\x50\xf2\x55\x07\x50\x07\x50\x07\x50\x07\x50'
+    b'\x07\x50\x07\x50\xf8\x50\xf8\x50\xf8\x50\x08\x54\x0c\x54\x0e\x54'
+    b'\xfd\x14\xfd\x14\xfd\x14\xfd\x14\xfd\x14\xfd\x14\x02\x15\x02\x15'
+    b'\x02\x15\x02\x15\x02\x15\xfa\x19\x03\x15\x03\x15\x03\x15\x03\x15'
+    b'\x03\x15\x03\x15\xfc\x14\xfc\x14\xfc\x14\xfc\x14\x04\x1a\x06\x1a'
+    b'\x81\x25\x81\x25\x81\x25\x81\x25\x81\x25\x81\x25\x7e\x24\x7e\x24'
+    b'\x7e\x24\x7e\x24\x7e\x24\x02\x2b\x3f\x34\x3f\x34\x3f\x34\x3f\x34'
+    b'\x3f\x34\x3f\x34\xc0\x35\xe0\x45\xf0\x55\xf8\x19\xfc\x28\x7e\x38')
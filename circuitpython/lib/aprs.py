@@ -4,44 +4,57 @@
 
 '''
 Class for generating array containing APRS data to be send
+
+The address, digipeater, control and PID fields only change with their setters,
+they are kept as one prebuilt header together with the CRC register state after
+it, so a frame only runs the CRC over its information field. Every frame is
+written into the same bytearray (header, information, FCS) and returned as a
+memoryview of it.
+
+Mic-E (set_mic_e_position) puts latitude and message bits into the destination
+address and longitude, speed, course and altitude into a short information field.
 '''
 import array
 
+# CRC-CCITT (0x8408) table, 256 x 16 bit little-endian. The bytes literal stays in
+# flash when the module is frozen; APRS.ccitt_table is a 512 byte copy of it in the heap.
+CCITT_TABLE = (
+    b'\x00\x00\x89\x11\x12\x23\x9b\x32\x24\x46\xad\x57\x36\x65\xbf\x74'
+    b'\x48\x8c\xc1\x9d\x5a\xaf\xd3\xbe\x6c\xca\xe5\xdb\x7e\xe9\xf7\xf8'
+    b'\x81\x10\x08\x01\x93\x33\x1a\x22\xa5\x56\x2c\x47\xb7\x75\x3e\x64'
+    b'\xc9\x9c\x40\x8d\xdb\xbf\x52\xae\xed\xda\x64\xcb\xff\xf9\x76\xe8'
+    b'\x02\x21\x8b\x30\x10\x02\x99\x13\x26\x67\xaf\x76\x34\x44\xbd\x55'
+    b'\x4a\xad\xc3\xbc\x58\x8e\xd1\x9f\x6e\xeb\xe7\xfa\x7c\xc8\xf5\xd9'
+    b'\x83\x31\x0a\x20\x91\x12\x18\x03\xa7\x77\x2e\x66\xb5\x54\x3c\x45'
+    b'\xcb\xbd\x42\xac\xd9\x9e\x50\x8f\xef\xfb\x66\xea\xfd\xd8\x74\xc9'
+    b'\x04\x42\x8d\x53\x16\x61\x9f\x70\x20\x04\xa9\x15\x32\x27\xbb\x36'
+    b'\x4c\xce\xc5\xdf\x5e\xed\xd7\xfc\x68\x88\xe1\x99\x7a\xab\xf3\xba'
+    b'\x85\x52\x0c\x43\x97\x71\x1e\x60\xa1\x14\x28\x05\xb3\x37\x3a\x26'
+    b'\xcd\xde\x44\xcf\xdf\xfd\x56\xec\xe9\x98\x60\x89\xfb\xbb\x72\xaa'
+    b'\x06\x63\x8f\x72\x14\x40\x9d\x51\x22\x25\xab\x34\x30\x06\xb9\x17'
+    b'\x4e\xef\xc7\xfe\x5c\xcc\xd5\xdd\x6a\xa9\xe3\xb8\x78\x8a\xf1\x9b'
+    b'\x87\x73\x0e\x62\x95\x50\x1c\x41\xa3\x35\x2a\x24\xb1\x16\x38\x07'
+    b'\xcf\xff\x46\xee\xdd\xdc\x54\xcd\xeb\xb9\x62\xa8\xf9\x9a\x70\x8b'
+    b'\x08\x84\x81\x95\x1a\xa7\x93\xb6\x2c\xc2\xa5\xd3\x3e\xe1\xb7\xf0'
+    b'\x40\x08\xc9\x19\x52\x2b\xdb\x3a\x64\x4e\xed\x5f\x76\x6d\xff\x7c'
+    b'\x89\x94\x00\x85\x9b\xb7\x12\xa6\xad\xd2\x24\xc3\xbf\xf1\x36\xe0'
+    b'\xc1\x18\x48\x09\xd3\x3b\x5a\x2a\xe5\x5e\x6c\x4f\xf7\x7d\x7e\x6c'
+    b'\x0a\xa5\x83\xb4\x18\x86\x91\x97\x2e\xe3\xa7\xf2\x3c\xc0\xb5\xd1'
+    b'\x42\x29\xcb\x38\x50\x0a\xd9\x1b\x66\x6f\xef\x7e\x74\x4c\xfd\x5d'
+    b'\x8b\xb5\x02\xa4\x99\x96\x10\x87\xaf\xf3\x26\xe2\xbd\xd0\x34\xc1'
+    b'\xc3\x39\x4a\x28\xd1\x1a\x58\x0b\xe7\x7f\x6e\x6e\xf5\x5c\x7c\x4d'
+    b'\x0c\xc6\x85\xd7\x1e\xe5\x97\xf4\x28\x80\xa1\x91\x3a\xa3\xb3\xb2'
+    b'\x44\x4a\xcd\x5b\x56\x69\xdf\x78\x60\x0c\xe9\x1d\x72\x2f\xfb\x3e'
+    b'\x8d\xd6\x04\xc7\x9f\xf5\x16\xe4\xa9\x90\x20\x81\xbb\xb3\x32\xa2'
+    b'\xc5\x5a\x4c\x4b\xd7\x79\x5e\x68\xe1\x1c\x68\x0d\xf3\x3f\x7a\x2e'
+    b'\x0e\xe7\x87\xf6\x1c\xc4\x95\xd5\x2a\xa1\xa3\xb0\x38\x82\xb1\x93'
+    b'\x46\x6b\xcf\x7a\x54\x48\xdd\x59\x62\x2d\xeb\x3c\x70\x0e\xf9\x1f'
+    b'\x8f\xf7\x06\xe6\x9d\xd4\x14\xc5\xab\xb1\x22\xa0\xb9\x92\x30\x83'
+    b'\xc7\x7b\x4e\x6a\xd5\x58\x5c\x49\xe3\x3d\x6a\x2c\xf1\x1e\x78\x0f')
+
 class APRS():
 
-    ccitt_table = (
-       0x0000, 0x1189, 0x2312, 0x329b, 0x4624, 0x57ad, 0x6536, 0x74bf,
-       0x8c48, 0x9dc1, 0xaf5a, 0xbed3, 0xca6c, 0xdbe5, 0xe97e, 0xf8f7,
-       0x1081, 0x0108, 0x3393, 0x221a, 0x56a5, 0x472c, 0x75b7, 0x643e,
-       0x9cc9, 0x8d40, 0xbfdb, 0xae52, 0xdaed, 0xcb64, 0xf9ff, 0xe876,
-       0x2102, 0x308b, 0x0210, 0x1399, 0x6726, 0x76af, 0x4434, 0x55bd,
-       0xad4a, 0xbcc3, 0x8e58, 0x9fd1, 0xeb6e, 0xfae7, 0xc87c, 0xd9f5,
-       0x3183, 0x200a, 0x1291, 0x0318, 0x77a7, 0x662e, 0x54b5, 0x453c,
-       0xbdcb, 0xac42, 0x9ed9, 0x8f50, 0xfbef, 0xea66, 0xd8fd, 0xc974,
-       0x4204, 0x538d, 0x6116, 0x709f, 0x0420, 0x15a9, 0x2732, 0x36bb,
-       0xce4c, 0xdfc5, 0xed5e, 0xfcd7, 0x8868, 0x99e1, 0xab7a, 0xbaf3,
-       0x5285, 0x430c, 0x7197, 0x601e, 0x14a1, 0x0528, 0x37b3, 0x263a,
-       0xdecd, 0xcf44, 0xfddf, 0xec56, 0x98e9, 0x8960, 0xbbfb, 0xaa72,
-       0x6306, 0x728f, 0x4014, 0x519d, 0x2522, 0x34ab, 0x0630, 0x17b9,
-       0xef4e, 0xfec7, 0xcc5c, 0xddd5, 0xa96a, 0xb8e3, 0x8a78, 0x9bf1,
-       0x7387, 0x620e, 0x5095, 0x411c, 0x35a3, 0x242a, 0x16b1, 0x0738,
-       0xffcf, 0xee46, 0xdcdd, 0xcd54, 0xb9eb, 0xa862, 0x9af9, 0x8b70,
-       0x8408, 0x9581, 0xa71a, 0xb693, 0xc22c, 0xd3a5, 0xe13e, 0xf0b7,
-       0x0840, 0x19c9, 0x2b52, 0x3adb, 0x4e64, 0x5fed, 0x6d76, 0x7cff,
-       0x9489, 0x8500, 0xb79b, 0xa612, 0xd2ad, 0xc324, 0xf1bf, 0xe036,
-       0x18c1, 0x0948, 0x3bd3, 0x2a5a, 0x5ee5, 0x4f6c, 0x7df7, 0x6c7e,
-       0xa50a, 0xb483, 0x8618, 0x9791, 0xe32e, 0xf2a7, 0xc03c, 0xd1b5,
-       0x2942, 0x38cb, 0x0a50, 0x1bd9, 0x6f66, 0x7eef, 0x4c74, 0x5dfd,
-       0xb58b, 0xa402, 0x9699, 0x8710, 0xf3af, 0xe226, 0xd0bd, 0xc134,
-       0x39c3, 0x284a, 0x1ad1, 0x0b58, 0x7fe7, 0x6e6e, 0x5cf5, 0x4d7c,
-       0xc60c, 0xd785, 0xe51e, 0xf497, 0x8028, 0x91a1, 0xa33a, 0xb2b3,
-       0x4a44, 0x5bcd, 0x6956, 0x78df, 0x0c60, 0x1de9, 0x2f72, 0x3efb,
-       0xd68d, 0xc704, 0xf59f, 0xe416, 0x90a9, 0x8120, 0xb3bb, 0xa232,
-       0x5ac5, 0x4b4c, 0x79d7, 0x685e, 0x1ce1, 0x0d68, 0x3ff3, 0x2e7a,
-       0xe70e, 0xf687, 0xc41c, 0xd595, 0xa12a, 0xb0a3, 0x8238, 0x93b1,
-       0x6b46, 0x7acf, 0x4854, 0x59dd, 0x2d62, 0x3ceb, 0x0e70, 0x1ff9,
-       0xf78f, 0xe606, 0xd49d, 0xc514, 0xb1ab, 0xa022, 0x92b9, 0x8330,
-       0x7bc7, 0x6a4e, 0x58d5, 0x495c, 0x3de3, 0x2c6a, 0x1ef1, 0x0f78)
+    ccitt_table = array.array('H', CCITT_TABLE)
 
     INITIAL_CRC16_VALUE = 0xffff    # The initial value of the crc register
     CRC16CCITT_POLYNOMIAL = 0x8408  # CRC Polynomial used for AX.25 FCS
@@ -49,7 +62,26 @@ class APRS():
     AX25_APRS_UI_FRAME = 0x03       # Frame Type
     AX25_PROTO_NO_LAYER3 = 0xf0     # Layer 3 protocol
 
+    AX25_MAX_HEADER_LENGTH = 72     # destination, source, 8 digipeaters, control, PID
+    AX25_MAX_INFORMATION_LENGTH = 256
+
+    # Mic-E standard messages (bits A, B, C)
+    MIC_E_OFF_DUTY = 0b111
+    MIC_E_EN_ROUTE = 0b110
+    MIC_E_IN_SERVICE = 0b101
+    MIC_E_RETURNING = 0b100
+    MIC_E_COMMITTED = 0b011
+    MIC_E_SPECIAL = 0b010
+    MIC_E_PRIORITY = 0b001
+    MIC_E_EMERGENCY = 0b000
+
     def __init__(self, source = 'MYCALL-4', destination = 'APZDIY-12', digipeaters = 'WIDE1-1', information = '>Hello'):
+        self._ax25_header = None
+        self._destination = None
+        self._ax25_header_crc = self.INITIAL_CRC16_VALUE
+        self.crc_slicing_by_2 = False # two bytes per step, see crc_update
+        self._ax25_frame = bytearray(self.AX25_MAX_HEADER_LENGTH + self.AX25_MAX_INFORMATION_LENGTH + 2)
+        self._ax25_frame_view = memoryview(self._ax25_frame)
         self.source = source
         self.destination = destination
         self.digipeaters = digipeaters
@@ -76,8 +108,11 @@ class APRS():
 
     @destination.setter
     def destination(self, destination):
+        if destination == self._destination:
+            return # keep the header (Mic-E sets it for every frame)
         self._destination = destination
         self._ax25_destination = self._set_ax25_destination(self._destination)
+        self._ax25_header = None
 
     @property
     def source(self):
@@ -87,6 +122,7 @@ class APRS():
     def source(self, source):
         self._source = source
         self._ax25_source = self._set_ax25_source(self._source)
+        self._ax25_header = None
 
     @property
     def digipeaters(self):
@@ -96,6 +132,7 @@ class APRS():
     def digipeaters(self, digipeaters):
         self._digipeaters = digipeaters[:56]
         self._ax25_digipeaters = self._set_ax25_digipeaters(self._digipeaters)
+        self._ax25_header = None
 
     @property
     def information(self):
@@ -106,17 +143,90 @@ class APRS():
         self._information = information
         self._ax25_information_field = self._set_ax25_information(self._information)
 
+    '''
+    Mic-E position (APRS 1.01 chapter 10) from a fix (gps.GPS), sets destination and information.
+    Destination: latitude digits DDMMhh, the message bits A/B/C in chars 1-3,
+    North, longitude offset +100 and West in chars 4-6 ('P'-'Y' instead of '0'-'9').
+    Information: ` (current fix), longitude d m h, speed and course (each +28),
+    symbol '>' on table '/', altitude (base91 of metres + 10000 followed by '}'), comment.
+    The header is only rebuilt if the encoded destination changes.
+    '''
+    def set_mic_e_position(self, gps, comment = '', message = MIC_E_EN_ROUTE):
+        latitude = gps.latitude
+        longitude = gps.longitude
+        lat = int(round(abs(latitude) * 6000)) # hundredths of minutes
+        lon = int(round(abs(longitude) * 6000))
+        lon_deg = lon // 6000
+        lon_min = lon // 100 % 60
+        digits = '{:02}{:02}{:02}'.format(lat // 6000, lat // 100 % 60, lat % 100)
+        flags = ((message >> 2) & 1, (message >> 1) & 1, message & 1,
+            latitude >= 0, lon_deg < 10 or lon_deg >= 100, longitude < 0)
+        destination = ''
+        for i in range(6):
+            if flags[i]:
+                destination += chr(ord(digits[i]) + ord('P') - ord('0'))
+            else:
+                destination += digits[i]
+
+        if lon_deg < 10:
+            d = lon_deg + 118
+        elif lon_deg < 100:
+            d = lon_deg + 28
+        elif lon_deg < 110:
+            d = lon_deg + 8
+        else:
+            d = lon_deg - 72
+        if lon_min < 10:
+            m = lon_min + 88
+        else:
+            m = lon_min + 28
+        speed = min(int(round(gps.speed_knots)), 799)
+        course = 0
+        if speed > 0:
+            course = int(round(gps.heading)) % 360
+            if course == 0:
+                course = 360
+        altitude = max(int(round(gps.altitude)) + 10000, 0)
+        information = '`' + chr(d) + chr(m) + chr(lon % 100 + 28)
+        information += chr(speed // 10 + 28) + chr(speed % 10 * 10 + course // 100 + 28) + chr(course % 100 + 28)
+        information += '>/' + chr(altitude // 8281 + 33) + chr(altitude // 91 % 91 + 33) + chr(altitude % 91 + 33) + '}'
+
+        self.destination = destination
+        self.information = information + comment
+
+    '''
+    Identifies the frame create_ax25_frame would build: the fields it is made
+    of (the FCS follows from them). Compared by value, so no collisions.
+    '''
+    @property
+    def frame_key(self):
+        return (self._destination, self._source, self._digipeaters, self._information)
+
+    def _build_ax25_header(self):
+        self._ax25_header = bytes(self._ax25_destination + self._ax25_source + self._ax25_digipeaters +
+            self._ax25_control_field + self._ax25_protocol_id)
+        size = len(self._ax25_header) + self.AX25_MAX_INFORMATION_LENGTH + 2
+        if size > len(self._ax25_frame):
+            self._ax25_frame = bytearray(size) # more than 8 (short) digipeaters
+            self._ax25_frame_view = memoryview(self._ax25_frame)
+        self._ax25_header_crc = self.crc_update(self.INITIAL_CRC16_VALUE, self._ax25_header)
+
+    '''
+    Returns a memoryview of the frame buffer, valid until the next frame is created
+    '''
     def create_ax25_frame(self):
-        ax25_frame = []
-        ax25_frame += self._ax25_destination
-        ax25_frame += self._ax25_source
-        ax25_frame += self._ax25_digipeaters
-        ax25_frame += self._ax25_control_field
-        ax25_frame += self._ax25_protocol_id
-        ax25_frame += self._ax25_information_field
-        self._ax25_fcs = self._calc_crc(ax25_frame)
-        ax25_frame.append(self._get_crc_low_byte(self._ax25_fcs))
-        ax25_frame.append(self._get_crc_high_byte(self._ax25_fcs))
+        if self._ax25_header is None:
+            self._build_ax25_header()
+        frame = self._ax25_frame_view
+        h = len(self._ax25_header)
+        n = h + len(self._ax25_information_field)
+        frame[0:h] = self._ax25_header
+        frame[h:n] = self._ax25_information_field
+        crc = self.crc_update(self._ax25_header_crc, self._ax25_information_field)
+        self._ax25_fcs = crc ^ self.INITIAL_CRC16_VALUE
+        frame[n] = self._get_crc_low_byte(self._ax25_fcs)
+        frame[n + 1] = self._get_crc_high_byte(self._ax25_fcs)
+        ax25_frame = frame[0:n + 2]
 
         if self.debugging == True:
             print("\n\nAPRS: AX25 packet data")
@@ -140,7 +250,7 @@ class APRS():
     '''
     def _set_ax25_source(self, source):
         name, ssid = self._split_address_ssid(source)
-        n = bytearray(name + '      ')[:6]
+        n = bytearray(name + '      ', 'utf-8')[:6]
         s = int(ssid) & 0x0F
         ax25_source = self._shift_1bit_left(n)
         ax25_source += [0xe0 | (s << 1)]
@@ -155,10 +265,10 @@ class APRS():
     '''
     def _set_ax25_destination(self, destination):
         name, ssid = self._split_address_ssid(destination)
-        n = bytearray(name + '      ')[:6]
+        n = bytearray(name + '      ', 'utf-8')[:6]
         s = int(ssid) & 0x0F
         ax25_dest = self._shift_1bit_left(n)
-        ax25_dest += [0xf0 | (s << 1)]
+        ax25_dest += [0xe0 | (s << 1)]
         return ax25_dest
 
     '''
@@ -176,7 +286,7 @@ class APRS():
         if digilist != ['']:
             for address in digilist:
                 name, ssid = self._split_address_ssid(address)
-                n = bytearray(name + '      ')[:6]
+                n = bytearray(name + '      ', 'utf-8')[:6]
                 s = int(ssid) & 0x0F
                 ax25_digi += self._shift_1bit_left(n)
                 ax25_digi += [0xe0 | (s << 1)]
@@ -189,11 +299,7 @@ class APRS():
     wants to send, following one of the ten main types of data as defined in the APRS specification.
     '''
     def _set_ax25_information(self, information):
-        info = bytearray(information)
-        ax25_info = []
-        for j in info:
-            ax25_info.append(j)
-        return ax25_info
+        return information.encode('utf-8')[:self.AX25_MAX_INFORMATION_LENGTH]
 
     def _shift_1bit_left(self, s):
         r = []
@@ -217,12 +323,45 @@ class APRS():
     '''
 
     def _calc_crc(self, frame):
-       crc = self.INITIAL_CRC16_VALUE
-       for j in frame:
-          crc = (crc >> 8) ^ self.ccitt_table[(crc ^ j) & 0xff]
-       crc = crc ^ self.INITIAL_CRC16_VALUE
+       return self.calc_fcs(frame)
+
+    '''
+    FCS of a whole buffer (bytes, bytearray, memoryview, array('B') or a list of ints)
+    '''
+    def calc_fcs(self, data):
+       return self.crc_update(self.INITIAL_CRC16_VALUE, data) ^ self.INITIAL_CRC16_VALUE
+
+    '''
+    Continues the CRC register crc over data, for building the FCS piecewise.
+    With crc_slicing_by_2 two bytes are processed per step: the CRC is linear,
+    so after xoring both bytes into the register the new register is
+    ccitt_table[high byte] ^ _ccitt_table_2[low byte], where _ccitt_table_2
+    holds the table entries advanced by one more zero byte.
+    '''
+    def crc_update(self, crc, data):
+       table = self.ccitt_table
+       if self.crc_slicing_by_2 == False:
+          for j in data:
+             crc = (crc >> 8) ^ table[(crc ^ j) & 0xff]
+          return crc
+       table_2 = self._crc_table_2()
+       pairs = iter(data)
+       for lo, hi in zip(pairs, pairs):
+          crc ^= lo | (hi << 8)
+          crc = table_2[crc & 0xff] ^ table[crc >> 8]
+       if len(data) & 1:
+          crc = (crc >> 8) ^ table[(crc ^ data[-1]) & 0xff]
        return crc
 
+    _ccitt_table_2 = None
+
+    @classmethod
+    def _crc_table_2(cls):
+       if cls._ccitt_table_2 is None:
+          table = cls.ccitt_table
+          cls._ccitt_table_2 = array.array('H', [(table[i] >> 8) ^ table[table[i] & 0xff] for i in range(256)])
+       return cls._ccitt_table_2
+
     def _get_crc_high_byte(self, n):
        return (n >> 8) & 0x00FF
 
@@ -0,0 +1,390 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Class for decoding AX.25 UI frames with APRS data, the counterpart of APRS
+
+decode() takes a whole frame (addresses, control, PID, information, FCS as
+built by APRS.create_ax25_frame), checks the FCS with the same CCITT table and
+parses it in place: the addresses and text fields are kept as offsets into the
+frame and only turned into memoryview slices or strings when asked for, the
+numbers of the APRS formats are parsed straight from the frame bytes.
+One decoder is reused for every frame, a decoded frame has to stay unchanged
+while its fields are read.
+
+Formats: uncompressed / compressed position (! = / @), Mic-E (` '),
+status (>), telemetry (T#), message (:) and base91 comment telemetry (|ss..|).
+Units: degrees, knots, metres.
+'''
+
+import array
+from aprs import APRS
+
+class APRS_DECODER():
+
+    FORMAT_UNKNOWN = 0
+    FORMAT_UNCOMPRESSED = 1
+    FORMAT_COMPRESSED = 2
+    FORMAT_MIC_E = 3
+    FORMAT_STATUS = 4
+    FORMAT_TELEMETRY = 5
+    FORMAT_MESSAGE = 6
+
+    AX25_MAX_ADDRESSES = 10 # destination, source, 8 digipeaters
+    TELEMETRY_MAX = 0x7fffffff # larger T# values (other stations) are clamped
+
+    def __init__(self):
+        self.debugging = False
+        self.check_fcs = True
+        self.telemetry = array.array('l', [0] * 5) # raw analog values (T# or comment telemetry)
+        self._frame = None
+        self._clear()
+
+    def _clear(self):
+        self.valid = False
+        self.fcs = None
+        self.format = self.FORMAT_UNKNOWN
+        self.latitude = None
+        self.longitude = None
+        self.symbol_table = None
+        self.symbol = None
+        self.course = None
+        self.speed = None
+        self.altitude = None
+        self.mic_e_message = None
+        self.telemetry_sequence = None
+        self.telemetry_channels = 0
+        self.telemetry_bits = None
+        self._addresses = 0
+        self._info = 0
+        self._end = 0
+        self._text = 0 # comment, status text or message text
+        self._text_end = 0
+
+    '''
+    Decodes a frame (bytes, bytearray or memoryview including the FCS).
+    Returns True for a UI frame with a correct FCS, the APRS fields
+    are then set as far as the format is known.
+    '''
+    def decode(self, frame):
+        self._clear()
+        self._frame = frame
+        n = len(frame)
+        # addresses: 7 bytes each, the last one has the LSB of the SSID byte set
+        a = 0
+        while True:
+            if 7 * a + 7 > n - 4 or a == self.AX25_MAX_ADDRESSES:
+                return False
+            a += 1
+            if frame[7 * a - 1] & 1:
+                break
+        if a < 2 or frame[7 * a] != APRS.AX25_APRS_UI_FRAME or frame[7 * a + 1] != APRS.AX25_PROTO_NO_LAYER3:
+            return False
+        self._addresses = a
+        self._info = 7 * a + 2
+        self._end = n - 2
+        self.fcs = frame[n - 2] | (frame[n - 1] << 8)
+        if self.check_fcs == True:
+            crc = APRS.INITIAL_CRC16_VALUE
+            table = APRS.ccitt_table
+            for i in range(n - 2):
+                crc = (crc >> 8) ^ table[(crc ^ frame[i]) & 0xff]
+            if crc ^ APRS.INITIAL_CRC16_VALUE != self.fcs:
+                return False
+        self.valid = True
+        if self._end > self._info:
+            self._decode_information()
+        if self.debugging == True:
+            self.info()
+        return True
+
+    # --- addresses -----------------
+
+    @property
+    def digipeater_count(self):
+        return self._addresses - 2
+
+    # address 0 = destination, 1 = source, 2.. = digipeaters
+    def address(self, i):
+        return memoryview(self._frame)[7 * i:7 * i + 6]
+
+    def callsign(self, i):
+        name = ''
+        for c in self.address(i):
+            if c != 0x40:
+                name += chr(c >> 1)
+        return name
+
+    def ssid(self, i):
+        return (self._frame[7 * i + 6] >> 1) & 0x0f
+
+    # H bit (has been repeated) of a digipeater, C bit of destination and source
+    def h_bit(self, i):
+        return (self._frame[7 * i + 6] & 0x80) != 0
+
+    def full_address(self, i):
+        if self.ssid(i) == 0:
+            return self.callsign(i)
+        return '{}-{}'.format(self.callsign(i), self.ssid(i))
+
+    @property
+    def destination(self):
+        return self.full_address(0)
+
+    @property
+    def source(self):
+        return self.full_address(1)
+
+    # comma separated like APRS.digipeaters, without H bit marks
+    @property
+    def digipeaters(self):
+        return ','.join([self.full_address(i) for i in range(2, self._addresses)])
+
+    # --- information -----------------
+
+    @property
+    def information(self):
+        return memoryview(self._frame)[self._info:self._end]
+
+    @property
+    def data_type(self):
+        if self._end > self._info:
+            return self._frame[self._info]
+        return None
+
+    # comment of a position, text of a status or message
+    @property
+    def text(self):
+        return memoryview(self._frame)[self._text:self._text_end]
+
+    # addressee of a message, padded to 9 characters
+    @property
+    def addressee(self):
+        if self.format != self.FORMAT_MESSAGE:
+            return None
+        return memoryview(self._frame)[self._info + 1:self._info + 10]
+
+    def info(self):
+        print("APRS-DEC:", end = " ")
+        if self.valid == False:
+            print("invalid frame")
+            return
+        print(self.source, ">", self.destination, self.digipeaters, end = " ")
+        print("Format:", self.format, "Lat:", self.latitude, "Lon:", self.longitude, end = " ")
+        print("Course:", self.course, "Speed:", self.speed, "Alt:", self.altitude)
+
+    # --- local functions -----------------
+
+    def _decode_information(self):
+        f = self._frame
+        p = self._info
+        t = f[p]
+        self._text = p + 1
+        self._text_end = self._end
+        if t == 0x21 or t == 0x3d: # ! =
+            self._decode_position(p + 1)
+        elif t == 0x2f or t == 0x40: # / @ with timestamp
+            if self._end - p >= 8:
+                self._decode_position(p + 8)
+        elif t == 0x60 or t == 0x27: # ` '
+            self._decode_mic_e(p)
+        elif t == 0x3e: # >
+            self.format = self.FORMAT_STATUS
+        elif t == 0x54: # T#sss,aaa,aaa,aaa,aaa,aaa,bbbbbbbb
+            self._decode_telemetry(p)
+        elif t == 0x3a: # :addressee:text
+            if self._end - p >= 11 and f[p + 10] == 0x3a:
+                self.format = self.FORMAT_MESSAGE
+                self._text = p + 11
+
+    def _decode_position(self, p):
+        f = self._frame
+        if self._end - p >= 19 and 0x30 <= f[p] <= 0x39:
+            # DDMM.hhN/DDDMM.hhE$
+            if f[p + 4] != 0x2e or f[p + 14] != 0x2e:
+                return
+            self.latitude = self._digits(p, 2) + (self._digits(p + 2, 2) + self._digits(p + 5, 2) / 100) / 60
+            if f[p + 7] == 0x53: # S
+                self.latitude = -self.latitude
+            self.longitude = self._digits(p + 9, 3) + (self._digits(p + 12, 2) + self._digits(p + 15, 2) / 100) / 60
+            if f[p + 17] == 0x57: # W
+                self.longitude = -self.longitude
+            self.symbol_table = f[p + 8]
+            self.symbol = f[p + 18]
+            self.format = self.FORMAT_UNCOMPRESSED
+            p += 19
+            # course/speed extension CSE/SPD
+            if self._end - p >= 7 and f[p + 3] == 0x2f and self._is_digits(p, 3) and self._is_digits(p + 4, 3):
+                self.course = self._digits(p, 3)
+                self.speed = self._digits(p + 4, 3)
+                p += 7
+            # altitude /A=aaaaaa (feet) anywhere in the comment
+            for i in range(p, self._end - 8):
+                if f[i] == 0x2f and f[i + 1] == 0x41 and f[i + 2] == 0x3d and self._is_digits(i + 3, 6):
+                    self.altitude = self._digits(i + 3, 6) * 0.3048
+                    break
+        elif self._end - p >= 13:
+            # /YYYYXXXX$csT
+            self.symbol_table = f[p]
+            self.latitude = 90 - self._base91(p + 1, 4) / 380926
+            self.longitude = -180 + self._base91(p + 5, 4) / 190463
+            self.symbol = f[p + 9]
+            c = f[p + 10] - 33
+            if f[p + 10] != 0x20:
+                if (f[p + 12] - 33) & 0x18 == 0x10:
+                    self.altitude = 1.002 ** self._base91(p + 10, 2) * 0.3048
+                elif c <= 89:
+                    self.course = c * 4
+                    self.speed = 1.08 ** (f[p + 11] - 33) - 1
+            self.format = self.FORMAT_COMPRESSED
+            p += 13
+        else:
+            return
+        self._text = p
+        self._decode_comment_telemetry()
+
+    '''
+    Mic-E (APRS 1.01 chapter 10): latitude, message bits and N / +100 / W flags
+    in the destination address, the rest in 8 bytes of information field.
+    '''
+    def _decode_mic_e(self, p):
+        f = self._frame
+        if self._end - p < 9:
+            return
+        latitude = 0
+        message = 0
+        flags = 0
+        for i in range(6):
+            c = f[i] >> 1
+            if 0x30 <= c <= 0x39:     # 0-9
+                digit = c - 0x30
+                bit = 0
+            elif 0x41 <= c <= 0x4b:   # A-K custom message
+                digit = c - 0x41
+                bit = 1
+            elif c == 0x4c:           # L
+                digit = 0
+                bit = 0
+            elif 0x50 <= c <= 0x5a:   # P-Z
+                digit = c - 0x50
+                bit = 1
+            else:
+                return
+            if digit > 9:             # K, Z: position ambiguity
+                digit = 0
+            latitude = latitude * 10 + digit
+            if i < 3:
+                message = (message << 1) | bit
+            else:
+                flags = (flags << 1) | bit
+        latitude = latitude // 10000 + (latitude // 100 % 100 + latitude % 100 / 100) / 60
+        if flags & 0b100 == 0:
+            latitude = -latitude
+        d = f[p + 1] - 28
+        if flags & 0b010:
+            d += 100
+        if 180 <= d <= 189:
+            d -= 80
+        elif 190 <= d <= 199:
+            d -= 190
+        m = f[p + 2] - 28
+        if m >= 60:
+            m -= 60
+        longitude = d + (m + (f[p + 3] - 28) / 100) / 60
+        if flags & 0b001:
+            longitude = -longitude
+        sp = f[p + 4] - 28
+        dc = f[p + 5] - 28
+        se = f[p + 6] - 28
+        speed = sp * 10 + dc // 10
+        course = dc % 10 * 100 + se
+        if speed >= 800:
+            speed -= 800
+        if course >= 400:
+            course -= 400
+        self.latitude = latitude
+        self.longitude = longitude
+        self.speed = speed
+        self.course = course
+        self.symbol = f[p + 7]
+        self.symbol_table = f[p + 8]
+        self.mic_e_message = message
+        self.format = self.FORMAT_MIC_E
+        p += 9
+        # optional radio type byte, then altitude xxx} (metres + 10000)
+        for a in (p, p + 1):
+            if a + 4 <= self._end and f[a + 3] == 0x7d:
+                self.altitude = self._base91(a, 3) - 10000
+                p = a + 4
+                break
+        self._text = p
+        self._decode_comment_telemetry()
+
+    def _decode_telemetry(self, p):
+        f = self._frame
+        if self._end - p < 6 or f[p + 1] != 0x23:
+            return
+        p += 2
+        values = [] # sequence and analog values
+        while len(values) < 6:
+            start = p
+            while p < self._end and f[p] != 0x2c:
+                p += 1
+            if p == start or p == self._end or not self._is_digits(start, p - start):
+                return
+            values.append(self._digits(start, p - start))
+            p += 1
+        self.telemetry_sequence = values[0]
+        for i in range(5):
+            self.telemetry[i] = min(values[i + 1], self.TELEMETRY_MAX)
+        self.telemetry_channels = 5
+        bits = 0
+        for i in range(p, min(p + 8, self._end)):
+            bits = (bits << 1) | (f[i] - 0x30)
+        self.telemetry_bits = bits
+        self.format = self.FORMAT_TELEMETRY
+        self._text = min(p + 8, self._end)
+
+    # |ss11..55| in the comment, 2 base91 digits each
+    def _decode_comment_telemetry(self):
+        f = self._frame
+        for start in range(self._text, self._end - 5):
+            if f[start] == 0x7c:
+                end = start + 1
+                while end < self._end and f[end] != 0x7c:
+                    end += 1
+                n = end - start - 1
+                if end < self._end and n >= 4 and n <= 14 and n % 2 == 0:
+                    self.telemetry_sequence = self._base91(start + 1, 2)
+                    self.telemetry_channels = min(n // 2 - 1, 5)
+                    for i in range(self.telemetry_channels):
+                        self.telemetry[i] = self._base91(start + 3 + 2 * i, 2)
+                    if n == 14:
+                        self.telemetry_bits = self._base91(start + 13, 2)
+                return
+
+    def _digits(self, p, n):
+        value = 0
+        f = self._frame
+        for i in range(p, p + n):
+            c = f[i]
+            if c != 0x20: # position ambiguity
+                value = value * 10 + c - 0x30
+            else:
+                value = value * 10
+        return value
+
+    def _is_digits(self, p, n):
+        f = self._frame
+        for i in range(p, p + n):
+            if f[i] < 0x30 or f[i] > 0x39:
+                return False
+        return True
+
+    def _base91(self, p, n):
+        value = 0
+        f = self._frame
+        for i in range(p, p + n):
+            value = value * 91 + f[i] - 33
+        return value
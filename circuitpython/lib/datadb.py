@@ -2,87 +2,139 @@
 #
 # SPDX-License-Identifier: MIT
 
+'''
+Fixed size log of numbers in a preallocated array (typecode 'f' or 'l')
+used as ring buffer: add() is O(1) in both modes, nothing is moved.
+
+buffer_stop  => values added to a full log are dropped
+buffer_shift => a value added to a full log replaces the oldest one
+
+get(0) / log[0] is the oldest value, log[-1] the newest, slices give an
+array of the same type. sum is a running sum, min and max are only searched
+again after the current minimum or maximum has left the log.
+'''
+
+import array
+
 class DATA_DB:
 
     buffer_stop  = const(0x01)
     buffer_shift = const(0x02)
 
-    def __init__(self, size = 10, mode = buffer_shift):
-        self._size = size
-        if mode == buffer_shift or mode == buffer_stop:
-            self._mode = mode
-        else:
+    def __init__(self, size = 10, mode = buffer_shift, typecode = 'f'):
+        if mode != DATA_DB.buffer_shift and mode != DATA_DB.buffer_stop:
             raise ValueError
-        self._buffer = {}
-        self._pointer = 0
+        if size < 1:
+            raise ValueError
+        self._mode = mode
+        self._buffer = array.array(typecode, [0] * size)
+        self._first = 0 # index of the oldest value
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
 
     def __len__(self):
-        return len(self._buffer)
+        return self._count
 
     def __iter__(self):
-        self._pointer = 0
-        return self
-
-    def __next__(self):
-        l = len(self._buffer)
-        if self._pointer < l:
-            data = self._buffer[self._pointer]
-            self._pointer += 1
-            return data
-        else:
-            raise StopIteration
+        size = len(self._buffer)
+        for i in range(self._count):
+            yield self._buffer[(self._first + i) % size]
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return array.array(self._buffer.typecode, [self[i] for i in range(*pos.indices(self._count))])
+        if pos < 0:
+            pos += self._count
+        if pos < 0 or pos >= self._count:
+            raise IndexError
+        return self._buffer[(self._first + pos) % len(self._buffer)]
 
     @property
     def size(self):
-        return self._size
+        return len(self._buffer)
 
-    @property
     def clear(self):
-        self._buffer.clear
-        self._pointer = 0
+        self._first = 0
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
 
     def add(self, data):
-        l = len(self._buffer)
-        # print("buffer=",l)
-        # print("data=", data)
-
-        if self._mode == buffer_stop: # stop when full
-            if l < self._size:
-                self._buffer[l + 1] = data
-
-        elif self._mode == buffer_shift: # shift data and add new data to the end
-            if l < self._size:
-                self._buffer[l] = data
-            else:
-                for x in range(1, l):
-                    self._buffer[x - 1] = self._buffer[x]
-                self._buffer[l - 1] = data
+        buffer = self._buffer
+        size = len(buffer)
+        if self._count < size:
+            i = (self._first + self._count) % size
+            self._count += 1
+        elif self._mode == DATA_DB.buffer_stop: # stop when full
+            return
+        else: # replace the oldest value
+            i = self._first
+            old = buffer[i]
+            self._sum -= old
+            self._first = (i + 1) % size
+            if old == self._min:
+                self._min = None
+            if old == self._max:
+                self._max = None
+        buffer[i] = data
+        data = buffer[i] # as stored, e.g. rounded to float32
+        self._sum += data
+        if self._first == 0 and i == size - 1 and buffer.typecode == 'f':
+            self._sum = sum(buffer) # once per turn, float rounding errors don't pile up
+        if self._min is not None and data < self._min:
+            self._min = data
+        if self._max is not None and data > self._max:
+            self._max = data
+        if self._count == 1:
+            self._min = data
+            self._max = data
 
     def get(self, pos):
-        # print("data_db",pos, self._buffer)
-        if pos >= 0 and pos < len(self._buffer):
-            return self._buffer[pos]
+        if pos >= 0 and pos < self._count:
+            return self._buffer[(self._first + pos) % len(self._buffer)]
         else:
             raise ValueError
 
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def mean(self):
+        if self._count == 0:
+            return None
+        return self._sum / self._count
+
+    @property
+    def min(self):
+        if self._min is None and self._count > 0:
+            self._min = min(self)
+        return self._min
+
+    @property
+    def max(self):
+        if self._max is None and self._count > 0:
+            self._max = max(self)
+        return self._max
+
 """
 print()
 print("**** Start ****")
 print()
 
-myLog = data_db(10 , 1)
-myLog.add({'date': '29.12.2019', 'time': '13:54:00', 'lat': '47.54467', 'lon': '7.79217'})
-myLog.add({'date': '29.12.2019', 'time': '13:55:00', 'lat': '47.54583', 'lon': '7.81733'})
-myLog.add({'date': '29.12.2019', 'time': '13:56:00', 'lat': '47.54717', 'lon': '7.84383'})
-myLog.add({'date': '29.12.2019', 'time': '13:57:00', 'lat': '47.54683', 'lon': '7.87067'})
+myLog = DATA_DB(10, DATA_DB.buffer_shift)
+for value in (47.54467, 47.54583, 47.54717, 47.54683):
+    myLog.add(value)
 
 print()
 print("Logged data:", len(myLog))
 
-for log in myLog:
-    lon1 = log.get("lon")
-    lat1 = log.get("lat")
-    print("Pos= ", lon1,lat1)
+for value in myLog:
+    print("Lat=", value)
 
-print("Log=", myLog.get(1))
+print("Log=", myLog.get(1), myLog[-1], myLog[1:3])
+print("Sum=", myLog.sum, "Min=", myLog.min, "Max=", myLog.max)
 """
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Rolling airtime and duty-cycle budget
+
+Every transmission is recorded with its start time and on-air seconds in two
+array('f') rings, the airtime within the last window seconds is kept as a
+running sum (transmissions leaving the window are subtracted, one reaching
+partly into the window counts with the part inside it). A transmission counts
+in full from its start on; transmissions must not overlap. When the ring is
+full, the oldest transmission still inside the window is folded into one
+sum with the end of the newest folded one: it counts in full until that
+end, then only with the time left until it leaves the window, so the
+airtime is never undercounted.
+allows() tells if a transmission of the given length still fits into
+max_duty_cycle of the window. The counters are meant for logging.
+'''
+
+import array
+import time
+
+class DUTYCYCLE:
+
+    def __init__(self, window = 600, max_duty_cycle = 0.1, size = 64):
+        self.debugging = False
+        self.window = window # seconds
+        self.max_duty_cycle = max_duty_cycle # 0..1
+        # counters since start
+        self.transmissions = 0
+        self.total_airtime = 0.0
+        self.denied = 0
+
+        self._start = array.array('f', [0] * size)
+        self._length = array.array('f', [0] * size)
+        self._first = 0
+        self._count = 0
+        self._sum = 0.0 # airtime of the transmissions in the ring
+        self._folded = 0.0 # airtime of transmissions pushed out of the full ring
+        self._folded_end = 0.0 # end of the newest of them
+        self._epoch = time.monotonic() # float32 ring: times relative to this
+
+    # records a transmission of seconds on air, starting at now (monotonic)
+    def add(self, seconds, now = None):
+        if now is None:
+            now = time.monotonic()
+        size = len(self._start)
+        if self._count == size: # ring full: the oldest one is folded if still in the window
+            first = self._first
+            end = self._start[first] + self._length[first]
+            if end > now - self._epoch - self.window:
+                self._folded += self._length[first]
+                self._folded_end = max(self._folded_end, end)
+            self._sum -= self._length[first]
+            self._first = (first + 1) % size
+            self._count -= 1
+        i = (self._first + self._count) % size
+        self._start[i] = now - self._epoch
+        self._length[i] = seconds
+        self._count += 1
+        self._sum += seconds
+        self.transmissions += 1
+        self.total_airtime += seconds
+
+    # seconds on air within the last window seconds
+    def airtime(self, now = None):
+        if now is None:
+            now = time.monotonic()
+        begin = now - self._epoch - self.window
+        size = len(self._start)
+        while self._count > 0 and self._start[self._first] + self._length[self._first] <= begin:
+            self._sum -= self._length[self._first]
+            self._first = (self._first + 1) % size
+            self._count -= 1
+        folded = 0.0
+        if self._folded_end > begin:
+            folded = min(self._folded, self._folded_end - begin)
+        else:
+            self._folded = 0.0
+        if self._count == 0:
+            self._sum = 0.0
+            return folded
+        airtime = self._sum
+        if self._start[self._first] < begin: # partly inside the window
+            airtime -= begin - self._start[self._first]
+        return airtime + folded
+
+    def duty_cycle(self, now = None):
+        return self.airtime(now) / self.window
+
+    # seconds of airtime left in the budget
+    def available(self, now = None):
+        return max(self.max_duty_cycle * self.window - self.airtime(now), 0)
+
+    '''
+    True if a transmission of seconds fits into the budget now,
+    otherwise counted as denied.
+    '''
+    def allows(self, seconds, now = None):
+        if seconds <= self.available(now):
+            return True
+        self.denied += 1
+        return False
+
+    def info(self):
+        if self.debugging == True:
+            print("DUTY:", end = " ")
+            print("Transmissions:", self.transmissions, end = " ")
+            print("Airtime: {:.1f}s".format(self.total_airtime), end = " ")
+            print("Window: {:.1f}s {:.2f}%".format(self.airtime(), 100 * self.duty_cycle()), end = " ")
+            print("Denied:", self.denied)
@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+KISS TNC protocol (K9NG / KA9Q) over a serial port, e.g. usb_cdc.data
+
+update() reads whatever the serial port has waiting (never blocks) and feeds
+it into the frame decoder, byte by byte: FEND delimits frames, FESC TFEND and
+FESC TFESC stand for FEND and FESC inside a frame. The first byte of a frame
+is port (high nibble) and command (low nibble). Data frames (AX.25 without
+flags and FCS) are queued, parameter frames set the channel access values:
+
+TXDELAY     => keyup delay in 10 ms units, sent as flags before the first frame
+PERSISTENCE => p = (persistence + 1) / 256 of sending in a free slot
+SLOTTIME    => slot interval in 10 ms units
+TXTAIL      => flags after the last frame in 10 ms units
+FULLDUPLEX  => send without waiting for a free channel
+'''
+
+import time
+import random
+
+class KISS:
+
+    FEND = 0xc0
+    FESC = 0xdb
+    TFEND = 0xdc
+    TFESC = 0xdd
+
+    CMD_DATA = 0x00
+    CMD_TXDELAY = 0x01
+    CMD_PERSISTENCE = 0x02
+    CMD_SLOTTIME = 0x03
+    CMD_TXTAIL = 0x04
+    CMD_FULLDUPLEX = 0x05
+    CMD_SETHARDWARE = 0x06
+    CMD_RETURN = 0xff
+
+    def __init__(self, serial, port = 0, max_frame_length = 330, queue_size = 4):
+        self.debugging = False
+        self.port = port # KISS port this TNC answers to
+        self.txdelay = 50 # 10 ms units
+        self.persistence = 63
+        self.slottime = 10 # 10 ms units
+        self.txtail = 1 # 10 ms units
+        self.full_duplex = False
+        self.queue_size = queue_size
+        self.frames_received = 0
+        self.frames_dropped = 0 # queue full, too long or broken escape
+
+        self._serial = serial
+        self._frame = bytearray(max_frame_length + 1) # + command byte
+        self._length = 0
+        self._escape = False
+        self._overflow = False
+        self._queue = []
+        self._next_slot = 0
+        self.read_size = 64 # bytes per update()
+
+    def __len__(self):
+        return len(self._queue)
+
+    '''
+    Reads the bytes waiting on the serial port, at most read_size per call,
+    so the main loop is never held up. Returns the number of queued frames.
+    '''
+    def update(self):
+        waiting = self._serial.in_waiting
+        if waiting > 0:
+            self.feed(self._serial.read(min(waiting, self.read_size)))
+        return len(self._queue)
+
+    # incremental decoder, data may end anywhere inside a frame
+    def feed(self, data):
+        frame = self._frame
+        for b in data:
+            if b == self.FEND:
+                if self._length > 0 and self._overflow == False:
+                    self._command(self._length)
+                self._length = 0
+                self._escape = False
+                self._overflow = False
+                continue
+            if self._overflow == True:
+                continue # skip the rest of a dropped frame
+            if self._escape == True:
+                self._escape = False
+                if b == self.TFEND:
+                    b = self.FEND
+                elif b == self.TFESC:
+                    b = self.FESC
+                else:
+                    self._drop() # protocol error
+                    continue
+            elif b == self.FESC:
+                self._escape = True
+                continue
+            if self._length < len(frame):
+                frame[self._length] = b
+                self._length += 1
+            else:
+                self._drop() # too long
+
+    '''
+    p-persistence channel access: True if the queued frames may be sent now.
+    Checked at most once per slot time; in a free slot the frames go out with
+    probability (persistence + 1) / 256. busy is the carrier detect of the
+    receiver, ignored in full duplex mode.
+    '''
+    def transmit_due(self, busy = False):
+        if len(self._queue) == 0:
+            return False
+        if self.full_duplex == True:
+            return True
+        now = time.monotonic()
+        if now < self._next_slot:
+            return False
+        self._next_slot = now + self.slottime / 100
+        if busy == True:
+            return False
+        return random.randint(0, 255) <= self.persistence
+
+    # all queued frames, oldest first, and empties the queue
+    def pop_all(self):
+        frames = self._queue
+        self._queue = []
+        return frames
+
+    # seconds of flags before the first / after the last frame
+    @property
+    def txdelay_seconds(self):
+        return self.txdelay / 100
+
+    @property
+    def txtail_seconds(self):
+        return self.txtail / 100
+
+    '''
+    KISS data frame for sending a received AX.25 frame to the host
+    '''
+    def encode(self, data, command = CMD_DATA):
+        frame = bytearray([self.FEND, (self.port << 4) | command])
+        for b in data:
+            if b == self.FEND:
+                frame += bytes([self.FESC, self.TFEND])
+            elif b == self.FESC:
+                frame += bytes([self.FESC, self.TFESC])
+            else:
+                frame.append(b)
+        frame.append(self.FEND)
+        return frame
+
+    def write(self, data):
+        self._serial.write(self.encode(data))
+
+    def info(self):
+        if self.debugging == True:
+            print("KISS:", end = " ")
+            print("Received:", self.frames_received, end = " ")
+            print("dropped:", self.frames_dropped, end = " ")
+            print("queued:", len(self._queue), end = " ")
+            print("TXDELAY:", self.txdelay, "P:", self.persistence, "Slot:", self.slottime)
+
+    # --- local functions -----------------
+
+    def _drop(self):
+        self._overflow = True
+        self.frames_dropped += 1
+
+    def _command(self, length):
+        frame = self._frame
+        if frame[0] == self.CMD_RETURN:
+            return
+        if frame[0] >> 4 != self.port:
+            return
+        command = frame[0] & 0x0f
+        if command == self.CMD_DATA:
+            if length < 16: # destination, source, control, PID
+                self.frames_dropped += 1
+            elif len(self._queue) >= self.queue_size:
+                self.frames_dropped += 1
+            else:
+                self._queue.append(bytes(frame[1:length]))
+                self.frames_received += 1
+        elif length >= 2:
+            value = frame[1]
+            if command == self.CMD_TXDELAY:
+                self.txdelay = value
+            elif command == self.CMD_PERSISTENCE:
+                self.persistence = value
+            elif command == self.CMD_SLOTTIME:
+                self.slottime = value
+            elif command == self.CMD_TXTAIL:
+                self.txtail = value
+            elif command == self.CMD_FULLDUPLEX:
+                self.full_duplex = value != 0
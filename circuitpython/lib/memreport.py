@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Boot-time memory and import time report
+
+import_report() imports the given modules one after another and prints the
+heap and time each import takes. table_report() builds the lookup tables the
+way the firmware did before they became bytes literals and compares heap and
+time with what the firmware does now: copying a literal into its array
+(ccitt, sinus, nrzi) or nothing for a table used in place (crc7). The
+literal itself stays in flash only when the module is frozen, from a .py or
+.mpy it is loaded into the heap at import (part of import_report).
+The builders are shared with helper/make_tables.py.
+'''
+
+import array
+import gc
+import math
+import time
+
+def _measure(function):
+    gc.collect()
+    free = gc.mem_free()
+    t = time.monotonic_ns()
+    result = function()
+    t = time.monotonic_ns() - t
+    used = free - gc.mem_free()
+    return result, used, t / 1000000
+
+def import_report(names):
+    for name in names:
+        module, used, ms = _measure(lambda: __import__(name))
+        print("MEM: import {:<16} {:6} bytes {:8.1f} ms".format(name, used, ms))
+
+def table_report():
+    tables = (
+        # name, builder, bytes literal, typecode of its heap copy (None: used in place)
+        ('ccitt', ccitt_table, __import__('aprs').CCITT_TABLE, 'H'),
+        ('sinus', sinus_table, __import__('afsk_tables').SINUS_TABLE, 'b'),
+        ('nrzi', nrzi_table, __import__('afsk_tables').NRZI_TABLE, 'H'),
+        ('crc7', crc7_table, __import__('adafruit_sdcard').CRC_TABLE, None),
+    )
+    for name, runtime, literal, typecode in tables:
+        table, runtime_used, runtime_ms = _measure(runtime)
+        table = None
+        copy_used = 0
+        copy_ms = 0
+        if typecode is not None:
+            table, copy_used, copy_ms = _measure(lambda: array.array(typecode, literal))
+            table = None
+        print("MEM: table {:<6} built {:6} bytes {:6.1f} ms, copied {:6} bytes {:6.1f} ms, literal {:5} bytes".format(
+            name, runtime_used, runtime_ms, copy_used, copy_ms, len(literal)))
+
+# --- tables as computed at runtime before -----------------
+
+def ccitt_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for bit in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+def sinus_table(amplitude = 125):
+    table = []
+    for degree in range(0, 360):
+        table.append(int(math.sin(math.pi * 2 * degree / 360) * amplitude))
+    return table
+
+def nrzi_table():
+    # AFSK._nrzi_table
+    table = array.array('H', [0] * (256 * 6))
+    for b in range(256):
+        for run in range(6):
+            tones = 0
+            n = 0
+            tone = 0
+            r = run
+            for x in range(0, 8):
+                if b & (1 << x) == 0:
+                    tone ^= 1
+                    r = 0
+                tones |= tone << n
+                n += 1
+                r += 1
+                if r > 5:
+                    tone ^= 1
+                    tones |= tone << n
+                    n += 1
+                    r = 1
+            table[b * 6 + run] = tones | ((n - 8) << 10) | (r << 12)
+    return table
+
+def crc7_table():
+    # adafruit_sdcard.CRC_TABLE: CRC-7 polynomial 0x89
+    crc_table = bytearray(256)
+    for i in range(256):
+        if i & 0x80:
+            crc_table[i] = i ^ 0x89
+        else:
+            crc_table[i] = i
+        for _ in range(1, 8):
+            crc_table[i] = (crc_table[i] << 1) & 0xff
+            if crc_table[i] & 0x80:
+                crc_table[i] = crc_table[i] ^ 0x89
+    return bytes(crc_table)
@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Telemetry from the onboard sensors (APRS 1.01 chapter 13 and base91 comment telemetry)
+
+Pressure, temperature, acceleration magnitude and battery voltage are sampled
+as integers (Pa, 0.01 degC, mg, mV) into one ring buffer per sensor of window
+samples. A report holds five channels, each a statistic (min / max / mean) of
+one sensor over the window, as raw values of the channel equation
+value = offset + step * raw:
+
+FORMAT_BASE91 => '|ssaabbccddee|' appended to the position comment,
+                 13 bit per channel (0..8280), 14 bytes for all five values
+FORMAT_T      => 'T#sss,aaa,bbb,ccc,ddd,eee,00000000' in an own frame,
+                 8 bit per channel (0..255)
+
+The metadata (PARM / UNIT / EQNS messages to the own callsign) tells the
+receivers the names, units and equations of the channels.
+'''
+
+import array
+import math
+
+class TELEMETRY:
+
+    PRESSURE = 0
+    TEMPERATURE = 1
+    ACCELERATION = 2
+    VOLTAGE = 3
+
+    MIN = 0
+    MAX = 1
+    MEAN = 2
+
+    FORMAT_T = 0
+    FORMAT_BASE91 = 1
+
+    # per sensor: unit, fixed point factor, offset, step base91, step T#
+    SENSORS = (
+        ('hPa', 100, 300, 0.1, 4),      # 300..1128 hPa / 300..1320 hPa
+        ('degC', 100, -40, 0.02, 0.5),  # -40..125.6 degC / -40..87.5 degC
+        ('g', 1000, 0, 0.001, 0.02),    # 0..8.28 g / 0..5.1 g
+        ('V', 1000, 0, 0.001, 0.02),    # 0..8.28 V / 0..5.1 V
+    )
+
+    STANDARD_GRAVITY = 9.806
+
+    def __init__(self, window = 6):
+        self.debugging = False
+        self.format = self.FORMAT_BASE91
+        # five channels: name (PARM), sensor, statistic
+        self.channels = [
+            ('Press', self.PRESSURE, self.MEAN),
+            ('Temp', self.TEMPERATURE, self.MEAN),
+            ('Batt', self.VOLTAGE, self.MEAN),
+            ('Bmin', self.VOLTAGE, self.MIN),
+            ('Acc', self.ACCELERATION, self.MAX),
+        ]
+        self._window = window
+        self._buffers = [array.array('l', [0] * window) for s in self.SENSORS]
+        self._sums = [0] * len(self.SENSORS)
+        self._pos = 0
+        self._count = 0
+        self._sequence = 0
+        self._new_samples = False
+
+    @property
+    def window(self):
+        return self._window
+
+    def __len__(self):
+        return self._count
+
+    '''
+    Reads the sensors (sensors.BMP280, sensors.LIS3DH, voltmeter.VOLTMETER)
+    into the ring buffers, a sensor given as None is recorded as 0.
+    '''
+    def sample(self, env = None, acc = None, vmtr = None):
+        pressure = temperature = acceleration = voltage = 0
+        if env is not None:
+            pressure = env.pressure_hi_res
+            temperature = env.temp_hi_res
+        if acc is not None:
+            x, y, z = acc.acceleration
+            acceleration = math.sqrt(x * x + y * y + z * z) / self.STANDARD_GRAVITY
+        if vmtr is not None:
+            voltage = vmtr.voltage
+        self.add(pressure, temperature, acceleration, voltage)
+
+    # one sample in hPa, degC, g and V
+    def add(self, pressure, temperature, acceleration, voltage):
+        values = (pressure, temperature, acceleration, voltage)
+        pos = self._pos
+        for s in range(len(self.SENSORS)):
+            value = int(round(values[s] * self.SENSORS[s][1]))
+            buffer = self._buffers[s]
+            if self._count == self._window:
+                self._sums[s] -= buffer[pos]
+            buffer[pos] = value
+            self._sums[s] += value
+        self._pos = (pos + 1) % self._window
+        if self._count < self._window:
+            self._count += 1
+        self._new_samples = True
+
+    def clear(self):
+        self._sums = [0] * len(self.SENSORS)
+        self._pos = 0
+        self._count = 0
+
+    def minimum(self, sensor):
+        return min(self._buffers[sensor][:self._count]) / self.SENSORS[sensor][1]
+
+    def maximum(self, sensor):
+        return max(self._buffers[sensor][:self._count]) / self.SENSORS[sensor][1]
+
+    def mean(self, sensor):
+        return self._sums[sensor] / self._count / self.SENSORS[sensor][1]
+
+    def statistic(self, sensor, statistic):
+        if statistic == self.MIN:
+            return self.minimum(sensor)
+        elif statistic == self.MAX:
+            return self.maximum(sensor)
+        return self.mean(sensor)
+
+    '''
+    Telemetry report of the current window in the selected format, None
+    without samples. The sequence number advances when samples were added
+    since the last report, so calling it again gives the same report.
+    '''
+    @property
+    def report(self):
+        if self._count == 0:
+            return None
+        if self._new_samples == True:
+            self._sequence += 1
+            self._new_samples = False
+        if self.format == self.FORMAT_BASE91:
+            data = '|' + self._base91(self._sequence % 8281)
+            for raw in self._raw_values(8280, 3):
+                data += self._base91(raw)
+            return data + '|'
+        data = 'T#{:03}'.format(self._sequence % 1000)
+        for raw in self._raw_values(255, 4):
+            data += ',{:03}'.format(raw)
+        return data + ',00000000'
+
+    '''
+    Information fields of the PARM, UNIT and EQNS messages for the channels,
+    addressed to the own callsign. The equations depend on the format.
+    '''
+    def metadata(self, callsign):
+        addressee = ':{:<9}:'.format(callsign)
+        parm = []
+        unit = []
+        eqns = []
+        for name, sensor, statistic in self.channels:
+            unit_name, factor, offset, step_base91, step_t = self.SENSORS[sensor]
+            parm.append(name)
+            unit.append(unit_name)
+            if self.format == self.FORMAT_BASE91:
+                step = step_base91
+            else:
+                step = step_t
+            eqns.append('0,{:g},{:g}'.format(step, offset))
+        return [addressee + 'PARM.' + ','.join(parm),
+            addressee + 'UNIT.' + ','.join(unit),
+            addressee + 'EQNS.' + ','.join(eqns)]
+
+    def info(self):
+        if self.debugging == True and self._count > 0:
+            print("TLM:", end = " ")
+            for name, sensor, statistic in self.channels:
+                print("{}: {:.3f}{}".format(name, self.statistic(sensor, statistic), self.SENSORS[sensor][0]), end = " ")
+            print("Report:", self.report)
+
+    # --- local functions -----------------
+
+    # channel values as raw values 0..full, step from SENSORS[sensor][step_index]
+    def _raw_values(self, full, step_index):
+        values = []
+        for name, sensor, statistic in self.channels:
+            definition = self.SENSORS[sensor]
+            raw = int(round((self.statistic(sensor, statistic) - definition[2]) / definition[step_index]))
+            values.append(min(max(raw, 0), full))
+        return values
+
+    def _base91(self, value):
+        return chr(33 + value // 91) + chr(33 + value % 91)
@@ -6,6 +6,7 @@ import os
 import board
 import busio
 import digitalio
+import usb_cdc
 
 # import neopixel
 from sdcard import SD_Card
@@ -15,6 +16,7 @@ from audio import AUDIO
 from gps import GPS
 from trx import DRA818x
 from voltmeter import VOLTMETER
+from kiss import KISS
 
 # NEOpix = neopixel.NeoPixel(board.NEOPIXEL, 1)
 # NEOpix[0] = (0, 0, 0) # set off
@@ -55,7 +57,7 @@ def init_gps():
     gps = GPS(gps_uart)
     return gps
 
-def init_trx():
+def init_trx(max_frame_length = 100):
     # create serial channel
     trx_uart = busio.UART(board.SDA, board.SCL, baudrate=9600, timeout=2, receiver_buffer_size=32)
     # create audio channel playing wave data
@@ -67,10 +69,21 @@ def init_trx():
     # set PTT
     trx_ptt = digitalio.DigitalInOut(board.D13)
     # Init TRX
-    trx = DRA818x(trx_uart, trx_microphon, trx_ptt, trx_enabled, trx_squelch)
+    trx = DRA818x(trx_uart, trx_microphon, trx_ptt, trx_enabled, trx_squelch, max_frame_length = max_frame_length)
     return trx
 
 def init_voltmeter():
     vmtr = VOLTMETER(board.A3, span=3.3, divider=11)
     return vmtr
 
+
+def init_kiss():
+    # second USB serial port, enabled in boot.py (the console keeps the REPL);
+    # None without it, KISS frames must not go to the REPL
+    serial = usb_cdc.data
+    if serial is None:
+        print("M_IO: usb_cdc.data is not enabled in boot.py, no KISS TNC")
+        return None
+    serial.timeout = 0
+    kiss = KISS(serial)
+    return kiss
@@ -8,13 +8,16 @@ import digitalio
 import time
 from aprs import APRS
 from afsk import AFSK
+from dutycycle import DUTYCYCLE
 
 class DRA818x():
 
-	def __init__(self, uart, mic_audio, ptt_pin, enabled_pin, squelch_pin):
+	def __init__(self, uart, mic_audio, ptt_pin, enabled_pin, squelch_pin, streaming = False, max_frame_length = 100):
 		self.debugging = False
-		self.AFSK = AFSK()
+		# longest frame (bytes) the output buffer holds, no output buffer when streaming
+		self.AFSK = AFSK(max_frame_length = max_frame_length, reserve_buffer = not streaming)
 		self.APRS = APRS()
+		self.DUTY = DUTYCYCLE() # rolling airtime of the sent transmissions
 
 		self.tx_frequency = 144.800
 		self.rx_frequency = 144.800
@@ -38,6 +41,28 @@ class DRA818x():
 		self._volume = 2
 		self._enable_ptt = True # set it to false to avoid sending real HF
 
+		# rendered audio of the last frames, replayed if the frame did not change
+		self.audio_cache_size = 1
+		self.audio_cache_hits = 0
+		self.audio_cache_misses = 0
+		self._audio_cache = []
+		self._prerender = None
+		self._prerender_key = None
+		self._unfit_key = None # frame too long for the AFSK output buffer, not pre-rendered
+
+		self._streaming = False
+		self.streaming = streaming
+
+		# [s] module power-up before the PTT, PTT keyed before the audio starts
+		self.power_up_time = 2
+		self.ptt_lead_time = 1.5
+
+		# [ms] from the beacon decision until the audio is ready (rendered or
+		# cached), and handoff from the end of the PTT lead time until the DAC
+		# plays (RawSample set-up, first chunk rendered if streamed)
+		self.latency_audio_ready = 0
+		self.latency_handoff = 0
+
 	# --- Hardware -------------------
 
 	@property
@@ -57,6 +82,32 @@ class DRA818x():
 		self._enabled.value = v
 		time.sleep(0.5)
 
+	'''
+	EXPERIMENTAL: render the audio chunk by chunk while playing (constant RAM).
+	AUDIO.play_stream is not gapless, frames may be corrupted on air. Switching
+	it on allocates the ping-pong buffers of the audio output and frees the
+	AFSK output buffer (and the audio cached in it), switching it off the
+	other way round. Without streaming nothing is streamed: bursts longer than
+	the AFSK output buffer are sent frame by frame, single frames that do not
+	fit are not sent.
+	'''
+	@property
+	def streaming(self):
+		return self._streaming
+
+	@streaming.setter
+	def streaming(self, v):
+		self._streaming = v
+		if v == True:
+			print("TRX: streaming is experimental, the audio has gaps between the chunks")
+			self._prerender = None
+			self._release_audio_buffer()
+			self.AFSK.release_buffer()
+			self._mic_audio.buffers # allocates them
+		else:
+			self._mic_audio.release_buffers()
+			self.AFSK.reserve_buffer()
+
 	@property
 	def squelch_pin(self):
 		return self._squelch_pin.value
@@ -109,6 +160,14 @@ class DRA818x():
 		command = 'AT+DMOCONNECT\r\n'
 		response = self._send(command)
 
+	def info(self):
+		if self.debugging == True:
+			print("TRX:", end = " ")
+			print("Audio cache hits:", self.audio_cache_hits, end = " ")
+			print("misses:", self.audio_cache_misses, end = " ")
+			print("Latency audio: {:.1f}ms handoff: {:.1f}ms".format(self.latency_audio_ready, self.latency_handoff))
+			self.DUTY.info()
+
 	def init(self):
 		self.enabled = True
 		time.sleep(0.5)
@@ -116,25 +175,256 @@ class DRA818x():
 		self._set_filter(0,0,0)
 		self.enabled = False
 
-	def send_APRS(self):
-		aprs_frame = self.APRS.create_ax25_frame()
-		aprs_frame = self.AFSK.create_afsk_bit_pattern(aprs_frame)
+	'''
+	Sends the current APRS frame if its airtime fits into the duty-cycle
+	budget (DUTY), returns False if not or if the frame is too long for the
+	AFSK output buffer. The airtime comes from the length of the rendered (or
+	cached) audio; only streamed frames are counted from their bitstream.
+	t_decision (monotonic_ns) is when the caller decided to send, for
+	latency_audio_ready.
+	'''
+	def send_APRS(self, t_decision = None):
+		if t_decision is None:
+			t_decision = time.monotonic_ns()
+		audio = None
+		if self._streaming == False:
+			audio = self._render_APRS()
+			if audio is None:
+				print("TRX: frame too long for the AFSK output buffer, not sent")
+				return False
+		if audio is None:
+			self._prerender = None # it shares the encoder state with the stream
+			frame = self.APRS.create_ax25_frame()
+			airtime = self.airtime(frame)
+			audio = self.AFSK.stream_afsk_bit_pattern(frame, self._mic_audio.buffers)
+			play = self._mic_audio.play_stream
+		else:
+			airtime = self._audio_airtime(audio)
+			play = self._mic_audio.play
+		if self.DUTY.allows(airtime) == False:
+			return False
+		self._transmit(audio, play, t_decision, airtime)
+		return True
+
+	'''
+	Exact seconds on air (PTT keyed) for a frame or a burst of frames:
+	PTT lead time and the audio (idle priming, head flags, frame bits with
+	stuffing, tail flags) computed from the tone bitstream, nothing rendered.
+	The module is switched off right after the audio, there is no PTT tail.
+	lead_time replaces ptt_lead_time if given.
+	'''
+	def airtime(self, data, lead_time = None):
+		if lead_time is None:
+			lead_time = self.ptt_lead_time
+		return lead_time + self.AFSK.airtime(data)
+
+	# airtime of the current APRS frame, from its audio if it is cached
+	def airtime_APRS(self):
+		audio = self._cached_audio(self.APRS.frame_key)
+		if audio is not None:
+			return self._audio_airtime(audio)
+		return self.airtime(self.APRS.create_ax25_frame())
+
+	'''
+	Sends several AX.25 frames (e.g. position, telemetry and status) in one
+	transmission: one power-up and PTT cycle, one head and tail preamble and
+	only a few flags between the frames. A burst longer than the AFSK output
+	buffer is sent frame by frame within the same PTT cycle (see
+	_render_each). The frames have to be copies, e.g.
+	bytes(TRX.APRS.create_ax25_frame()), as every frame reuses the same buffer.
+	Returns False without sending if the airtime exceeds the duty-cycle budget
+	or a single frame is too long for the AFSK output buffer.
+	lead_time (seconds between PTT and audio) replaces ptt_lead_time if given,
+	t_decision as in send_APRS.
+	'''
+	def send_APRS_frames(self, frames, lead_time = None, t_decision = None):
+		if t_decision is None:
+			t_decision = time.monotonic_ns()
+		if lead_time is None:
+			lead_time = self.ptt_lead_time
+		frames = tuple(frames)
+		self._prerender = None # it shares the encoder state and the AFSK buffer
+		if self._streaming == True:
+			airtime = self.airtime(frames, lead_time)
+			audio = self.AFSK.stream_afsk_bit_pattern(frames, self._mic_audio.buffers)
+			play = self._mic_audio.play_stream
+		elif self.AFSK.fits(frames) == True:
+			self._release_audio_buffer()
+			audio = self.AFSK.create_afsk_bit_pattern(frames)
+			airtime = self._audio_airtime(audio, lead_time)
+			play = self._mic_audio.play
+		else:
+			airtime = lead_time
+			for frame in frames:
+				if self.AFSK.fits(frame) == False:
+					print("TRX: frame too long for the AFSK output buffer, not sent")
+					return False
+				airtime += self.AFSK.airtime(frame)
+			self._release_audio_buffer()
+			audio = self._render_each(frames)
+			play = self._mic_audio.play_each
+		if self.DUTY.allows(airtime) == False:
+			return False
+		self._transmit(audio, play, t_decision, airtime, lead_time)
+		return True
+
+	'''
+	Sends AX.25 frames without FCS (e.g. from a KISS host) in one transmission,
+	with head_seconds / tail_seconds of flags (TXDELAY / TXTAIL) instead of the
+	usual preamble. The FCS is appended here. The TXDELAY flags are the key-up
+	delay the host asked for, they replace the PTT lead time (the power-up time
+	of the module stays). Returns False if the duty-cycle budget does not allow
+	the transmission, the frames are dropped then.
+	'''
+	def send_AX25_frames(self, frames, head_seconds = None, tail_seconds = None):
+		frames_fcs = []
+		for frame in frames:
+			fcs = self.APRS.calc_fcs(frame)
+			frames_fcs.append(bytes(frame) + bytes([fcs & 0xff, fcs >> 8]))
+		lead_time = None
+		head = self.AFSK.preamble_head_length
+		tail = self.AFSK.preamble_tail_length
+		try:
+			if head_seconds is not None:
+				self.AFSK.preamble_head_length = self.AFSK.preamble_flags(head_seconds)
+				lead_time = 0
+			if tail_seconds is not None:
+				self.AFSK.preamble_tail_length = self.AFSK.preamble_flags(tail_seconds)
+			return self.send_APRS_frames(frames_fcs, lead_time)
+		finally:
+			self.AFSK.preamble_head_length = head
+			self.AFSK.preamble_tail_length = tail
+
+	'''
+	Speculative rendering, call it from the idle loop after setting APRS.information
+	for the next beacon: renders the audio of the current frame, step bits per call,
+	into the audio cache, so send_APRS only has to hand over the buffer if the frame
+	did not change meanwhile. Returns True when the audio is ready.
+	'''
+	def prepare_APRS(self, step = 64):
+		if self._streaming == True or self.audio_cache_size < 1:
+			return False
+		key = self.APRS.frame_key
+		if self._prerender is None or self._prerender_key != key:
+			if self._cached_audio(key) is not None:
+				return True
+			if key == self._unfit_key:
+				return False
+			frame = self.APRS.create_ax25_frame()
+			if self.AFSK.fits(frame) == False:
+				self._unfit_key = key
+				return False
+			self._make_room_in_audio_cache()
+			self._prerender_key = key
+			self._prerender = self.AFSK.render_afsk_bit_pattern(frame, step)
+		try:
+			audio = next(self._prerender)
+		except ValueError: # another frame was rendered meanwhile, start again
+			self._prerender = None
+			return False
+		if audio is None:
+			return False
+		self._prerender = None
+		self._audio_cache.append([key, audio, True])
+		return True
+
+	# call after changing AFSK settings, cached audio was rendered with the old ones
+	def clear_audio_cache(self):
+		self._audio_cache = []
+		self._prerender = None
+
+	# --- local functions -----------------
+
+	'''
+	Audio of the current APRS frame, from the cache if the frame is unchanged,
+	None if it is too long for the AFSK output buffer.
+	Entries are [key, audio, live], newest last. The newest audio is a view of
+	the AFSK output buffer (live) and is only copied when another frame is
+	about to be rendered into that buffer and there is room to keep it.
+	'''
+	def _render_APRS(self):
+		key = self.APRS.frame_key
+		audio = self._cached_audio(key)
+		if audio is not None:
+			self.audio_cache_hits += 1
+			if self.debugging == True:
+				print("TRX: audio cache hit", self.audio_cache_hits, self.audio_cache_misses)
+			return audio
+
+		self.audio_cache_misses += 1
+		frame = self.APRS.create_ax25_frame()
+		if self.AFSK.fits(frame) == False:
+			return None
+		self._prerender = None # it renders into the same AFSK buffer
+		self._make_room_in_audio_cache()
+		audio = self.AFSK.create_afsk_bit_pattern(frame)
+		if self.audio_cache_size > 0:
+			self._audio_cache.append([key, audio, True])
+		return audio
+
+	'''
+	Audio of a burst that does not fit the AFSK output buffer: every frame
+	with its own head and tail preamble, rendered when the previous one has
+	been played. The DAC pauses while a frame is rendered, between the tail
+	and the head flags, so the receivers sync again on the head flags and no
+	frame is cut. Costs a head and tail preamble per frame.
+	'''
+	def _render_each(self, frames):
+		for frame in frames:
+			yield self.AFSK.create_afsk_bit_pattern(frame)
+
+	# seconds on air of rendered audio (one byte per sample) with the PTT lead time
+	def _audio_airtime(self, audio, lead_time = None):
+		if lead_time is None:
+			lead_time = self.ptt_lead_time
+		return lead_time + len(audio) / self.AFSK.samplerate
+
+	def _transmit(self, audio, play, t_decision, airtime, lead_time = None):
+		if lead_time is None:
+			lead_time = self.ptt_lead_time
+		self.latency_audio_ready = (time.monotonic_ns() - t_decision) / 1000000
 
 		## sending APRS to Air
 		if self._enable_ptt == True:
 			self.enabled = True
-			time.sleep(2)
+			time.sleep(self.power_up_time)
 			self.ptt = True
-			time.sleep(1.5)
-			self._mic_audio.play(aprs_frame, self.AFSK.samplerate)
+			t_keyup = time.monotonic()
+			time.sleep(lead_time)
+			t_play = time.monotonic_ns()
+			play(audio, self.AFSK.samplerate)
+			self.latency_handoff = (self._mic_audio.t_started - t_play) / 1000000
 			self.enabled = False
 			self.ptt = False
+			# airtime leaves out the pauses of frames rendered one by one
+			self.DUTY.add(max(airtime, time.monotonic() - t_keyup), t_keyup)
 			
 		else:
 			print("TRX: -ptt +sound")
-			self._mic_audio.play(aprs_frame)
-
-	# --- local functions -----------------
+			t_play = time.monotonic_ns()
+			play(audio)
+			self.latency_handoff = (self._mic_audio.t_started - t_play) / 1000000
+
+	# cached audio still in the AFSK output buffer is dropped before something else is rendered there
+	def _release_audio_buffer(self):
+		self._audio_cache = [entry for entry in self._audio_cache if entry[2] == False]
+
+	def _cached_audio(self, key):
+		for entry in self._audio_cache:
+			if entry[0] == key:
+				return entry[1]
+		return None
+
+	def _make_room_in_audio_cache(self):
+		keep = self.audio_cache_size - 1
+		if keep > 0:
+			self._audio_cache = self._audio_cache[-keep:]
+		else:
+			self._audio_cache = []
+		for entry in self._audio_cache:
+			if entry[2] == True:
+				entry[1] = bytes(entry[1])
+				entry[2] = False
 
 	def _send(self,data):
 		if self._enabled.value == True:
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host benchmark: AFSK synthesis modes
+
+Renders a typical position beacon with the per-sample reference loop, the
+precomputed tone blocks and the DDS phase accumulator for every
+datapoints_per_bit setting. Checks that the block output is identical to the
+reference and prints samples per second and the tone frequency error of each mode.
+Then renders the same frame with DDS at sample rates that are no multiple of the
+bit rate (fractional bit clock) and prints the buffer size and render time.
+Finally compares the airtime of position, telemetry and status frames sent one
+by one with the same frames sent as one burst.
+
+    python helper/bench_afsk.py [rounds]
+'''
+
+import sys
+import time
+
+import hostenv
+from aprs import APRS
+from afsk import AFSK
+
+MODES = (('reference', AFSK.SYNTHESIS_SAMPLE), ('block', AFSK.SYNTHESIS_BLOCK), ('dds', AFSK.SYNTHESIS_DDS))
+
+def render(afsk, frame, rounds):
+    t = time.perf_counter()
+    for r in range(rounds):
+        audio = afsk.create_afsk_bit_pattern(frame)
+    return bytes(audio), time.perf_counter() - t
+
+def main(rounds = 20):
+    aprs = APRS(source = 'HB9FZG-4', digipeaters = 'WIDE1-1,WIDE2-1')
+    aprs.information = '@181412z4730.68N/00735.79E>123/045/A=001234 Batt:3.9V'
+    frame = aprs.create_ax25_frame()
+
+    print('dpb  samples' + ''.join('  {:>18}  {:>21}'.format(name + ' [S/s]', 'mark/space error [Hz]') for name, mode in MODES))
+    for dpb in (8, 10, 12, 15, 16, 20, 30):
+        afsk = AFSK(datapoints_per_bit = dpb)
+        line = ''
+        reference = None
+        for name, mode in MODES:
+            afsk.synthesis = mode
+            audio, t = render(afsk, frame, rounds)
+            if reference is None:
+                reference = audio
+            elif mode == AFSK.SYNTHESIS_BLOCK and audio != reference:
+                raise SystemExit('dpb {}: block output differs from reference'.format(dpb))
+            mark, space = afsk.tone_frequencies
+            line += '  {:18.0f}  {:+10.3f} / {:+8.3f}'.format(len(audio) * rounds / t, mark - 1200, space - 2200)
+        print('{:3}  {:7}'.format(dpb, len(reference)) + line)
+
+    print()
+    print('sample rate  samples/bit  buffer [bytes]  render [ms]')
+    for rate in (8000, 9600, 11025, 14400, 18000):
+        afsk = AFSK(sample_rate = rate, synthesis = AFSK.SYNTHESIS_DDS)
+        audio, t = render(afsk, frame, rounds)
+        print('{:11}  {:11.2f}  {:14}  {:11.1f}'.format(rate, rate / 1200, len(audio), 1000 * t / rounds))
+
+    frames = [bytes(frame)]
+    for information in ('T#001,199,000,255,073,123,01101001', '>APRS-Buddy'):
+        aprs.information = information
+        frames.append(bytes(aprs.create_ax25_frame()))
+    afsk = AFSK()
+    single = sum(afsk.airtime(f) for f in frames)
+    burst = afsk.airtime(frames)
+    print()
+    print('{} frames  one by one [ms]  burst [ms]  saved [ms]'.format(len(frames)))
+    print('{:8}  {:16.1f}  {:10.1f}  {:10.1f}'.format('', 1000 * single, 1000 * burst, 1000 * (single - burst)))
+    print('+ {:.1f} s power-up and PTT lead per transmission saved {} times'.format(3.5, len(frames) - 1))
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
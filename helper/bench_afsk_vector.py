@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host benchmark: vectorized AFSK rendering (needs NumPy)
+
+Renders frames of growing length with the per-sample reference loop, the
+precomputed tone blocks and the NumPy backend, checks that the vector output
+is within +-1 LSB of the reference and prints the render times and speedups.
+
+    python helper/bench_afsk_vector.py [rounds]
+'''
+
+import sys
+import time
+
+import hostenv
+import afsk as afsk_module
+from afsk import AFSK
+
+def render(afsk, frame, rounds):
+    t = time.perf_counter()
+    for r in range(rounds):
+        audio = afsk.create_afsk_bit_pattern(frame)
+    return bytes(audio), (time.perf_counter() - t) / rounds
+
+def main(rounds = 5):
+    if afsk_module.np is None:
+        raise SystemExit('NumPy is not installed, SYNTHESIS_VECTOR falls back to pure Python')
+
+    reference = AFSK(synthesis = AFSK.SYNTHESIS_SAMPLE, max_frame_length = 330)
+    block = AFSK(synthesis = AFSK.SYNTHESIS_BLOCK, max_frame_length = 330)
+    vector = AFSK(synthesis = AFSK.SYNTHESIS_VECTOR, max_frame_length = 330)
+
+    print('frame [bytes]  samples  reference [ms]  block [ms]  vector [ms]  vs reference  vs block')
+    for length in (16, 32, 64, 128, 256, 330):
+        frame = bytes((x * 73 + 11) & 0xff for x in range(length))
+        expected, t_reference = render(reference, frame, rounds)
+        audio, t_block = render(block, frame, rounds)
+        audio, t_vector = render(vector, frame, rounds)
+        error = max(abs(a - b) for a, b in zip(audio, expected))
+        if len(audio) != len(expected) or error > 1:
+            raise SystemExit('frame {}: vector output differs by {} LSB'.format(length, error))
+        print('{:13}  {:7}  {:14.2f}  {:10.2f}  {:11.2f}  {:11.1f}x  {:7.1f}x'.format(
+            length, len(audio), 1000 * t_reference, 1000 * t_block, 1000 * t_vector,
+            t_reference / t_vector, t_block / t_vector))
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
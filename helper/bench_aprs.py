@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host benchmark: AX.25 frame builder
+
+Prints frames per second of APRS.create_ax25_frame for different digipeater
+paths and the heap used per frame (tracemalloc peak while building one frame,
+and blocks still allocated afterwards). The heap figures include CPython's own
+bookkeeping, e.g. the memoryview objects.
+Then compares the bulk CRC byte by byte and sliced by 2 on a 330 byte buffer,
+and the FCS of a frame built incrementally against the FCS over all its bytes.
+
+    python helper/bench_aprs.py [frames]
+'''
+
+import sys
+import time
+import tracemalloc
+
+import hostenv
+from aprs import APRS
+
+def main(frames = 20000):
+    print('digipeaters                      frames/s  peak heap/frame [bytes]  blocks kept/frame')
+    for path in ('WIDE1-1', 'WIDE1-1,WIDE2-1', 'HB9AK-1,HB9AM-1,HB9W-1,WIDE2-2'):
+        aprs = APRS(source = 'HB9FZG-4', digipeaters = path)
+        aprs.information = '@181412z4730.68N/00735.79E>123/045/A=001234 Batt:3.9V'
+        aprs.create_ax25_frame()
+
+        t = time.perf_counter()
+        for n in range(frames):
+            aprs.create_ax25_frame()
+        t = time.perf_counter() - t
+
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        for n in range(100):
+            tracemalloc.reset_peak()
+            aprs.create_ax25_frame()
+        peak = tracemalloc.get_traced_memory()[1]
+        kept = (sys.getallocatedblocks() - blocks) / 100
+        tracemalloc.stop()
+        print('{:31}  {:8.0f}  {:23}  {:17.2f}'.format(path, frames / t, peak, kept))
+
+        frame = aprs.create_ax25_frame()
+        fcs = frame[-2] | (frame[-1] << 8)
+        if aprs.calc_fcs(frame[:-2]) != fcs:
+            raise SystemExit('{}: incremental FCS differs from full CRC'.format(path))
+
+    print()
+    print('CRC                   bytes/s')
+    data = bytes((x * 37) & 0xff for x in range(330))
+    aprs = APRS()
+    results = []
+    for name, slicing in (('byte by byte', False), ('sliced by 2', True)):
+        aprs.crc_slicing_by_2 = slicing
+        t = time.perf_counter()
+        for n in range(frames // 10):
+            results.append(aprs.calc_fcs(data))
+        t = time.perf_counter() - t
+        print('{:20}  {:8.0f}'.format(name, len(data) * (frames // 10) / t))
+    if len(set(results)) != 1:
+        raise SystemExit('CRC results differ')
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: airtime and duty-cycle accounting
+
+Compares AFSK.samples_count (computed without rendering) with the length of
+the rendered audio for random frames and bursts at several sample rates,
+then feeds random transmissions into DUTYCYCLE and compares its rolling
+airtime with a brute-force sum over all transmissions. With more
+transmissions in the window than the ring holds, the airtime must never be
+less than the brute-force sum. Prints the airtime breakdown of a typical
+beacon.
+
+    python helper/check_airtime.py
+'''
+
+import random
+
+import hostenv
+from aprs import APRS
+from afsk import AFSK
+from dutycycle import DUTYCYCLE
+
+# a transmission counts in full from its start on
+def brute_force(transmissions, now, window):
+    begin = now - window
+    return sum(max(0, start + length - max(start, begin)) for start, length in transmissions)
+
+def main():
+    rnd = random.Random(1)
+    for rate in (None, 8000, 9600, 22050):
+        # output buffer for the longest burst here (2 frames up to 150 bytes)
+        afsk = AFSK(sample_rate = rate, max_frame_length = 310) if rate else AFSK(max_frame_length = 310)
+        for n in range(200):
+            frame = bytes(rnd.choice((0xff, 0x7e, rnd.randrange(256))) for i in range(rnd.randrange(1, 150)))
+            data = frame if n % 2 else [frame, frame[:20]]
+            if afsk.samples_count(data) != len(afsk.create_afsk_bit_pattern(data)):
+                raise SystemExit('sample rate {}: samples_count differs from the rendered audio'.format(rate))
+    print('samples_count matches the rendered audio')
+
+    duty = DUTYCYCLE(window = 600, size = 64)
+    transmissions = []
+    now = 0.0
+    for n in range(3000):
+        if transmissions:
+            now = max(now, sum(transmissions[-1])) # one transmission at a time
+        now += rnd.uniform(0, 60)
+        if rnd.random() < 0.5:
+            length = rnd.uniform(0.5, 5)
+            duty.add(length, now = now + duty._epoch)
+            transmissions.append((now, length))
+            now += length * rnd.random() # checked during and after the transmission
+        # the ring holds 64 transmissions, more than fit into the window here
+        expected = brute_force(transmissions[-64:], now, duty.window)
+        if abs(duty.airtime(now = now + duty._epoch) - expected) > 1e-3 * (1 + now / 1000):
+            raise SystemExit('rolling airtime differs from the brute-force sum')
+    print('rolling airtime matches the brute-force sum over {} transmissions'.format(len(transmissions)))
+
+    # 100 one second transmissions 2 s apart in a 600 s window, 90 s budget
+    duty = DUTYCYCLE(window = 600, max_duty_cycle = 0.15, size = 64)
+    for n in range(100):
+        duty.add(1, now = 2 * n + duty._epoch)
+    now = 199 + duty._epoch
+    if abs(duty.airtime(now = now) - 100) > 1e-3 or duty.allows(20, now = now):
+        raise SystemExit('transmissions pushed out of the full ring are not counted')
+    # random bursts: never less than the brute-force sum
+    duty = DUTYCYCLE(window = 600, size = 64)
+    transmissions = []
+    now = 0.0
+    for n in range(5000):
+        if transmissions:
+            now = max(now, sum(transmissions[-1])) # one transmission at a time
+        now += rnd.uniform(1, 6) if rnd.random() < 0.9 else rnd.uniform(100, 700)
+        length = rnd.uniform(0.2, 1)
+        duty.add(length, now = now + duty._epoch)
+        transmissions.append((now, length))
+        now += length * rnd.random() # checked during and after the transmission
+        expected = brute_force(transmissions, now, duty.window)
+        if duty.airtime(now = now + duty._epoch) < expected - 1e-3 * (1 + now / 1000):
+            raise SystemExit('rolling airtime below the brute-force sum with a full ring')
+    print('full ring: pushed out transmissions still count, never below the brute-force sum')
+
+    aprs = APRS(source = 'HB9FZG-4', digipeaters = 'WIDE1-1,WIDE2-1')
+    aprs.information = '@181412z/5L!!<*e7>{?!|!!"\'#$%&|'
+    frame = aprs.create_ax25_frame()
+    afsk = AFSK()
+    head, bits, stuffed, tail = afsk.airtime_bits(frame)
+    print()
+    print('head flags  frame bits  stuffed  tail flags  audio [ms]  + PTT lead 1.5 s')
+    print('{:10}  {:10}  {:7}  {:10}  {:10.1f}  {:16.1f}'.format(head, bits, stuffed, tail,
+        1000 * afsk.airtime(frame), 1000 * (1.5 + afsk.airtime(frame))))
+
+if __name__ == '__main__':
+    main()
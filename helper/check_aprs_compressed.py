@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: compressed and Mic-E APRS position reports
+
+Encodes positions all over the globe with GPS.aprs_position in compressed
+format and with APRS.set_mic_e_position, decodes them again and checks the
+errors against the resolution of the formats. Prints the bytes and airtime
+per beacon compared with the uncompressed format.
+
+    python helper/check_aprs_compressed.py
+'''
+
+import math
+import random
+import time
+
+import hostenv
+from gps import GPS
+from aprs import APRS
+from afsk import AFSK
+
+def base91(text):
+    value = 0
+    for c in text:
+        value = value * 91 + ord(c) - 33
+    return value
+
+def decode_compressed(info):
+    # @DDHHMMz/YYYYXXXX>csT
+    body = info[8:]
+    position = {
+        'latitude': 90 - base91(body[1:5]) / 380926,
+        'longitude': -180 + base91(body[5:9]) / 190463,
+        'symbol': body[0] + body[9],
+    }
+    c, s, t = body[10:13]
+    if c != ' ':
+        if (ord(t) - 33) & 0x18 == 0x10:
+            position['altitude'] = 1.002 ** base91(c + s) * 0.3048
+        else:
+            position['course'] = (ord(c) - 33) * 4
+            position['speed'] = 1.08 ** (ord(s) - 33) - 1
+    return position
+
+def decode_mic_e(destination, info):
+    # destination DDMMhh with message/N/+100/W flags, info `dmhSDC>/xxx}
+    digits = ''
+    flags = []
+    for c in destination:
+        flags.append(c >= 'P')
+        digits += chr(ord(c) - ord('P') + ord('0')) if c >= 'P' else c
+    latitude = int(digits[0:2]) + (int(digits[2:4]) + int(digits[4:6]) / 100) / 60
+    d = ord(info[1]) - 28
+    if flags[4]:
+        d += 100
+    if 180 <= d <= 189:
+        d -= 80
+    elif 190 <= d <= 199:
+        d -= 190
+    m = ord(info[2]) - 28
+    if m >= 60:
+        m -= 60
+    longitude = d + (m + (ord(info[3]) - 28) / 100) / 60
+    sp, dc, se = (ord(c) - 28 for c in info[4:7])
+    speed = sp * 10 + dc // 10
+    course = dc % 10 * 100 + se
+    if speed >= 800:
+        speed -= 800
+    if course >= 400:
+        course -= 400
+    return {
+        'message': flags[0] << 2 | flags[1] << 1 | flags[2],
+        'latitude': latitude if flags[3] else -latitude,
+        'longitude': -longitude if flags[5] else longitude,
+        'speed': speed,
+        'course': course,
+        'symbol': info[8] + info[7],
+        'altitude': base91(info[9:12]) - 10000,
+        'comment': info[13:],
+    }
+
+def set_fix(gps, latitude, longitude, knots, course, altitude):
+    fix = gps._gps
+    fix.latitude = latitude
+    fix.longitude = longitude
+    fix.speed_knots = knots
+    fix.track_angle_deg = course
+    fix.altitude_m = altitude
+    fix.timestamp_utc = time.struct_time((2021, 5, 18, 14, 12, 0, 0, 0, -1))
+
+def main(samples = 5000):
+    gps = GPS(hostenv.UART())
+    rnd = random.Random(1)
+    for n in range(samples):
+        latitude = rnd.uniform(-89.9, 89.9)
+        longitude = rnd.uniform(-179.9, 179.9)
+        knots = rnd.choice((0, rnd.uniform(0.5, 120)))
+        course = rnd.uniform(0, 359.4)
+        altitude = rnd.uniform(1, 8000)
+        set_fix(gps, latitude, longitude, knots, course, altitude)
+        gps.aprs_format = GPS.APRS_COMPRESSED
+        info = gps.aprs_position
+        p = decode_compressed(info)
+        assert len(info) == 21 and p['symbol'] == '/>', info
+        assert abs(p['latitude'] - latitude) < 1.0 / 380926 + 1e-9, (info, latitude)
+        assert abs(p['longitude'] - longitude) < 1.0 / 190463 + 1e-9, (info, longitude)
+        if knots > 0:
+            assert abs((p['course'] - course + 180) % 360 - 180) <= 4, (info, course)
+            assert abs(math.log((p['speed'] + 1) / (knots + 1))) <= math.log(1.08) / 2 + 1e-9, (info, knots)
+        else:
+            assert abs(p['altitude'] / altitude - 1) <= 0.002, (info, altitude)
+    print('{} positions decoded within the format resolution'.format(samples))
+
+    aprs = APRS(source = 'HB9FZG-4', digipeaters = 'WIDE1-1,WIDE2-1')
+    for n in range(samples):
+        latitude = rnd.uniform(-89.9, 89.9)
+        longitude = rnd.uniform(-179.9, 179.9)
+        knots = rnd.choice((0, rnd.uniform(0.5, 120)))
+        course = rnd.uniform(0, 359.4)
+        altitude = rnd.uniform(-100, 8000)
+        message = rnd.randrange(8)
+        set_fix(gps, latitude, longitude, knots, course, altitude)
+        aprs.set_mic_e_position(gps, 'Batt', message)
+        p = decode_mic_e(aprs.destination, aprs.information)
+        assert len(aprs.destination) == 6 and len(aprs.information) == 17, aprs.information
+        assert p['symbol'] == '/>' and p['comment'] == 'Batt' and p['message'] == message, p
+        assert abs(p['latitude'] - latitude) <= 1.0 / 12000 + 1e-9, (p, latitude)
+        assert abs(p['longitude'] - longitude) <= 1.0 / 12000 + 1e-9, (p, longitude)
+        assert abs(p['speed'] - knots) <= 0.5, (p, knots)
+        assert abs(p['altitude'] - altitude) <= 0.5, (p, altitude)
+        if p['speed'] > 0:
+            assert abs((p['course'] - course + 180) % 360 - 180) <= 0.5, (p, course)
+        frame = aprs.create_ax25_frame()
+        assert aprs.calc_fcs(frame[:-2]) == frame[-2] | frame[-1] << 8
+    print('{} Mic-E positions decoded within the format resolution'.format(samples))
+
+    set_fix(gps, 47.5113, 7.5965, 45, 123, 376)
+    afsk = AFSK()
+    print()
+    print('format        info [bytes]  frame [bytes]  airtime [ms]')
+    results = []
+    for name, mode in (('uncompressed', GPS.APRS_UNCOMPRESSED), ('compressed', GPS.APRS_COMPRESSED), ('mic-e', None)):
+        aprs.destination = 'APRS'
+        if mode is None:
+            aprs.set_mic_e_position(gps, ' Batt:3.9V')
+        else:
+            gps.aprs_format = mode
+            aprs.information = gps.aprs_position + ' Batt:3.9V'
+        frame = aprs.create_ax25_frame()
+        results.append((len(aprs.information), len(frame), 1000 * afsk.airtime(frame)))
+        print('{:12}  {:12}  {:13}  {:12.1f}'.format(name, *results[-1]))
+    for name, result in zip(('compressed', 'mic-e'), results[1:]):
+        print('saved {:7} {:12}  {:13}  {:12.1f}'.format(name, *[a - b for a, b in zip(results[0], result)]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: AX.25 / APRS decoder round trip
+
+Builds random frames with APRS (random callsigns, SSIDs and digipeater
+chains; uncompressed, compressed and Mic-E positions, status, T# and base91
+comment telemetry, messages), decodes them with APRS_DECODER and compares
+every field with what was encoded, within the resolution of the format.
+Every frame is also decoded once more with one flipped bit, which the FCS
+check has to reject. Finally prints the decode rate for a pool of frames.
+
+    python helper/check_aprs_decoder.py [frames]
+'''
+
+import random
+import sys
+import time
+
+import hostenv
+from gps import GPS
+from aprs import APRS
+from aprs_decoder import APRS_DECODER
+from telemetry import TELEMETRY
+
+CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+def random_address(rnd):
+    name = ''.join(rnd.choice(CHARS) for i in range(rnd.randrange(1, 7)))
+    ssid = rnd.randrange(16)
+    if ssid == 0:
+        return name
+    return '{}-{}'.format(name, ssid)
+
+def set_fix(gps, rnd):
+    fix = gps._gps
+    fix.latitude = rnd.uniform(-89.9, 89.9)
+    fix.longitude = rnd.uniform(-179.9, 179.9)
+    fix.speed_knots = rnd.choice((0, rnd.uniform(0.5, 120)))
+    fix.track_angle_deg = rnd.uniform(0, 359.4)
+    fix.altitude_m = rnd.uniform(1, 8000)
+    fix.timestamp_utc = time.struct_time((2021, 5, 18, rnd.randrange(24), rnd.randrange(60), 0, 0, 0, -1))
+
+def near(a, b, tolerance):
+    return a is not None and abs(a - b) <= tolerance + 1e-9
+
+def check(aprs, dec, gps, tlm, kind):
+    fix = gps._gps
+    frame = aprs.create_ax25_frame()
+    assert dec.decode(frame), kind
+    assert dec.fcs == aprs.calc_fcs(frame[:-2])
+    assert dec.source == aprs.source and dec.destination == aprs.destination, (dec.source, dec.destination)
+    assert dec.digipeaters == aprs.digipeaters, (dec.digipeaters, aprs.digipeaters)
+    assert bytes(dec.information) == aprs.information.encode(), kind
+    if kind == 'uncompressed':
+        assert dec.format == dec.FORMAT_UNCOMPRESSED, aprs.information
+        assert near(dec.latitude, fix.latitude, 0.01 / 60) and near(dec.longitude, fix.longitude, 0.01 / 60)
+        assert near(dec.altitude, fix.altitude_m, 0.3048)
+        assert dec.speed == int(round(fix.speed_knots))
+        if fix.speed_knots > 0:
+            assert dec.course == int(round(fix.track_angle_deg))
+    elif kind == 'compressed':
+        assert dec.format == dec.FORMAT_COMPRESSED and dec.symbol == ord('>')
+        assert near(dec.latitude, fix.latitude, 1 / 380926) and near(dec.longitude, fix.longitude, 1 / 190463)
+        if fix.speed_knots > 0:
+            assert abs((dec.course - fix.track_angle_deg + 180) % 360 - 180) <= 4
+        else:
+            assert near(dec.altitude, fix.altitude_m, 0.002 * fix.altitude_m)
+    elif kind == 'mic-e':
+        assert dec.format == dec.FORMAT_MIC_E and dec.mic_e_message == APRS.MIC_E_EN_ROUTE
+        assert near(dec.latitude, fix.latitude, 0.005 / 60) and near(dec.longitude, fix.longitude, 0.005 / 60)
+        assert near(dec.altitude, fix.altitude_m, 0.5) and near(dec.speed, fix.speed_knots, 0.5)
+        assert dec.telemetry_sequence is not None and dec.telemetry_channels == 5
+    elif kind == 'status':
+        assert dec.format == dec.FORMAT_STATUS and bytes(dec.text) == aprs.information[1:].encode()
+    elif kind == 'telemetry':
+        assert dec.format == dec.FORMAT_TELEMETRY and dec.telemetry_channels == 5
+        fields = aprs.information[2:].split(',')
+        assert dec.telemetry_sequence == int(fields[0])
+        assert list(dec.telemetry) == [min(int(x), dec.TELEMETRY_MAX) for x in fields[1:6]] and dec.telemetry_bits == 0
+    elif kind == 'message':
+        assert dec.format == dec.FORMAT_MESSAGE and bytes(dec.addressee) == aprs.information[1:10].encode()
+        assert bytes(dec.text) == aprs.information[11:].encode()
+
+    corrupted = bytearray(frame)
+    bit = random.randrange(8 * len(corrupted))
+    corrupted[bit >> 3] ^= 1 << (bit & 7)
+    assert not dec.decode(corrupted), kind
+    return bytes(frame)
+
+def main(frames = 20000):
+    rnd = random.Random(1)
+    random.seed(2)
+    gps = GPS(hostenv.UART())
+    aprs = APRS()
+    dec = APRS_DECODER()
+    tlm = TELEMETRY()
+    kinds = ('uncompressed', 'compressed', 'mic-e', 'status', 'telemetry', 'message')
+    pool = []
+    for n in range(frames):
+        kind = kinds[n % len(kinds)]
+        aprs.source = random_address(rnd)
+        aprs.destination = random_address(rnd)
+        digipeaters = [random_address(rnd) for i in range(rnd.randrange(1, 9))]
+        while len(','.join(digipeaters)) > 56: # APRS.digipeaters keeps 56 characters
+            digipeaters.pop()
+        aprs.digipeaters = ','.join(digipeaters)
+        set_fix(gps, rnd)
+        tlm.add(rnd.uniform(700, 1050), rnd.uniform(-30, 60), rnd.uniform(0, 3), rnd.uniform(3.0, 4.3))
+        if kind == 'uncompressed' or kind == 'compressed':
+            gps.aprs_format = GPS.APRS_UNCOMPRESSED if kind == 'uncompressed' else GPS.APRS_COMPRESSED
+            aprs.information = gps.aprs_position + ' Batt:3.9V'
+        elif kind == 'mic-e':
+            tlm.format = TELEMETRY.FORMAT_BASE91
+            aprs.set_mic_e_position(gps, tlm.report)
+        elif kind == 'status':
+            aprs.information = '>' + ''.join(rnd.choice(CHARS + ' .,') for i in range(rnd.randrange(60)))
+        elif kind == 'telemetry':
+            tlm.format = TELEMETRY.FORMAT_T
+            aprs.information = tlm.report
+            if rnd.random() < 0.3: # other stations send values beyond 16 bits
+                aprs.information = 'T#{:03},{},00000000'.format(rnd.randrange(1000),
+                    ','.join(str(rnd.randrange(10 ** rnd.randrange(1, 12))) for i in range(5)))
+        else:
+            aprs.information = rnd.choice(tlm.metadata(random_address(rnd)))
+        frame = check(aprs, dec, gps, tlm, kind)
+        if len(pool) < 600:
+            pool.append(frame)
+    print('{} frames decoded, all fields match, all corrupted frames rejected'.format(frames))
+
+    rounds = 20
+    t = time.perf_counter()
+    for r in range(rounds):
+        for frame in pool:
+            dec.decode(frame)
+    t = time.perf_counter() - t
+    print('{:.0f} frames/s ({:.1f} us per frame, {} bytes average)'.format(
+        rounds * len(pool) / t, 1e6 * t / rounds / len(pool), sum(len(f) for f in pool) // len(pool)))
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
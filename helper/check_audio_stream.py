@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: streamed AFSK playback
+
+Plays frames of growing length through AUDIO.play_stream with a fake audioio,
+checks that the concatenated chunks equal the one-shot create_afsk_bit_pattern
+output and prints the peak RAM used while rendering both ways. A KISS-sized
+burst (4 x 330 bytes) has to be refused by the default output buffer and
+streams the same audio as a one-shot render into a buffer large enough.
+A pre-render (DRA818x.prepare_APRS) interrupted by a streamed KISS burst has
+to start again and the beacon has to sound exactly like a fresh render.
+
+    python helper/check_audio_stream.py
+'''
+
+import tracemalloc
+
+import hostenv
+hostenv.install_fake_audio()
+hostenv.install_fake_digitalio()
+from digitalio import DigitalInOut
+from afsk import AFSK
+from audio import AUDIO
+import trx
+
+def peak(render):
+    tracemalloc.start()
+    render()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+def main():
+    afsk = AFSK(max_frame_length = 320)
+    print('frame  samples  one-shot peak  stream peak')
+    for length in (20, 80, 160, 320):
+        frame = bytes((x * 37) & 0xff for x in range(length))
+        expected = bytes(afsk.create_afsk_bit_pattern(frame))
+        for synthesis in (AFSK.SYNTHESIS_SAMPLE, AFSK.SYNTHESIS_BLOCK):
+            afsk.synthesis = synthesis
+            audio = AUDIO('A0', chunk_size = 1000)
+            audio.play_stream(afsk.stream_afsk_bit_pattern(frame, audio.buffers), afsk.samplerate)
+            if audio._dac.stream != expected:
+                raise SystemExit('frame {}: streamed audio differs from one-shot output'.format(length))
+        audio._dac.record = False
+        oneshot = peak(lambda: afsk.create_afsk_bit_pattern(frame))
+        stream = peak(lambda: audio.play_stream(afsk.stream_afsk_bit_pattern(frame, audio.buffers), afsk.samplerate))
+        print('{:5}  {:7}  {:13}  {:11}'.format(length, len(expected), oneshot, stream))
+
+    burst = [bytes((x * k) & 0xff for x in range(330)) for k in (3, 5, 7, 11)]
+    small = AFSK()
+    if small.fits(burst):
+        raise SystemExit('a 4 x 330 byte burst fits the default output buffer')
+    try:
+        small.create_afsk_bit_pattern(burst)
+        raise SystemExit('the default output buffer grew for a 4 x 330 byte burst')
+    except ValueError:
+        pass
+    expected = bytes(AFSK(max_frame_length = 4 * 332).create_afsk_bit_pattern(burst))
+    audio = AUDIO('A0')
+    audio.play_stream(small.stream_afsk_bit_pattern(burst, audio.buffers), small.samplerate)
+    if audio._dac.stream != expected:
+        raise SystemExit('streamed burst differs from one-shot output')
+    print()
+    print('4 x 330 byte burst: {} samples streamed, output buffer stays at {} samples'.format(len(expected), len(small._buffer)))
+
+    interrupted_prerender()
+
+def interrupted_prerender():
+    # a render suspended while another one runs must not go on from its state
+    afsk = AFSK()
+    frame = bytes(range(60))
+    render = afsk.render_afsk_bit_pattern(frame, 64)
+    next(render)
+    for chunk in afsk.stream_afsk_bit_pattern(frame, AUDIO('A0').buffers):
+        pass
+    try:
+        for audio in render:
+            pass
+        raise SystemExit('a pre-render went on after a stream used the encoder state')
+    except ValueError:
+        pass
+
+    trx.time.sleep = lambda seconds: None
+    audio = AUDIO('A0')
+    radio = trx.DRA818x(hostenv.UART(), audio, DigitalInOut(), DigitalInOut(), DigitalInOut())
+    radio.APRS.source = 'HB9FZG-4'
+    radio.APRS.information = '!4730.00N/00736.00E>pre-rendered beacon'
+    expected = bytes(AFSK().create_afsk_bit_pattern(radio.APRS.create_ax25_frame()))
+    radio.prepare_APRS()
+    radio.prepare_APRS()
+    burst = [bytes((x * k) & 0xff for x in range(46)) for k in (3, 5, 7, 11)]
+    radio.send_AX25_frames(burst)
+    while radio.prepare_APRS() == False:
+        pass
+    played = len(audio._dac.played)
+    radio.send_APRS()
+    if b''.join(audio._dac.played[played:]) != expected or radio.audio_cache_hits != 1:
+        raise SystemExit('beacon pre-rendered around a KISS burst differs from a fresh render')
+    print('pre-render interrupted by a KISS burst: started again, beacon unchanged')
+
+if __name__ == '__main__':
+    main()
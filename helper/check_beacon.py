@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: SMARTBEACON heading deviation and SmartBeaconing
+
+Feeds random heading sequences (straight with noise, turns, wrap around
+north) into the incremental Yamartino estimate of SMARTBEACON and compares
+it after every heading with the deviation computed from scratch over the
+whole window. Prints the time per heading for several window sizes.
+Then drives MODE_SMARTBEACONING through a scripted trip with a fake clock
+(parked, town, corners, highway) and checks the beacon times against the
+SmartBeaconing rules, and that a beacon reported as not sent is asked for
+again on the next fix.
+
+    python helper/check_beacon.py
+'''
+
+import math
+import random
+import time
+
+import hostenv
+import beacon as beacon_module
+from beacon import SMARTBEACON
+
+class FakeGPS():
+    is_valid = True
+    latitude = 47.5
+    longitude = 7.6
+    heading = 0
+    speed_kmh = 0
+
+def yamartino(headings):
+    s = sum(math.sin(math.radians(h)) for h in headings) / len(headings)
+    c = sum(math.cos(math.radians(h)) for h in headings) / len(headings)
+    eps = max(1 - (s * s + c * c), 0) ** 0.5
+    return math.degrees(math.asin(eps) * (1 + (2.0 / 3.0 ** 0.5 - 1) * eps ** 3))
+
+def headings(rnd, count):
+    heading = rnd.uniform(0, 360)
+    for n in range(count):
+        if rnd.random() < 0.05:
+            heading += rnd.uniform(-120, 120) # corner
+        heading += rnd.gauss(0, rnd.choice((0.2, 2, 20)))
+        yield heading % 360
+
+def main():
+    rnd = random.Random(1)
+    worst = 0
+    for size in (1, 2, 10, 60):
+        beacon = SMARTBEACON(size)
+        window = []
+        for heading in headings(rnd, 5000):
+            beacon._add_heading(heading)
+            window = (window + [heading])[-size:]
+            if len(beacon._heading_sin) != len(window):
+                raise SystemExit('window {}: wrong number of headings'.format(size))
+            # float32 vectors on the board as here: about 1e-3 degrees near 0
+            error = abs(beacon._heading_deviation() - yamartino(window))
+            worst = max(worst, error)
+            if error > 0.05:
+                raise SystemExit('window {}: deviation differs by {:.4f} degrees'.format(size, error))
+    print('incremental deviation matches, worst error {:.4f} degrees'.format(worst))
+
+    print()
+    print('window  from scratch [us]  incremental [us]')
+    for size in (10, 60):
+        beacon = SMARTBEACON(size)
+        sequence = list(headings(rnd, 2000))
+        t = time.perf_counter()
+        for n in range(len(sequence)):
+            yamartino(sequence[max(0, n - size + 1):n + 1])
+        scratch = time.perf_counter() - t
+        t = time.perf_counter()
+        for heading in sequence:
+            beacon._add_heading(heading)
+            beacon._heading_deviation()
+        incremental = time.perf_counter() - t
+        print('{:6}  {:17.1f}  {:16.1f}'.format(size, 1e6 * scratch / len(sequence), 1e6 * incremental / len(sequence)))
+
+    print()
+    smartbeaconing()
+
+def smartbeaconing():
+    clock = [1000.0]
+    beacon_module.time = type('time', (), {'monotonic': staticmethod(lambda: clock[0])})
+    sb = SMARTBEACON()
+    sb.enabled = True
+    sb.mode = sb.MODE_SMARTBEACONING
+    gps = FakeGPS()
+    # seconds, km/h, heading
+    trip = [(600, 0, 0), (300, 50, 90), (1, 50, 180), (10, 50, 270), (60, 50, 300), (900, 120, 300), (120, 60, 300)]
+    beacons = []
+    for seconds, speed, heading in trip:
+        for n in range(seconds):
+            gps.speed_kmh = speed
+            gps.heading = heading
+            if sb.update(gps):
+                beacons.append((clock[0], speed, heading))
+            clock[0] += 1
+
+    previous = None
+    for t, speed, heading in beacons:
+        if previous is not None:
+            elapsed = t - previous[0]
+            turn = min(abs(heading - previous[2]) % 360, 360 - abs(heading - previous[2]) % 360)
+            corner = speed >= sb.slow_speed and turn > sb.turn_threshold(speed)
+            if corner:
+                assert elapsed >= sb.min_turn_time, 'corner beacon within min_turn_time'
+            else:
+                assert abs(elapsed - sb.rate(speed)) < 1.5, 'interval {:.0f}s at {} km/h'.format(elapsed, speed)
+        previous = (t, speed, heading)
+    print('SmartBeaconing: {} beacons, intervals follow the rules'.format(len(beacons)))
+    for t, speed, heading in beacons:
+        print('  {:6.0f}s  {:3} km/h  {:3} deg'.format(t - 1000, speed, heading))
+    # parked: first fix and one after slow_rate; highway: every fast_rate
+    assert sum(1 for t, s, h in beacons if s == 120) == 900 // sb.fast_rate
+    assert [t - 1000 for t, s, h in beacons[:1]] == [0]
+
+    # a beacon that did not go out is asked for again on the next fix
+    clock[0] += sb.fast_rate
+    assert sb.update(gps)
+    sb.beacon_not_sent()
+    clock[0] += 1
+    assert sb.update(gps), 'denied beacon still counted as sent'
+    clock[0] += 1
+    assert not sb.update(gps)
+    print('denied beacon: asked for again on the next fix')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: DATA_DB ring buffer
+
+Adds random values to DATA_DB logs of several sizes in both modes and both
+typecodes and compares length, iteration, get(), indexing, slices and the
+running sum, min and max with a plain list after every add. Prints the time
+per add compared with the former dict storage, which moved every value in
+buffer_shift mode.
+
+    python helper/check_datadb.py
+'''
+
+import array
+import random
+import time
+
+import hostenv
+from datadb import DATA_DB
+
+def check(log, expected, typecode):
+    stored = list(array.array(typecode, expected)) # rounded as in the log
+    assert len(log) == len(stored)
+    assert list(log) == stored
+    assert list(log) == stored # iterating twice gives the same
+    assert [log.get(i) for i in range(len(log))] == stored
+    assert [log[i - len(log)] for i in range(len(log))] == stored
+    assert list(log[1:-1]) == stored[1:-1] and list(log[::2]) == stored[::2]
+    if stored:
+        assert abs(log.sum - sum(stored)) <= 1e-3 * len(stored)
+        assert log.min == min(stored) and log.max == max(stored)
+    else:
+        assert log.min is None and log.max is None and log.mean is None
+
+def main():
+    rnd = random.Random(1)
+    for typecode in ('f', 'l'):
+        for size in (1, 2, 7, 60):
+            for mode in (DATA_DB.buffer_shift, DATA_DB.buffer_stop):
+                log = DATA_DB(size, mode, typecode)
+                expected = []
+                for n in range(1000):
+                    if rnd.random() < 0.01:
+                        log.clear()
+                        expected = []
+                    value = rnd.randrange(-1000, 1000)
+                    if typecode == 'f':
+                        value /= 7
+                    log.add(value)
+                    if len(expected) < size:
+                        expected.append(value)
+                    elif mode == DATA_DB.buffer_shift:
+                        expected = expected[1:] + [value]
+                    check(log, expected, typecode)
+                try:
+                    log.get(len(log))
+                    raise SystemExit('get() beyond the end did not raise')
+                except ValueError:
+                    pass
+    print('DATA_DB matches a list in both modes and typecodes')
+
+    print()
+    print('size  dict and shift [us]  ring [us]')
+    for size in (10, 60):
+        log = DATA_DB(size)
+        old = {}
+        t = time.perf_counter()
+        for n in range(10000):
+            l = len(old)
+            if l < size:
+                old[l] = n
+            else:
+                for x in range(1, l):
+                    old[x - 1] = old[x]
+                old[l - 1] = n
+        shift = time.perf_counter() - t
+        t = time.perf_counter()
+        for n in range(10000):
+            log.add(n)
+        ring = time.perf_counter() - t
+        print('{:4}  {:19.2f}  {:9.2f}'.format(size, 100 * shift, 100 * ring))
+
+if __name__ == '__main__':
+    main()
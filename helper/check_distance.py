@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: SMARTBEACON distance from the last beacon
+
+Places the last beacon on a global grid (poles, date line included), puts
+fixes around it in every direction at distances up to three times the
+limit and compares the fast distance check with haversine: the decision
+beyond / not beyond the limit must always be the same, the equirectangular
+distance error is reported (worst relative error where no fallback was
+taken), with the share of fixes that needed haversine and the time per
+check.
+
+    python helper/check_distance.py
+'''
+
+import math
+import time
+
+import hostenv
+from beacon import SMARTBEACON
+
+# point at distance (m) and bearing (degrees) from lat, lon on the sphere
+def destination(lat, lon, distance, bearing):
+    d = distance / SMARTBEACON.EARTH_RADIUS
+    b = math.radians(bearing)
+    phi = math.radians(lat)
+    phi2 = math.asin(math.sin(phi) * math.cos(d) + math.cos(phi) * math.sin(d) * math.cos(b))
+    lam = math.atan2(math.sin(b) * math.sin(d) * math.cos(phi), math.cos(d) - math.sin(phi) * math.sin(phi2))
+    return math.degrees(phi2), (lon + math.degrees(lam) + 540) % 360 - 180
+
+def main():
+    sb = SMARTBEACON()
+    checks = 0
+    fallbacks = 0
+    worst = 0
+    for limit in (0.2, 1.5, 5, 20):
+        for lat0 in range(-89, 90, 4):
+            for lon0 in (-179.99, -120.5, 0, 7.6, 179.99):
+                sb._set_last_beacon((float(lat0), lon0), 0)
+                for bearing in range(0, 360, 15):
+                    for step in range(1, 31):
+                        position = destination(lat0, lon0, 100 * limit * step, bearing)
+                        exact = sb._calc_distance((float(lat0), lon0), position)
+                        checks += 1
+                        if sb._beyond_distance(position, limit) != (exact > limit):
+                            raise SystemExit('{} km limit at {}, {}: fast check decides otherwise'.format(limit, lat0, lon0))
+                        d2 = sb._flat_distance2(position)
+                        if d2 is None or abs(d2 ** 0.5 / 1000 / limit - 1) <= SMARTBEACON.FLAT_MARGIN:
+                            fallbacks += 1
+                        else:
+                            worst = max(worst, abs(d2 ** 0.5 / 1000 - exact) / exact)
+    print('{} checks, same decision as haversine every time'.format(checks))
+    print('worst equirectangular error {:.3f}% (fallback margin {}%), haversine used for {:.1f}%'.format(
+        100 * worst, 100 * SMARTBEACON.FLAT_MARGIN, 100 * fallbacks / checks))
+    if worst >= SMARTBEACON.FLAT_MARGIN:
+        raise SystemExit('equirectangular error exceeds the fallback margin')
+
+    positions = [destination(47.5, 7.6, 100 * step, 10 * step) for step in range(1000)]
+    sb._set_last_beacon((47.5, 7.6), 0)
+    fast = haversine = 1e9
+    for repeat in range(10): # best of 10, the host is noisy
+        t = time.perf_counter()
+        for position in positions:
+            sb._beyond_distance(position, 1.5)
+        fast = min(fast, time.perf_counter() - t)
+        t = time.perf_counter()
+        for position in positions:
+            sb._calc_distance((47.5, 7.6), position) > 1.5
+        haversine = min(haversine, time.perf_counter() - t)
+    print('per fix: fast check {:.2f} us, haversine {:.2f} us'.format(1e6 * fast / len(positions), 1e6 * haversine / len(positions)))
+
+if __name__ == '__main__':
+    main()
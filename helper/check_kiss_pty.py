@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: KISS TNC over a pty
+
+Opens a pty pair, gives the TNC side to KISS (as the USB serial port would be
+on the board) and plays the host on the other side: sets TXDELAY, PERSISTENCE
+and SLOTTIME, then writes random AX.25 frames (with FEND and FESC bytes in
+them) in random chunk sizes. The main loop polls KISS.update() like code.py
+does and sends the queued frames through DRA818x.send_AX25_frames with fake
+audio and pins. Checks that every frame arrives unchanged, that the played
+audio is the burst AFSK would render with the TXDELAY / TXTAIL flags, that
+update() never blocks, that the AFSK output buffer (sized for 330 byte
+frames as in KISS mode) never grows, that bursts that do not fit are played
+frame by frame, that the TXDELAY head and the head of a beacon in between
+are rendered only once and that the share of used slots matches PERSISTENCE.
+A KISS frame sent back to the host side is decoded there again.
+
+    python helper/check_kiss_pty.py [frames]
+'''
+
+import os
+import random
+import sys
+import time
+
+import hostenv
+hostenv.install_fake_audio()
+hostenv.install_fake_digitalio()
+from digitalio import DigitalInOut
+from aprs import APRS
+from aprs_decoder import APRS_DECODER
+from audio import AUDIO
+from afsk import AFSK
+from kiss import KISS
+import trx
+
+def random_frame(aprs, rnd):
+    # AX.25 frame without FCS, information with every byte value
+    aprs.information = ''
+    header = bytes(aprs.create_ax25_frame()[:-2])
+    return header + bytes(rnd.choice((KISS.FEND, KISS.FESC, rnd.randrange(256))) for i in range(rnd.randrange(1, 200)))
+
+def main(frames = 300):
+    rnd = random.Random(1)
+    random.seed(1)
+    trx.time.sleep = lambda seconds: None # no power-up and PTT delays
+    host, device = os.openpty()
+    hostenv.PtySerial(host)
+    tnc = KISS(hostenv.PtySerial(device), queue_size = 8)
+    audio = AUDIO('A0')
+    radio = trx.DRA818x(hostenv.UART(), audio, DigitalInOut(), DigitalInOut(), DigitalInOut(), max_frame_length = 330)
+    radio.DUTY.max_duty_cycle = 1 # back to back bursts, no delays
+    aprs = APRS(source = 'HB9FZG-4', destination = 'APZDIY', digipeaters = 'WIDE1-1,WIDE2-1')
+    dec = APRS_DECODER()
+    reference = AFSK(max_frame_length = 8 * 332)
+    reference.preamble_head_length = 45 # 300 ms at 1200 bit/s
+    reference.preamble_tail_length = 23 # 150 ms
+
+    os.write(host, tnc.encode(bytes([30]), KISS.CMD_TXDELAY) + tnc.encode(bytes([15]), KISS.CMD_TXTAIL))
+    os.write(host, tnc.encode(bytes([255]), KISS.CMD_PERSISTENCE) + tnc.encode(bytes([1]), KISS.CMD_SLOTTIME))
+    expected = [random_frame(aprs, rnd) for n in range(frames)]
+    encoded = [tnc.encode(frame) for frame in expected]
+    stream = b''.join(encoded)
+    ends = [] # end of each frame in stream
+    for frame in encoded:
+        ends.append((ends[-1] if ends else 0) + len(frame))
+    head = radio.AFSK.preamble_head_length
+    tail = radio.AFSK.preamble_tail_length
+    sent = []
+    transmissions = 0
+    one_by_one = 0
+    heads = None
+    slowest = 0
+    pos = 0
+    while len(sent) < frames:
+        # no flow control in KISS: the host only writes frames the queue has room for
+        written = sum(1 for end in ends if end <= pos)
+        room = tnc.queue_size - len(tnc) - (written - tnc.frames_received)
+        if pos < len(stream) and room > 0:
+            n = min(rnd.randrange(1, 300), ends[min(written + room, frames) - 1] - pos)
+            os.write(host, stream[pos:pos + n])
+            pos += n
+        t = time.perf_counter()
+        tnc.update()
+        slowest = max(slowest, time.perf_counter() - t)
+        assert tnc.frames_dropped == 0
+        if tnc.transmit_due():
+            burst = tnc.pop_all()
+            played = len(audio._dac.played)
+            assert radio.send_AX25_frames(burst, tnc.txdelay_seconds, tnc.txtail_seconds) == True
+            assert radio.AFSK.preamble_head_length == head and radio.AFSK.preamble_tail_length == tail, 'preamble not restored'
+            sent += burst
+            transmissions += 1
+            with_fcs = []
+            for frame in burst:
+                fcs = aprs.calc_fcs(frame)
+                with_fcs.append(frame + bytes([fcs & 0xff, fcs >> 8]))
+                assert dec.decode(with_fcs[-1]) and dec.source == 'HB9FZG-4'
+            if radio.AFSK.fits(with_fcs):
+                expected_audio = bytes(reference.create_afsk_bit_pattern(with_fcs))
+            else: # longer bursts are played frame by frame
+                expected_audio = b''.join(bytes(reference.create_afsk_bit_pattern(frame)) for frame in with_fcs)
+                one_by_one += 1
+            assert b''.join(audio._dac.played[played:]) == expected_audio, 'audio differs'
+            assert len(radio.AFSK._buffer) == radio.AFSK.max_buffer_samples, 'output buffer grew'
+            # a beacon in between: its head and the TXDELAY head both stay cached
+            radio.AFSK.create_afsk_bit_pattern(with_fcs[0])
+            cached = [entry[1] for entry in radio.AFSK._head_cache]
+            if heads is None:
+                heads = cached
+            assert len(cached) == 2 and all(a is b for a, b in zip(cached, heads)), 'head rendered again'
+    assert sent == expected, 'frames differ'
+    assert tnc.txdelay == 30 and tnc.persistence == 255 and tnc.slottime == 1 and tnc.frames_dropped == 0
+    print('{} frames in {} transmissions ({} frame by frame), all unchanged'.format(frames, transmissions, one_by_one))
+    print('slowest update(): {:.3f} ms'.format(1000 * slowest))
+
+    # p-persistence: share of slots used with a fake clock
+    clock = [time.monotonic()]
+    time_monotonic = time.monotonic
+    time.monotonic = lambda: clock[0]
+    tnc.persistence = 63
+    tnc._queue = [expected[0]]
+    used = 0
+    slots = 20000
+    for i in range(slots):
+        clock[0] += tnc.slottime / 100
+        if tnc.transmit_due():
+            used += 1
+        assert not tnc.transmit_due() # once per slot
+    time.monotonic = time_monotonic
+    print('persistence 63: {:.3f} of the slots used (expected {:.3f})'.format(used / slots, 64 / 256))
+    assert abs(used / slots - 64 / 256) < 0.02
+
+    # TNC to host
+    tnc.write(expected[1])
+    host_side = KISS(hostenv.PtySerial(host))
+    while len(host_side) == 0:
+        host_side.update()
+    assert host_side.pop_all() == [expected[1]]
+    print('frame to the host decoded')
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
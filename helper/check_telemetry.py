@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host check: telemetry reports
+
+Fills the telemetry window with random sensor values, encodes the channels as
+base91 comment telemetry and as T# report, decodes them again with the EQNS
+metadata and checks the errors against the channel resolution. Prints the
+bytes on air per report compared with formatted text. The status and metadata
+frames code.py sends after every STATUS_INTERVAL th beacon have to fit the
+default AFSK output buffer one by one (DRA818x sends the burst frame by
+frame, nothing is streamed).
+
+    python helper/check_telemetry.py
+'''
+
+import random
+
+import hostenv
+from afsk import AFSK
+from aprs import APRS
+from telemetry import TELEMETRY
+
+def base91(text):
+    value = 0
+    for c in text:
+        value = value * 91 + ord(c) - 33
+    return value
+
+def decode(tlm, report):
+    metadata = tlm.metadata('HB9FZG-4')
+    coefficients = [float(x) for x in metadata[2].split('EQNS.')[1].split(',')]
+    if report.startswith('|'):
+        raw = [base91(report[i:i + 2]) for i in range(1, len(report) - 1, 2)]
+        sequence, raw = raw[0], raw[1:]
+    else:
+        fields = report[2:].split(',')
+        sequence, raw = int(fields[0]), [int(x) for x in fields[1:6]]
+    values = []
+    for i, x in enumerate(raw):
+        a, b, c = coefficients[3 * i:3 * i + 3]
+        values.append(a * x * x + b * x + c)
+    return sequence, values
+
+def main(rounds = 2000):
+    rnd = random.Random(1)
+    tlm = TELEMETRY(window = 6)
+    for n in range(rounds):
+        tlm.clear()
+        samples = rnd.randrange(1, 10)
+        for s in range(samples):
+            tlm.add(rnd.uniform(700, 1050), rnd.uniform(-30, 60), rnd.uniform(0, 3), rnd.uniform(3.0, 4.3))
+        window = min(samples, tlm.window)
+        for fmt, index in ((TELEMETRY.FORMAT_BASE91, 3), (TELEMETRY.FORMAT_T, 4)):
+            tlm.format = fmt
+            report = tlm.report
+            assert report == tlm.report
+            sequence, values = decode(tlm, report)
+            for (name, sensor, statistic), value in zip(tlm.channels, values):
+                expected = tlm.statistic(sensor, statistic)
+                assert abs(value - expected) <= tlm.SENSORS[sensor][index] / 2 + 1e-6, (name, report, value, expected)
+        assert len(tlm) == window
+    print('{} windows decoded within the channel resolution'.format(rounds))
+
+    tlm.format = TELEMETRY.FORMAT_BASE91
+    text = ' P:{:.1f}hPa T:{:.1f}C Batt:{:.2f}V min:{:.2f}V Acc:{:.2f}g'.format(
+        *[tlm.statistic(sensor, statistic) for name, sensor, statistic in tlm.channels])
+    print()
+    print('format         bytes  example')
+    print('text           {:5}  {}'.format(len(text), text))
+    print('base91 comment {:5}  {}'.format(len(tlm.report), tlm.report))
+    tlm.format = TELEMETRY.FORMAT_T
+    print('T# frame       {:5}  {}'.format(len(tlm.report), tlm.report))
+    for information in tlm.metadata('HB9FZG-4'):
+        print('               {:5}  {}'.format(len(information), information))
+
+    afsk = AFSK(reserve_buffer = False)
+    aprs = APRS(source = 'HB9FZG-15', destination = 'APZDIY', digipeaters = 'WIDE1-1,WIDE2-1')
+    for tlm.format in (TELEMETRY.FORMAT_BASE91, TELEMETRY.FORMAT_T):
+        frames = []
+        for information in ['>APRS-Buddy'] + tlm.metadata(aprs.source):
+            aprs.information = information
+            frames.append(bytes(aprs.create_ax25_frame()))
+            if not afsk.fits(frames[-1]):
+                raise SystemExit('{} byte frame does not fit the AFSK output buffer: {}'.format(len(frames[-1]), information))
+    print()
+    print('status and metadata: {} frames of up to {} bytes, each fits the AFSK output buffer'.format(
+        len(frames), max(len(frame) for frame in frames)))
+
+if __name__ == '__main__':
+    main()
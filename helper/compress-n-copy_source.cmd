@@ -10,10 +10,11 @@ SET CircuitPythonBoard=F:
 
 D:
 CD %TempFolder%
-robocopy %SourceFolder% %TempFolder% /mir /XF code.py
+robocopy %SourceFolder% %TempFolder% /mir /XF code.py boot.py
 for %%i in (*.py) do %MPYCrossFolder%\mpy-cross.exe %%i
 del *.py
 copy %SourceFolder%\code.py %TempFolder%
+copy %SourceFolder%\boot.py %TempFolder%
 cd lib
 for %%i in (*.py) do %MPYCrossFolder%\mpy-cross.exe %%i
 del *.py
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Makes the CircuitPython sources importable from CPython on the host,
+used by the benchmark and check scripts in this folder. Provides const()
+and the micropython module, and stand-ins for the hardware the scripts need
+(audio output, digital pins, serial ports).
+'''
+
+import builtins
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'circuitpython')
+
+for path in (os.path.join(ROOT, 'lib'), ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# MicroPython's const() is a builtin on the board (datadb.py uses it without import)
+def const(value):
+    return value
+
+builtins.const = const
+
+'''
+Minimal stand-ins for the CircuitPython audio modules: AudioOut records a copy
+of every buffer it plays and checks that the buffer is not written while it is
+still playing ("playing" stays True for a few polls after play()).
+'''
+class _Module():
+    def __init__(self, name, **attributes):
+        self.__name__ = name
+        self.__dict__.update(attributes)
+
+class RawSample():
+    def __init__(self, buffer, sample_rate = 8000):
+        self.buffer = buffer
+        self.sample_rate = sample_rate
+
+class AudioOut():
+    play_polls = 3
+
+    def __init__(self, pin):
+        self.record = True
+        self.played = []
+        self._sample = None
+        self._polls = 0
+
+    def play(self, sample, loop = False):
+        if self._polls > 0:
+            raise RuntimeError('AudioOut: play() while playing')
+        self._sample = sample
+        self._snapshot = bytes(sample.buffer)
+        self._polls = self.play_polls
+        if self.record:
+            self.played.append(self._snapshot)
+
+    @property
+    def playing(self):
+        if self._polls > 0:
+            self._polls -= 1
+            if bytes(self._sample.buffer) != self._snapshot:
+                raise RuntimeError('AudioOut: buffer written while playing')
+        return self._polls > 0
+
+    @property
+    def stream(self):
+        return b''.join(self.played)
+
+class UART():
+    '''Serial port that swallows writes and never receives anything'''
+    def write(self, data):
+        return len(data)
+
+    def read(self, num_bytes = None):
+        return None
+
+    def readline(self):
+        return None
+
+    @property
+    def in_waiting(self):
+        return 0
+
+class LineUART():
+    '''Serial port that receives the lines pushed into it (bytes, with line end)'''
+    def __init__(self):
+        self._lines = []
+
+    def push(self, line):
+        self._lines.append(line)
+
+    def write(self, data):
+        return len(data)
+
+    def read(self, num_bytes = None):
+        return None
+
+    def readline(self):
+        if self._lines:
+            return self._lines.pop(0)
+        return None
+
+    @property
+    def in_waiting(self):
+        # adafruit_gps_mod only reads a line with 64 bytes or more waiting
+        return 64 * len(self._lines)
+
+class PtySerial():
+    '''usb_cdc.Serial stand-in on a pty file descriptor (non-blocking reads)'''
+    def __init__(self, fd):
+        import tty
+        tty.setraw(fd)
+        self._fd = fd
+
+    @property
+    def in_waiting(self):
+        import fcntl
+        import struct
+        import termios
+        return struct.unpack('i', fcntl.ioctl(self._fd, termios.FIONREAD, b'\0\0\0\0'))[0]
+
+    def read(self, num_bytes = 1):
+        return os.read(self._fd, num_bytes)
+
+    def write(self, data):
+        return os.write(self._fd, data)
+
+class DigitalInOut():
+    def __init__(self, pin = None):
+        self.value = False
+        self.direction = None
+
+def install_fake_digitalio():
+    sys.modules['digitalio'] = _Module('digitalio', DigitalInOut = DigitalInOut,
+        Direction = _Module('Direction', INPUT = 0, OUTPUT = 1))
+
+def install_fake_audio():
+    sys.modules.setdefault('board', _Module('board', A0 = 'A0'))
+    sys.modules['audiocore'] = _Module('audiocore', RawSample = RawSample)
+    sys.modules['audioio'] = _Module('audioio', AudioOut = AudioOut)
+
+sys.modules.setdefault('micropython', _Module('micropython', const = const))
@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host tool: constant lookup tables
+
+The lookup tables are stored as bytes literals in the sources instead of
+being computed at import. The literals stay in flash only when the modules
+are frozen; the CCITT, sinus and NRZI tables are still copied into arrays in
+the heap, only the CRC-7 table is used in place. This script computes them
+the way the firmware used to at runtime (the builders in memreport.py),
+prints them as Python source (to paste after a change) and with --check
+compares them with the literals in the sources. It also measures heap and
+time of building each table at runtime versus copying the literal into its
+array, as the firmware does now.
+
+    python helper/make_tables.py [--check]
+'''
+
+import array
+import sys
+import time
+import tracemalloc
+
+import hostenv
+from memreport import ccitt_table, sinus_table, nrzi_table, crc7_table
+
+TABLES = (
+    # name, table computed at runtime, bytes of it, the literal,
+    # typecode of the array the firmware copies it into (None: used in place)
+    ('aprs.CCITT_TABLE', ccitt_table, lambda t: array.array('H', t).tobytes(),
+        lambda: __import__('aprs').CCITT_TABLE, 'H'),
+    ('afsk_tables.SINUS_TABLE', sinus_table, lambda t: array.array('b', t).tobytes(),
+        lambda: __import__('afsk_tables').SINUS_TABLE, 'b'),
+    ('afsk_tables.NRZI_TABLE', nrzi_table, lambda t: t.tobytes(),
+        lambda: __import__('afsk_tables').NRZI_TABLE, 'H'),
+    ('adafruit_sdcard.CRC_TABLE', crc7_table, bytes,
+        lambda: __import__('adafruit_sdcard').CRC_TABLE, None),
+)
+
+# bytes literal split into lines of width bytes
+def literal(data, indent = '    ', width = 16):
+    lines = []
+    for i in range(0, len(data), width):
+        lines.append(indent + "b'" + ''.join('\\x{:02x}'.format(b) for b in data[i:i + width]) + "'")
+    return '(\n' + '\n'.join(lines) + ')'
+
+def measure(build):
+    tracemalloc.start()
+    t = time.perf_counter()
+    table = build()
+    t = time.perf_counter() - t
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table, size, t
+
+def check():
+    sys.modules.setdefault('adafruit_bus_device', hostenv._Module('adafruit_bus_device', spi_device = None))
+    print('table                      runtime [bytes]  runtime [ms]  copy [bytes]  copy [ms]  literal [bytes]')
+    for name, runtime, to_bytes, load, typecode in TABLES:
+        table, size, t = measure(runtime)
+        data = to_bytes(table)
+        stored = load()
+        if stored != data:
+            raise SystemExit('{}: literal differs from the computed table'.format(name))
+        copy_size, copy_t = 0, 0
+        if typecode is not None:
+            table, copy_size, copy_t = measure(lambda: array.array(typecode, stored))
+        print('{:25}  {:15}  {:12.3f}  {:12}  {:9.3f}  {:15}'.format(name, size, 1000 * t, copy_size, 1000 * copy_t, len(stored)))
+    print('all literals match')
+
+if __name__ == '__main__':
+    if '--check' in sys.argv:
+        check()
+    else:
+        for name, runtime, to_bytes, load, typecode in TABLES:
+            print('# ' + name)
+            print(literal(to_bytes(runtime())))
+            print()
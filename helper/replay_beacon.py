@@ -0,0 +1,320 @@
+# SPDX-FileCopyrightText: 2021 Uwe Gartmann - digitalwire.ch
+#
+# SPDX-License-Identifier: MIT
+
+'''
+Host tool: replay a GPS track through the beacon logic
+
+Feeds a recorded NMEA log (RMC and GGA sentences) or a GPX track (turned
+into RMC and GGA sentences, speed and course from the track points) through
+adafruit_gps_mod.GPS, GPS and SMARTBEACON as on the board: a virtual
+monotonic clock runs from the NMEA time stamps and SMARTBEACON.update() is
+called once per second like in code.py, so a day of driving replays in
+seconds. Without a file a synthetic trip is replayed (parked, town with
+corners, highway).
+
+Reports the number of beacons, the time and distance between them, the
+worst position error (how far the tracker got from the last beaconed
+position before the next beacon) and the airtime of the position beacons
+(DRA818x.airtime_APRS, PTT lead time included).
+
+--set name=value sets SMARTBEACON attributes, --sweep name=v1,v2,... replays
+every combination of the given values on all CPU cores (--jobs) and prints
+one line per combination.
+
+    python helper/replay_beacon.py [track.nmea|track.gpx] [--mode smart|distance]
+        [--format compressed|uncompressed] [--set name=value ...]
+        [--sweep name=v1,v2,... ...] [--jobs N]
+'''
+
+import argparse
+import calendar
+import itertools
+import math
+import multiprocessing
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import hostenv
+hostenv.install_fake_audio()
+hostenv.install_fake_digitalio()
+from digitalio import DigitalInOut
+from audio import AUDIO
+import beacon as beacon_module
+from beacon import SMARTBEACON
+from gps import GPS
+import trx
+
+class VirtualClock():
+    '''time module stand-in for beacon.py, the replay sets now'''
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+def checksum(body):
+    value = 0
+    for c in body:
+        value ^= ord(c)
+    return '${}*{:02X}\r\n'.format(body, value)
+
+def nmea_degrees(value, digits):
+    value = abs(value)
+    degrees = int(value)
+    return '{:0{}}{:07.4f}'.format(degrees, digits, (value - degrees) * 60)
+
+# RMC and GGA sentences of one fix, t in seconds since the epoch
+def nmea_fix(t, lat, lon, speed_kmh, course, altitude = 0):
+    tm = time.gmtime(t)
+    hms = '{:02}{:02}{:02}.{:03}'.format(tm.tm_hour, tm.tm_min, tm.tm_sec, int(round((t % 1) * 1000)) % 1000)
+    lat_text = '{},{}'.format(nmea_degrees(lat, 2), 'N' if lat >= 0 else 'S')
+    lon_text = '{},{}'.format(nmea_degrees(lon, 3), 'E' if lon >= 0 else 'W')
+    rmc = 'GPRMC,{},A,{},{},{:.2f},{:.2f},{:02}{:02}{:02},,,A'.format(hms, lat_text, lon_text,
+        speed_kmh / 1.852, course, tm.tm_mday, tm.tm_mon, tm.tm_year % 100)
+    gga = 'GPGGA,{},{},{},1,08,1.0,{:.1f},M,48.0,M,,'.format(hms, lat_text, lon_text, altitude)
+    return [checksum(rmc), checksum(gga)]
+
+def haversine(lat1, lon1, lat2, lon2):
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = math.sin(math.radians(lat2 - lat1) / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * SMARTBEACON.EARTH_RADIUS * math.asin(min(1, math.sqrt(a)))
+
+def bearing(lat1, lon1, lat2, lon2):
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
+    y = math.sin(dlon) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlon)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+def gpx_sentences(path):
+    points = []
+    for element in ET.parse(path).iter():
+        if element.tag.split('}')[-1] != 'trkpt':
+            continue
+        t = ele = None
+        for child in element:
+            tag = child.tag.split('}')[-1]
+            if tag == 'time':
+                t = calendar.timegm(time.strptime(child.text.strip()[:19], '%Y-%m-%dT%H:%M:%S'))
+            elif tag == 'ele':
+                ele = float(child.text)
+        if t is not None:
+            points.append((t, float(element.get('lat')), float(element.get('lon')), ele or 0))
+    sentences = []
+    speed = course = 0
+    for i, (t, lat, lon, ele) in enumerate(points):
+        if i > 0 and t > points[i - 1][0]:
+            t0, lat0, lon0, ele0 = points[i - 1]
+            speed = 3.6 * haversine(lat0, lon0, lat, lon) / (t - t0)
+            if speed > 1:
+                course = bearing(lat0, lon0, lat, lon)
+        sentences += nmea_fix(t, lat, lon, speed, course, ele)
+    return sentences
+
+# parked, town with corners, highway, town; 1 Hz fixes
+def synthetic_sentences():
+    t = calendar.timegm((2021, 6, 1, 8, 0, 0, 0, 0, 0))
+    lat, lon = 47.55, 7.59
+    legs = [(600, 0, 0)]
+    for heading in (90, 0, 90, 180, 90, 0, 45, 90):
+        legs.append((120, 45, heading))
+    legs += [(1800, 110, 60), (60, 70, 120), (1800, 120, 100), (300, 50, 200), (300, 0, 200)]
+    sentences = []
+    for seconds, speed, heading in legs:
+        for n in range(seconds):
+            d = speed / 3.6 / SMARTBEACON.EARTH_RADIUS
+            lat += math.degrees(d * math.cos(math.radians(heading)))
+            lon += math.degrees(d * math.sin(math.radians(heading)) / math.cos(math.radians(lat)))
+            sentences += nmea_fix(t, lat, lon, speed, heading, 300)
+            t += 1
+    return sentences
+
+def read_sentences(path):
+    if path is None:
+        return synthetic_sentences()
+    if path.lower().endswith('.gpx'):
+        return gpx_sentences(path)
+    with open(path, 'rb') as f:
+        return [line.decode('ascii', 'replace').strip() + '\r\n' for line in f if line.startswith(b'$')]
+
+# seconds since the epoch of an RMC or GGA sentence, date from the last RMC
+def sentence_time(sentence, date):
+    fields = sentence.split('*')[0].split(',')
+    kind = fields[0][3:]
+    if kind not in ('RMC', 'GGA') or len(fields) < 10 or len(fields[1]) < 6:
+        return None, date
+    if kind == 'RMC' and len(fields[9]) == 6:
+        date = (2000 + int(fields[9][4:6]), int(fields[9][2:4]), int(fields[9][0:2]))
+    if date is None:
+        return None, date
+    hms = fields[1]
+    t = calendar.timegm(date + (int(hms[0:2]), int(hms[2:4]), int(hms[4:6]), 0, 0, 0)) + float(hms[6:] or 0)
+    return t, date
+
+'''
+Replays the sentences with the SMARTBEACON settings, returns the metrics.
+The board calls SMARTBEACON.update() once per second with the latest fix,
+the replay does the same on the virtual clock.
+'''
+def replay(sentences, settings = None, aprs_format = GPS.APRS_COMPRESSED):
+    clock = VirtualClock()
+    beacon_module.time = clock
+    beacon_module.print = lambda *args, **kwargs: None # "BEACON NOW!"
+    uart = hostenv.LineUART()
+    gps = GPS(uart)
+    gps.aprs_format = aprs_format
+    sb = SMARTBEACON()
+    sb.enabled = True
+    for name, value in (settings or {}).items():
+        setattr(sb, name, value)
+    radio = replay.radio
+    radio.APRS.source = 'N0CALL-9'
+    radio.APRS.digipeaters = 'WIDE1-1,WIDE2-1'
+
+    beacons = [] # time, lat, lon, airtime
+    worst = [0, None] # meters, time
+    distance = 0
+    previous = None
+    first = None
+    date = None
+    tick = None
+
+    def second(now):
+        nonlocal distance, previous
+        clock.now = now
+        if not gps.is_valid:
+            return
+        position = (gps.latitude, gps.longitude)
+        if previous is not None:
+            distance += haversine(previous[0], previous[1], position[0], position[1])
+        previous = position
+        if beacons:
+            error = haversine(beacons[-1][1], beacons[-1][2], position[0], position[1])
+            if error > worst[0]:
+                worst[0] = error
+                worst[1] = now
+        if sb.update(gps):
+            radio.APRS.information = gps.aprs_position
+            beacons.append((now, position[0], position[1], radio.airtime_APRS()))
+
+    for sentence in sentences:
+        t, date = sentence_time(sentence, date)
+        if t is not None:
+            if tick is None:
+                first = tick = math.floor(t)
+            while tick + 1 <= t: # every second up to this fix
+                second(tick)
+                tick += 1
+        uart.push(sentence.encode('ascii'))
+        gps.update()
+    if tick is not None:
+        second(tick)
+
+    intervals = [b[0] - a[0] for a, b in zip(beacons, beacons[1:])]
+    spacing = [haversine(a[1], a[2], b[1], b[2]) for a, b in zip(beacons, beacons[1:])]
+    duration = (tick - first) if tick is not None else 0
+    airtime = sum(b[3] for b in beacons)
+    return {
+        'duration': duration,
+        'distance': distance / 1000,
+        'beacons': len(beacons),
+        'interval_min': min(intervals) if intervals else 0,
+        'interval_mean': sum(intervals) / len(intervals) if intervals else 0,
+        'interval_max': max(intervals) if intervals else 0,
+        'spacing_mean': sum(spacing) / len(spacing) / 1000 if spacing else 0,
+        'spacing_max': max(spacing) / 1000 if spacing else 0,
+        'worst_error': worst[0] / 1000,
+        'worst_error_at': worst[1] - first if worst[1] is not None else 0,
+        'airtime': airtime,
+        'duty_cycle': airtime / duration if duration else 0,
+    }
+
+def _radio():
+    return trx.DRA818x(hostenv.UART(), AUDIO('A0'), DigitalInOut(), DigitalInOut(), DigitalInOut())
+
+replay.radio = _radio()
+
+def print_report(result):
+    print('track        {:8.0f} s  {:8.1f} km'.format(result['duration'], result['distance']))
+    print('beacons      {:8}'.format(result['beacons']))
+    print('interval     {:8.0f} s min  {:6.0f} s mean  {:6.0f} s max'.format(
+        result['interval_min'], result['interval_mean'], result['interval_max']))
+    print('spacing      {:8.2f} km mean {:6.2f} km max'.format(result['spacing_mean'], result['spacing_max']))
+    print('worst error  {:8.2f} km after {:.0f} s'.format(result['worst_error'], result['worst_error_at']))
+    print('airtime      {:8.1f} s  {:.3f}% duty cycle'.format(result['airtime'], 100 * result['duty_cycle']))
+
+# the track, sent to each sweep process once by the pool initializer
+_sentences = None
+
+def _init_sweep(sentences):
+    global _sentences
+    _sentences = sentences
+
+def _sweep_job(job):
+    settings, aprs_format = job
+    return settings, replay(_sentences, settings, aprs_format)
+
+def value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Replay a GPS track through SMARTBEACON')
+    parser.add_argument('track', nargs = '?', help = 'NMEA log or GPX track, default: synthetic trip')
+    parser.add_argument('--mode', choices = ('smart', 'distance'), default = 'smart')
+    parser.add_argument('--format', choices = ('compressed', 'uncompressed'), default = 'compressed')
+    parser.add_argument('--set', action = 'append', default = [], metavar = 'NAME=VALUE')
+    parser.add_argument('--sweep', action = 'append', default = [], metavar = 'NAME=V1,V2,...')
+    parser.add_argument('--jobs', type = int, default = os.cpu_count())
+    args = parser.parse_args()
+
+    settings = {'mode': SMARTBEACON.MODE_SMARTBEACONING if args.mode == 'smart' else SMARTBEACON.MODE_DISTANCE}
+    for item in args.set:
+        name, text = item.split('=', 1)
+        settings[name] = value(text)
+    for name in settings:
+        if not hasattr(SMARTBEACON(), name):
+            raise SystemExit('SMARTBEACON has no attribute ' + name)
+    aprs_format = GPS.APRS_COMPRESSED if args.format == 'compressed' else GPS.APRS_UNCOMPRESSED
+
+    t = time.perf_counter()
+    sentences = read_sentences(args.track)
+    if not args.sweep:
+        result = replay(sentences, settings, aprs_format)
+        print_report(result)
+        print('replayed {:.0f} s of track in {:.1f} s'.format(result['duration'], time.perf_counter() - t))
+        return
+
+    names = []
+    values = []
+    for item in args.sweep:
+        name, text = item.split('=', 1)
+        if not hasattr(SMARTBEACON(), name):
+            raise SystemExit('SMARTBEACON has no attribute ' + name)
+        names.append(name)
+        values.append([value(v) for v in text.split(',')])
+    jobs = []
+    for combination in itertools.product(*values):
+        job_settings = dict(settings)
+        job_settings.update(zip(names, combination))
+        jobs.append((job_settings, aprs_format))
+    with multiprocessing.Pool(args.jobs, _init_sweep, (sentences,)) as pool:
+        results = pool.map(_sweep_job, jobs)
+
+    header = ''.join('{:>15}'.format(name) for name in names)
+    print(header + '  beacons  mean interval [s]  worst error [km]  airtime [s]')
+    for job_settings, result in results:
+        print(''.join('{:>15}'.format(job_settings[name]) for name in names) + '  {:7}  {:17.0f}  {:16.2f}  {:11.1f}'.format(
+            result['beacons'], result['interval_mean'], result['worst_error'], result['airtime']))
+    print('{} replays of {:.0f} s of track in {:.1f} s on {} processes'.format(len(jobs),
+        results[0][1]['duration'], time.perf_counter() - t, args.jobs))
+
+if __name__ == '__main__':
+    main()